@@ -0,0 +1,42 @@
+"""
+Benchmark: branching a mid-game GameEngine position.
+
+    python -m benchmarks.bench_engine_clone
+"""
+import copy
+import random
+import timeit
+from src.core.engine import GameEngine
+from src.core.dataclasses import DieFace
+from src.core.patterns_registry import PATTERNS
+
+
+def build_mid_game(seed: int = 7, dimensions_per_player: int = 6) -> GameEngine:
+    """Plays random legal dimensions and summons for both players."""
+    rng = random.Random(seed)
+    engine = GameEngine()
+    for turn in range(dimensions_per_player):
+        for player_id in (1, 2):
+            placements = sorted(engine.grid.placement_index.legal_placements(player_id))
+            if not placements:
+                continue
+            name, rotation, flipped, (x, y) = rng.choice(placements)
+            engine.grid.apply_dimension(player_id, PATTERNS[name], x, y, rotation, flipped)
+            engine.summon_monster(player_id, f"P{player_id}_M{turn}", x, y)
+            engine.add_crests(player_id, {face: rng.randint(0, 3) for face in DieFace})
+    return engine
+
+
+def report(label: str, func, number: int):
+    seconds = timeit.timeit(func, number=number)
+    print(f"{label:<20} {seconds / number * 1e6:10.1f} us/op")
+
+
+if __name__ == "__main__":
+    engine = build_mid_game()
+    snap = engine.snapshot()
+
+    report("clone()", engine.clone, 20000)
+    report("snapshot()", engine.snapshot, 20000)
+    report("restore(snapshot)", lambda: engine.restore(snap), 20000)
+    report("copy.deepcopy", lambda: copy.deepcopy(engine), 200)
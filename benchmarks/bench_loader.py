@@ -0,0 +1,60 @@
+"""
+Benchmark: loading a 10k-card directory eagerly, from the compiled cache,
+and lazily (headers only, then the cards of one deck).
+
+    python -m benchmarks.bench_loader [--cards 10000]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from src.core.monster_loader import MonsterLoader, MONSTER_DIR, card_cache_path
+
+
+def build_card_directory(directory: str, count: int, seed: int = 3):
+    """Writes 'count' card files derived from the shipped cards."""
+    templates = []
+    for filename in sorted(os.listdir(MONSTER_DIR)):
+        if filename.endswith(".json"):
+            with open(os.path.join(MONSTER_DIR, filename)) as f:
+                templates.append(json.load(f))
+    rng = random.Random(seed)
+    for number in range(count):
+        card = dict(rng.choice(templates))
+        card["id"] = f"card_{number:05d}"
+        card["name"] = f"{card['name']} #{number}"
+        card["level"] = rng.randint(1, 5)
+        with open(os.path.join(directory, f"{card['id']}.json"), "w") as f:
+            json.dump(card, f)
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<34} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_card_directory(directory, args.cards)
+        print(f"{args.cards} cards")
+
+        eager = timed("eager, no cache", lambda: MonsterLoader.load_monsters(directory, use_cache=False))
+        timed("eager, building cache", lambda: MonsterLoader.load_monsters(directory))
+        timed("eager, warm cache", lambda: MonsterLoader.load_monsters(directory))
+        os.remove(card_cache_path(directory))
+
+        lazy = timed("lazy, headers (thread pool)", lambda: MonsterLoader.load_lazy(directory))
+        deck = random.Random(5).sample(list(lazy), min(40, len(lazy)))
+        timed("lazy, first access of 40 cards", lambda: [lazy[card_id] for card_id in deck])
+        timed("lazy, materialize everything", lambda: list(lazy.values()))
+
+        assert list(lazy.values()) == eager, "lazy and eager loads differ"
+        print("lazy and eager results are identical")
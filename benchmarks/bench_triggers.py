@@ -0,0 +1,63 @@
+"""
+Benchmark: effect resolution when a board full of reactive monsters cascades.
+
+Every unit loses 1 HP whenever an ally is destroyed, and their HP is staggered
+so each death causes the next: one hit sets off a chain as deep as the board
+has units, with units * (units - 1) / 2 resolutions.
+
+    python -m benchmarks.bench_triggers [--units 200]
+"""
+import argparse
+import time
+from src.core.bitboard import CELL_COUNT
+from src.core.constants import BOARD_HEIGHT
+from src.core.dataclasses import EffectSpec, Monster
+from src.core.effects import ON_DESTROYED
+from src.core.engine import GameEngine
+from src.core.patterns_registry import PATTERNS
+
+GRIEF = EffectSpec(id="BENCH_GRIEF", trigger=ON_DESTROYED,
+                   params={"damage": 1, "target": "SELF", "condition": "UNIT_IS_ALLY"})
+
+
+def build_board(units: int, reactive: bool = True) -> GameEngine:
+    engine = GameEngine(card_pool=[])
+    engine.max_trigger_depth = units
+    specs = [GRIEF] if reactive else []
+    for number in range(units):
+        x, y = divmod(number + 1, BOARD_HEIGHT) # Cell 0 left empty
+        hp = max(1, number)
+        card = Monster(name=f"Unit {number}", level=1, atk=0, hp=hp, pattern=PATTERNS["NET_10"], **{"def": 0},
+                       effects=[s.id for s in specs], effect_specs=specs)
+        engine.grid.set_owner(x, y, 1)
+        engine.summon_monster(1, card.name, x, y, card)
+    return engine
+
+
+def run_chain(engine: GameEngine):
+    x, y = divmod(1, BOARD_HEIGHT)
+    start = time.perf_counter()
+    engine.damage_unit(x, y, 1)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--units", type=int, default=200)
+    args = parser.parse_args()
+    units = min(args.units, CELL_COUNT - 1)
+
+    engine = build_board(units)
+    seconds = run_chain(engine)
+    record = engine.history[-1]
+    depth = max(r.depth for r in record.resolutions)
+    print(f"{units} reactive units: {len(record.resolutions)} resolutions, depth {depth}, "
+          f"{seconds * 1e3:.1f} ms ({seconds / len(record.resolutions) * 1e6:.1f} us/resolution)")
+
+    start = time.perf_counter()
+    engine.undo()
+    print(f"undo the whole cascade: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    quiet = build_board(units, reactive=False)
+    seconds = run_chain(quiet)
+    print(f"{units} units without effects: one destruction in {seconds * 1e6:.1f} us")
@@ -0,0 +1,65 @@
+import functools
+from typing import Any, List, NamedTuple, Tuple
+from src.core.constants import Phase
+
+# Kinds of engine-level changes kept in ActionRecord.changes
+CREST = "crest"   # (CREST, player_id, face, delta)
+TURN = "turn"     # (TURN, TurnState before, TurnState after)
+HAND = "hand"     # (HAND, player_id, position, monster) - card left the hand
+RNG = "rng"       # (RNG, rng state before, rng state after) - dice were rolled
+
+
+class TurnState(NamedTuple):
+    current_player_id: int
+    turn_count: int
+    current_phase: Phase
+
+
+class Resolution(NamedTuple):
+    """An effect that resolved during an action (depth 0: raised by the action itself)."""
+    depth: int
+    trigger: str
+    effect_id: str
+    owner_id: int
+    x: int
+    y: int
+
+
+class ActionRecord:
+    """
+    Minimal delta of one engine action.
+    GameEngine.undo()/redo() replay it in O(size of the delta).
+    """
+    __slots__ = ("label", "cells", "changes", "resolutions")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.cells: List[Tuple[int, Any, Any]] = []  # (bit index, CellState before, CellState after)
+        self.changes: List[tuple] = []
+        self.resolutions: List[Resolution] = [] # Informational: their effects are in cells/changes
+
+    def is_empty(self) -> bool:
+        return not self.cells and not self.changes
+
+    def __repr__(self):
+        return f"ActionRecord({self.label!r}, cells={len(self.cells)}, changes={len(self.changes)})"
+
+
+def recorded(label: str):
+    """
+    Decorator for GameEngine methods that mutate state: the call becomes one
+    undoable ActionRecord. Calls nested inside another recorded method are
+    merged into the outer record.
+    """
+    def wrap(method):
+        @functools.wraps(method)
+        def inner(self, *args, **kwargs):
+            if self._recording is not None:
+                return method(self, *args, **kwargs)
+            self._begin_action(label)
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._end_action()
+        return inner
+    return wrap
@@ -0,0 +1,51 @@
+"""
+Bitboard helpers for the 13x19 board.
+"""
+from src.core.constants import BOARD_WIDTH, BOARD_HEIGHT
+
+# Every per-cell flag is stored as one bit of a Python int.
+# Cell (x, y) lives at bit index x * BOARD_HEIGHT + y, so a step along y
+# is a shift by 1 and a step along x is a shift by BOARD_HEIGHT.
+
+CELL_COUNT = BOARD_WIDTH * BOARD_HEIGHT
+FULL_MASK = (1 << CELL_COUNT) - 1
+BOTTOM_ROW_MASK = sum(1 << (x * BOARD_HEIGHT) for x in range(BOARD_WIDTH))  # y == 0
+TOP_ROW_MASK = BOTTOM_ROW_MASK << (BOARD_HEIGHT - 1)  # y == BOARD_HEIGHT - 1
+# ROWS_BELOW[k] covers every cell with y < k
+ROWS_BELOW = [BOTTOM_ROW_MASK * ((1 << k) - 1) for k in range(BOARD_HEIGHT + 1)]
+
+
+def bit_index(x: int, y: int) -> int:
+    """Bit position of cell (x, y) on the board bitboards."""
+    return x * BOARD_HEIGHT + y
+
+
+def neighbor_mask(mask: int) -> int:
+    """Returns every cell orthogonally adjacent to a cell in 'mask'."""
+    return (((mask << 1) & ~BOTTOM_ROW_MASK)
+            | ((mask >> 1) & ~TOP_ROW_MASK)
+            | (mask << BOARD_HEIGHT)
+            | (mask >> BOARD_HEIGHT)) & FULL_MASK
+
+
+def shift_mask(mask: int, dx: int, dy: int) -> int:
+    """
+    Moves every cell of 'mask' by (dx, dy).
+    Cells pushed off the board are dropped instead of wrapping into the next column.
+    """
+    if dy > 0:
+        mask &= ROWS_BELOW[BOARD_HEIGHT - dy] if dy < BOARD_HEIGHT else 0
+    elif dy < 0:
+        mask &= ~ROWS_BELOW[-dy] if -dy < BOARD_HEIGHT else 0
+    offset = dx * BOARD_HEIGHT + dy
+    if offset >= 0:
+        return (mask << offset) & FULL_MASK
+    return mask >> -offset
+
+
+def iter_bits(mask: int):
+    """Yields the bit index of every set bit in 'mask'."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,171 @@
+"""
+Card queries over a card pool, answered from inverted indexes.
+
+Each indexed value keeps a bitset (a Python int, bit i = i-th card) of the
+cards that have it, so a query is a few integer &, | and ~ operations:
+
+    index = CardIndex(MonsterLoader.load_card_pool())
+    index.search(Q(level=3, attribute="EARTH", type="Warrior") & Q(trigger="ON_DEFENSE_SUCCESS"))
+
+From the command line (terms are AND-ed, commas OR values, '!' negates):
+
+    python -m src.core.card_index level=3 attribute=EARTH trigger=ON_DEFENSE_SUCCESS
+    python -m src.core.card_index type=Dragon,Rock '!level=1'
+"""
+import argparse
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List
+from src.core.bitboard import iter_bits
+from src.core.dataclasses import Monster
+from src.core.patterns_registry import resolve_pattern_id
+
+# Indexed fields: name -> values of a card for that field
+FIELDS = {
+    "type": lambda m: [m.type],
+    "attribute": lambda m: [m.attribute] if m.attribute else [],
+    "level": lambda m: [m.level],
+    "pattern": lambda m: [m.pattern_id] if m.pattern_id else [],
+    "face": lambda m: [spec.symbol.value for spec in m.die_faces],
+    "trigger": lambda m: [spec.program.trigger for spec in m.effect_specs if spec.program.trigger],
+    "effect": lambda m: list(m.effects),
+}
+
+
+def _key(field: str, value):
+    """Values are matched case-insensitively; patterns also by alias."""
+    if field == "pattern":
+        value = resolve_pattern_id(value) or value
+    if field == "level":
+        return int(value)
+    return str(value).upper()
+
+
+class Query(ABC):
+    """A card filter. Combine with & (and), | (or) and ~ (not)."""
+    @abstractmethod
+    def bits(self, index: "CardIndex") -> int:
+        """Bitset of the matching cards of 'index'."""
+
+    def __and__(self, other: "Query") -> "Query":
+        return _Combined(self, other, "&")
+
+    def __or__(self, other: "Query") -> "Query":
+        return _Combined(self, other, "|")
+
+    def __invert__(self) -> "Query":
+        return _Not(self)
+
+
+class Q(Query):
+    """
+    Q(field=value, ...): every condition must hold. A list/tuple/set/range
+    value matches any of its values, e.g. Q(level=range(3, 5), face="MAGIC").
+    """
+    def __init__(self, **conditions):
+        for field in conditions:
+            if field not in FIELDS:
+                raise ValueError(f"Unknown card field '{field}', expected one of {sorted(FIELDS)}")
+        self.conditions = conditions
+
+    def bits(self, index: "CardIndex") -> int:
+        result = index.all_bits
+        for field, value in self.conditions.items():
+            values = value if isinstance(value, (list, tuple, set, frozenset, range)) else [value]
+            matches = 0
+            for v in values:
+                matches |= index.postings[field].get(_key(field, v), 0)
+            result &= matches
+        return result
+
+    def __repr__(self):
+        return f"Q({', '.join(f'{k}={v!r}' for k, v in self.conditions.items())})"
+
+
+class _Combined(Query):
+    def __init__(self, left: Query, right: Query, op: str):
+        self.left, self.right, self.op = left, right, op
+
+    def bits(self, index: "CardIndex") -> int:
+        left = self.left.bits(index)
+        if self.op == "&":
+            return left & self.right.bits(index) if left else 0
+        return left | self.right.bits(index)
+
+    def __repr__(self):
+        return f"({self.left!r} {self.op} {self.right!r})"
+
+
+class _Not(Query):
+    def __init__(self, query: Query):
+        self.query = query
+
+    def bits(self, index: "CardIndex") -> int:
+        return index.all_bits & ~self.query.bits(index)
+
+    def __repr__(self):
+        return f"~{self.query!r}"
+
+
+class CardIndex:
+    """Inverted indexes over a fixed card pool (rebuild it when the pool changes)."""
+    def __init__(self, cards: Iterable[Monster]):
+        self.cards: List[Monster] = list(cards)
+        self.all_bits = (1 << len(self.cards)) - 1
+        self.postings: Dict[str, Dict[object, int]] = {field: {} for field in FIELDS}
+        for number, card in enumerate(self.cards):
+            bit = 1 << number
+            for field, values_of in FIELDS.items():
+                postings = self.postings[field]
+                for value in values_of(card):
+                    key = _key(field, value)
+                    postings[key] = postings.get(key, 0) | bit
+
+    def search(self, query: Query) -> List[Monster]:
+        """Matching cards, in pool order."""
+        return [self.cards[i] for i in iter_bits(query.bits(self))]
+
+    def count(self, query: Query) -> int:
+        return bin(query.bits(self)).count("1")
+
+    def values(self, field: str) -> Dict[object, int]:
+        """Every indexed value of a field with its number of cards."""
+        return {value: bin(bits).count("1") for value, bits in sorted(self.postings[field].items(), key=lambda kv: str(kv[0]))}
+
+
+def parse_terms(terms: Iterable[str]) -> Query:
+    """Builds a query from CLI terms like 'level=3', 'type=Dragon,Rock' or '!attribute=FIRE'."""
+    query = Q()
+    for term in terms:
+        negate = term.startswith("!")
+        field, sep, value = term.lstrip("!").partition("=")
+        if not sep:
+            raise ValueError(f"Expected field=value, got '{term}'")
+        condition = Q(**{field: value.split(",")})
+        query = query & (~condition if negate else condition)
+    return query
+
+
+def main(argv=None):
+    from src.core.monster_loader import MonsterLoader, MONSTER_DIR
+    parser = argparse.ArgumentParser(description="Query the card pool")
+    parser.add_argument("terms", nargs="*", help="field=value[,value...] or !field=value; fields: " + ", ".join(FIELDS))
+    parser.add_argument("--dir", default=MONSTER_DIR, help="Card directory")
+    parser.add_argument("--pack", help="Read the cards from a card pack instead")
+    parser.add_argument("--values", metavar="FIELD", help="List the values of a field instead of searching")
+    args = parser.parse_args(argv)
+
+    cards = list(MonsterLoader.stream_pack(args.pack)) if args.pack else MonsterLoader.load_monsters(args.dir)
+    index = CardIndex(cards)
+    if args.values:
+        for value, count in index.values(args.values).items():
+            print(f"{value!s:<24} {count}")
+        return
+
+    results = index.search(parse_terms(args.terms))
+    for card in results:
+        print(f"{card.id or '-':<28} {card.name:<20} L{card.level} {card.type:<10} {card.attribute or '-'}")
+    print(f"{len(results)} of {len(index.cards)} cards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Card packs: a whole card set in one file.
+
+A pack is JSON Lines, one card per line in the same JSON as data/monsters,
+followed by an index and a fixed-size trailer:
+
+    {"format": "ddm-card-pack", "version": 1, "count": N}
+    {card}                     <- N lines
+    {"index": {"card_id": [offset, length], ...}}
+    DDMPACK-INDEX 0000000000012345
+
+The trailer holds the byte offset of the index line, so a reader finds any
+card with two seeks, and can stream the cards without loading the index.
+Convert a card directory with:
+
+    python -m src.core.card_pack pack data/monsters cards.ddmpack
+"""
+import argparse
+import json
+import mmap
+import os
+from typing import Dict, Iterator, Optional, Tuple
+from src.core.dataclasses import Monster
+
+PACK_FORMAT = "ddm-card-pack"
+PACK_VERSION = 1
+TRAILER_PREFIX = b"DDMPACK-INDEX "
+TRAILER_SIZE = len(TRAILER_PREFIX) + 16 + 1 # 16-digit offset and newline
+
+
+class CardPackError(ValueError):
+    pass
+
+
+def write_pack(directory_path: str, pack_path: str) -> int:
+    """Packs every .json card of a directory (filename order). Returns the card count."""
+    filenames = sorted(f for f in os.listdir(directory_path) if f.endswith(".json"))
+    index: Dict[str, Tuple[int, int]] = {}
+    tmp_path = f"{pack_path}.tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(_line({"format": PACK_FORMAT, "version": PACK_VERSION, "count": len(filenames)}))
+        for filename in filenames:
+            with open(os.path.join(directory_path, filename), "r") as f:
+                data = json.load(f)
+            data.setdefault("id", os.path.splitext(filename)[0])
+            if data["id"] in index:
+                raise CardPackError(f"Duplicate card id {data['id']} in {filename}")
+            line = _line(data)
+            index[data["id"]] = (out.tell(), len(line))
+            out.write(line)
+        index_offset = out.tell()
+        out.write(_line({"index": index}))
+        out.write(TRAILER_PREFIX + b"%016d\n" % index_offset)
+    os.replace(tmp_path, pack_path)
+    return len(index)
+
+
+def _line(data: dict) -> bytes:
+    # json.dumps escapes newlines inside strings, so one card is always one line
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class CardPack:
+    """
+    Reader for a card pack. Cards are parsed on demand: get() seeks straight
+    to one card through the index, iter_cards() streams them in pack order.
+    With use_mmap the file is memory-mapped instead of read through seeks.
+    """
+    def __init__(self, path: str, use_mmap: bool = False):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap: Optional[mmap.mmap] = None
+        if use_mmap:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = json.loads(self._file.readline())
+        if header.get("format") != PACK_FORMAT or header.get("version") != PACK_VERSION:
+            self.close()
+            raise CardPackError(f"{path} is not a version {PACK_VERSION} card pack")
+        self.count: int = header["count"]
+        self._data_start = self._file.tell()
+
+        size = os.fstat(self._file.fileno()).st_size
+        trailer = self._read(size - TRAILER_SIZE, TRAILER_SIZE)
+        if not trailer.startswith(TRAILER_PREFIX):
+            self.close()
+            raise CardPackError(f"{path} has no index trailer (truncated?)")
+        self._index_offset = int(trailer[len(TRAILER_PREFIX):])
+        self._index: Optional[Dict[str, Tuple[int, int]]] = None # Loaded on first lookup
+
+    def _read(self, offset: int, length: int) -> bytes:
+        if self._mmap is not None:
+            return self._mmap[offset:offset + length]
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    @property
+    def index(self) -> Dict[str, Tuple[int, int]]:
+        """card id -> (offset, length) of its line."""
+        if self._index is None:
+            self._file.seek(self._index_offset)
+            self._index = {card_id: tuple(entry) for card_id, entry in json.loads(self._file.readline())["index"].items()}
+        return self._index
+
+    def __contains__(self, card_id: str) -> bool:
+        return card_id in self.index
+
+    def __len__(self) -> int:
+        return self.count
+
+    def raw(self, card_id: str) -> dict:
+        offset, length = self.index[card_id]
+        return json.loads(self._read(offset, length))
+
+    def get(self, card_id: str) -> Monster:
+        """Parses a single card; raises KeyError if the pack does not have it."""
+        from src.core.monster_loader import MonsterLoader
+        return MonsterLoader.parse_monster(self.raw(card_id))
+
+    def iter_raw(self) -> Iterator[dict]:
+        """Card JSON objects in pack order, one line in memory at a time."""
+        offset = self._data_start
+        while offset < self._index_offset:
+            if self._mmap is not None:
+                end = self._mmap.find(b"\n", offset) + 1
+                line = self._mmap[offset:end]
+            else:
+                self._file.seek(offset)
+                line = self._file.readline()
+            offset += len(line)
+            yield json.loads(line)
+
+    def iter_cards(self) -> Iterator[Monster]:
+        from src.core.monster_loader import MonsterLoader
+        for data in self.iter_raw():
+            yield MonsterLoader.parse_monster(data)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "CardPack":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Card pack tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="Convert a directory of card JSON files into a pack")
+    pack.add_argument("directory")
+    pack.add_argument("pack_path")
+    listing = commands.add_parser("list", help="List the cards of a pack")
+    listing.add_argument("pack_path")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        count = write_pack(args.directory, args.pack_path)
+        print(f"Packed {count} cards into {args.pack_path}")
+    else:
+        with CardPack(args.pack_path) as card_pack:
+            for data in card_pack.iter_raw():
+                print(f"{data['id']:<32} {data.get('name', 'Unknown')}")
+
+
+if __name__ == "__main__":
+    main()
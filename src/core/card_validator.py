@@ -0,0 +1,264 @@
+"""
+Batch validation of card data (a directory of card JSON files or a card pack).
+
+Checks every card against CARD_SCHEMA plus the game registries (cube nets,
+effects, die faces, asset files) and writes a machine-readable report:
+
+    python -m src.core.card_validator data/monsters --report card_report.json
+
+Files are validated in batches on a process pool; the exit status is 1 when
+any error was found, so it can gate an ingest step.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from src.core.dataclasses import DieFace
+from src.core.effects import EFFECTS_REGISTRY, INERT, EffectCompileError, compile_spec
+from src.core.patterns_registry import resolve_pattern_id
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ASSETS_DIR = os.path.join(PROJECT_ROOT, "assets")
+
+VALIDATION_BATCH = 512 # Cards per worker task
+
+# Field -> rule. 'paths' are alternative locations (new format first, then old).
+# Fields without 'required' may be missing; present values are always checked.
+CARD_SCHEMA: Dict[str, dict] = {
+    "id": {"paths": ["id"], "type": str},
+    "name": {"paths": ["name"], "type": str, "required": True},
+    "level": {"paths": ["level"], "type": int, "required": True, "min": 1, "max": 12},
+    "type": {"paths": ["type"], "type": str},
+    "attribute": {"paths": ["attribute"], "type": str},
+    "hp": {"paths": ["stats.hp", "hp"], "type": int, "required": True, "min": 1},
+    "atk": {"paths": ["stats.atk", "atk"], "type": int, "required": True, "min": 0},
+    "def": {"paths": ["stats.def", "defense"], "type": int, "required": True, "min": 0},
+    "pattern": {"paths": ["pattern", "metadata.pattern"], "type": str, "required": True, "severity": "warning"},
+    "description": {"paths": ["description", "metadata.description"], "type": str},
+}
+
+# Asset references of a card, relative to ASSETS_DIR
+ASSET_PATHS = ["assets.card_full_art", "assets.token_sprite"]
+LEGACY_ASSET_PATHS = {"texture": "cards"} # Old format: file name inside assets/cards
+
+Issue = Dict[str, object]
+Check = Callable[[dict], List[Tuple[str, str, str, str]]] # -> (severity, code, field, message)
+
+
+def _getter(path: str) -> Callable[[dict], object]:
+    keys = path.split(".")
+    def get(data):
+        for key in keys:
+            if not isinstance(data, dict) or key not in data:
+                return _MISSING
+            data = data[key]
+        return data
+    return get
+
+_MISSING = object()
+
+
+def compile_schema(schema: Dict[str, dict]) -> List[Check]:
+    """Turns the declarative schema into one check function per field, once."""
+    checks = []
+    for field, rule in schema.items():
+        getters = [_getter(p) for p in rule["paths"]]
+        expected = rule["type"]
+        required = rule.get("required", False)
+        severity = rule.get("severity", "error")
+        low, high = rule.get("min"), rule.get("max")
+
+        def check(data, field=field, getters=getters, expected=expected, required=required,
+                  severity=severity, low=low, high=high):
+            for get in getters:
+                value = get(data)
+                if value is not _MISSING:
+                    break
+            else:
+                return [(severity, "missing_field", field, f"'{field}' is missing")] if required else []
+            # bool is an int subclass, but never a valid stat
+            if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+                return [("error", "bad_type", field, f"'{field}' should be {expected.__name__}, got {type(value).__name__}")]
+            if (low is not None and value < low) or (high is not None and value > high):
+                return [("error", "out_of_range", field, f"'{field}' = {value} outside [{low}, {high}]")]
+            return []
+        checks.append(check)
+
+    checks.extend([_check_pattern, _check_effects, _check_die_faces, _check_assets])
+    return checks
+
+
+def _check_pattern(data):
+    name = data.get("pattern") or (data.get("metadata") or {}).get("pattern")
+    if isinstance(name, str) and not resolve_pattern_id(name):
+        return [("error", "unknown_pattern", "pattern", f"'{name}' is not a cube net or alias")]
+    return []
+
+
+def _check_effects(data):
+    raw = data.get("effects", [])
+    if isinstance(data.get("mechanics"), dict) and "effects" in data["mechanics"]:
+        raw = data["mechanics"]["effects"]
+    issues = []
+    for effect in raw if isinstance(raw, list) else []:
+        if not isinstance(effect, dict):
+            effect = {"id": effect}
+        effect_id = effect.get("id")
+        # New effects need no registry entry, as long as they compile
+        try:
+            program = compile_spec(effect_id, effect.get("trigger"), effect.get("params", {}))
+        except EffectCompileError as e:
+            issues.append(("error", "bad_effect", "effects", f"Effect '{effect_id}': {e}"))
+            continue
+        if program is INERT and effect_id not in EFFECTS_REGISTRY:
+            issues.append(("error", "unknown_effect", "effects", f"Unknown effect '{effect_id}'"))
+    return issues
+
+
+def _check_die_faces(data):
+    faces = (data.get("die_configuration") or {}).get("faces", [])
+    return [
+        ("error", "unknown_die_face", "die_configuration", f"Unknown die face '{face.get('symbol')}'")
+        for face in faces if not isinstance(face, dict) or face.get("symbol") not in DieFace.__members__
+    ]
+
+
+@lru_cache(maxsize=None)
+def _asset_exists(relative_path: str) -> bool:
+    return os.path.isfile(os.path.join(ASSETS_DIR, relative_path))
+
+
+def _check_assets(data):
+    issues = []
+    refs = [(path, _getter(path)(data)) for path in ASSET_PATHS]
+    refs += [(key, f"{folder}/{data[key]}") for key, folder in LEGACY_ASSET_PATHS.items() if isinstance(data.get(key), str)]
+    for field, ref in refs:
+        if ref is _MISSING:
+            continue
+        if not isinstance(ref, str) or os.path.isabs(ref) or ".." in ref.split("/"):
+            issues.append(("error", "bad_asset", field, f"Invalid asset path {ref!r}"))
+        elif not _asset_exists(ref):
+            issues.append(("error", "bad_asset", field, f"Asset not found: assets/{ref}"))
+    return issues
+
+
+_CHECKS: Optional[List[Check]] = None
+
+def validate_card(data: dict) -> List[Tuple[str, str, str, str]]:
+    global _CHECKS
+    if _CHECKS is None:
+        _CHECKS = compile_schema(CARD_SCHEMA)
+    if not isinstance(data, dict):
+        return [("error", "bad_type", "", "A card must be a JSON object")]
+    issues = []
+    for check in _CHECKS:
+        issues.extend(check(data))
+    return issues
+
+
+def _validate_batch(batch: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], List[Issue]]:
+    """batch: (source name, raw JSON text or file path prefixed with '@'). Returns (ids, issues)."""
+    ids, issues = [], []
+    for source, payload in batch:
+        try:
+            if payload.startswith("@"):
+                with open(payload[1:], "r") as f:
+                    data = json.load(f)
+            else:
+                data = json.loads(payload)
+        except (OSError, ValueError) as e:
+            issues.append({"source": source, "card": None, "severity": "error", "code": "invalid_json",
+                           "field": "", "message": str(e)})
+            continue
+        card_id = data.get("id") if isinstance(data, dict) else None
+        card_id = card_id or os.path.splitext(os.path.basename(source))[0]
+        ids.append((card_id, source))
+        for severity, code, field, message in validate_card(data):
+            issues.append({"source": source, "card": card_id, "severity": severity, "code": code,
+                           "field": field, "message": message})
+    return ids, issues
+
+
+def _sources(path: str) -> Iterable[Tuple[str, str]]:
+    if os.path.isdir(path):
+        with os.scandir(path) as scan:
+            for entry in sorted(scan, key=lambda e: e.name):
+                if entry.name.endswith(".json") and entry.is_file():
+                    yield entry.name, "@" + entry.path
+    else:
+        from src.core.card_pack import CardPack
+        with CardPack(path) as pack:
+            for number, data in enumerate(pack.iter_raw()):
+                yield f"{os.path.basename(path)}#{number}", json.dumps(data)
+
+
+def validate(path: str, workers: Optional[int] = None) -> dict:
+    """Validates a card directory or pack; returns the report as a dict."""
+    started = time.perf_counter()
+    batches, batch = [], []
+    for source in _sources(path):
+        batch.append(source)
+        if len(batch) == VALIDATION_BATCH:
+            batches.append(batch)
+            batch = []
+    if batch:
+        batches.append(batch)
+
+    if workers == 1 or len(batches) <= 1:
+        results = [_validate_batch(b) for b in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_validate_batch, batches))
+
+    issues: List[Issue] = []
+    seen: Dict[str, str] = {}
+    cards = 0
+    for ids, batch_issues in results:
+        issues.extend(batch_issues)
+        for card_id, source in ids:
+            cards += 1
+            if card_id in seen:
+                issues.append({"source": source, "card": card_id, "severity": "error", "code": "duplicate_id",
+                               "field": "id", "message": f"Also defined in {seen[card_id]}"})
+            else:
+                seen[card_id] = source
+
+    counts: Dict[str, int] = {}
+    for issue in issues:
+        counts[issue["code"]] = counts.get(issue["code"], 0) + 1
+    return {
+        "source": os.path.abspath(path),
+        "cards": cards,
+        "errors": sum(1 for i in issues if i["severity"] == "error"),
+        "warnings": sum(1 for i in issues if i["severity"] == "warning"),
+        "counts": counts,
+        "seconds": round(time.perf_counter() - started, 3),
+        "issues": issues,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Validate card JSON files or a card pack")
+    parser.add_argument("path", help="Card directory or card pack")
+    parser.add_argument("--report", help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    report = validate(args.path, args.workers)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=1)
+        print(f"{report['cards']} cards, {report['errors']} errors, {report['warnings']} warnings "
+              f"in {report['seconds']}s -> {args.report}")
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Hot reload of card data: polls a card directory for changed files.
+
+    watcher = MonsterLoader.watch(MONSTER_DIR)
+    watcher.subscribe(on_cards_changed)
+    watcher.poll() # e.g. once a second from the UI loop
+
+Only files whose mtime or size changed are parsed again. The new templates
+are swapped in all at once (the shared card pool included), then the
+subscribers get a CardReload with the (old, new) template pairs.
+"""
+import os
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from src.core.dataclasses import Monster
+
+
+class CardReload(NamedTuple):
+    replaced: List[Tuple[Monster, Monster]] # (old template, new template)
+    added: List[Monster]
+    removed: List[Monster]
+
+
+class CardWatcher:
+    def __init__(self, directory_path: str):
+        from src.core.monster_loader import MonsterLoader
+        self._loader = MonsterLoader
+        self.directory_path = os.path.abspath(directory_path)
+        self._subscribers: List[Callable[[CardReload], None]] = []
+        # Seeded from the card cache: only files edited since it was written are parsed.
+        # Templates are interned, so these are the very objects of the shared pool
+        entries = self._loader.load_entries(self.directory_path)
+        self._stamps: Dict[str, Tuple[int, int]] = {filename: stamp for filename, (stamp, _) in entries.items()}
+        self._cards: Dict[str, Monster] = {filename: monster for filename, (_, monster) in entries.items() if monster}
+
+    def subscribe(self, callback: Callable[[CardReload], None]):
+        self._subscribers.append(callback)
+
+    @property
+    def cards(self) -> Tuple[Monster, ...]:
+        return tuple(self._cards[f] for f in sorted(self._cards))
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        stamps = {}
+        if not os.path.isdir(self.directory_path):
+            return stamps
+        with os.scandir(self.directory_path) as scan:
+            for entry in scan:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def _load(self, filename: str) -> Optional[Monster]:
+        return self._loader._load_file(os.path.join(self.directory_path, filename), filename, self.directory_path)
+
+    def poll(self) -> Optional[CardReload]:
+        """Checks the directory once. Returns what changed (after notifying subscribers), or None."""
+        stamps = self._scan()
+        if stamps == self._stamps:
+            return None
+
+        cards = dict(self._cards)
+        replaced, added, removed = [], [], []
+        for filename, stamp in stamps.items():
+            if self._stamps.get(filename) == stamp:
+                continue
+            monster = self._load(filename)
+            old = cards.get(filename)
+            if monster is None:
+                continue # Broken edit: keep the previous version until the file is fixed
+            if old is None:
+                added.append(monster)
+            elif old is not monster:
+                replaced.append((old, monster))
+            cards[filename] = monster
+        for filename in self._stamps.keys() - stamps.keys():
+            old = cards.pop(filename, None)
+            if old is not None:
+                removed.append(old)
+
+        # Swap everything at once: readers see either the old or the new set
+        self._stamps = stamps
+        self._cards = cards
+        self._loader.replace_card_pool(self.directory_path, self.cards)
+
+        if not (replaced or added or removed):
+            return None
+        reload = CardReload(replaced, added, removed)
+        for callback in self._subscribers:
+            callback(reload)
+        return reload
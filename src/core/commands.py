@@ -0,0 +1,179 @@
+"""
+Game actions as commands: small immutable, serializable objects that the
+engine validates and executes (GameEngine.apply / apply_many).
+
+    engine.apply(Roll())
+    engine.apply(Summon(pattern="NET_10", x=6, y=1, hand_index=0))
+    engine.apply_many([Move(from_x=6, from_y=1, to_x=6, to_y=3), NextPhase()])
+
+Commands are plain data, so AIs, tests and replays can store and send them:
+
+    data = command.model_dump()      # {"kind": "move", "from_x": 6, ...}
+    command = parse_command(data)
+
+Unknown fields are rejected: a command only says what the player chose,
+the rules (e.g. the summon cost) stay in the engine.
+"""
+from abc import abstractmethod
+from typing import Annotated, Any, Iterable, List, Literal, NamedTuple, Optional, Union
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
+from src.core.dataclasses import DieFace
+from src.core.patterns_registry import PATTERNS, card_pattern_id, resolve_pattern_id
+
+
+class CommandResult(NamedTuple):
+    ok: bool
+    message: str
+    value: Any = None # What the engine method returned, e.g. the rolled crests
+
+
+class Command(BaseModel):
+    """
+    Base class: check() returns why the command can never be played (or None),
+    validate_for() why it can't be played now, execute() plays it.
+    """
+    class Config:
+        frozen = True
+        extra = "forbid"
+
+    def check(self) -> Optional[str]:
+        return None
+
+    def validate_for(self, engine) -> Optional[str]:
+        return None
+
+    @abstractmethod
+    def execute(self, engine) -> CommandResult:
+        ...
+
+
+def _own_unit(engine, x: int, y: int) -> Optional[str]:
+    cell = engine.grid.get_cell(x, y)
+    if cell is None:
+        return f"({x}, {y}) is off the board"
+    if not cell.monster_id:
+        return f"No monster at ({x}, {y})"
+    if cell.monster_owner_id != engine.current_player_id:
+        return f"The monster at ({x}, {y}) belongs to the other player"
+    return None
+
+
+class Roll(Command):
+    kind: Literal["roll"] = "roll"
+
+    def execute(self, engine) -> CommandResult:
+        results = engine.roll_dice()
+        return CommandResult(True, "Rolled", results)
+
+
+class NextPhase(Command):
+    kind: Literal["next_phase"] = "next_phase"
+
+    def execute(self, engine) -> CommandResult:
+        phase = engine.next_phase()
+        return CommandResult(True, phase.value, phase)
+
+
+class EndTurn(Command):
+    kind: Literal["end_turn"] = "end_turn"
+
+    def execute(self, engine) -> CommandResult:
+        engine.end_turn()
+        return CommandResult(True, f"Player {engine.current_player_id}'s turn", engine.current_player_id)
+
+
+class Summon(Command):
+    """
+    Dimension 'pattern' at (x, y) and summon the card at hand_index (None: no
+    monster). The pattern must be the card's own net.
+    """
+    kind: Literal["summon"] = "summon"
+    pattern: str # Net ID or alias
+    x: int
+    y: int
+    rotation: int = 0
+    flipped: bool = False
+    hand_index: Optional[int] = None
+    _pattern_id: Optional[str] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        self._pattern_id = resolve_pattern_id(self.pattern) # Resolved once, not on every check
+
+    def check(self) -> Optional[str]:
+        if self._pattern_id is None:
+            return f"Unknown pattern '{self.pattern}'"
+        if self.hand_index is not None and self.hand_index < 0:
+            return f"No card {self.hand_index} in hand"
+        return None
+
+    def validate_for(self, engine) -> Optional[str]:
+        if self.hand_index is None:
+            return None
+        hand = engine.get_current_player().hand
+        if self.hand_index >= len(hand):
+            return f"No card {self.hand_index} in hand ({len(hand)} cards)"
+        card = hand[self.hand_index]
+        if card_pattern_id(card) != self._pattern_id:
+            return f"{card.name} unfolds as {card_pattern_id(card)}, not {self._pattern_id}"
+        return None
+
+    def execute(self, engine) -> CommandResult:
+        player = engine.get_current_player()
+        monster = player.hand[self.hand_index] if self.hand_index is not None else None
+        ok, message = engine.execute_dimension(PATTERNS[self._pattern_id], self.x, self.y,
+                                               self.rotation, self.flipped, monster=monster)
+        return CommandResult(ok, message, monster)
+
+
+class Move(Command):
+    kind: Literal["move"] = "move"
+    from_x: int
+    from_y: int
+    to_x: int
+    to_y: int
+
+    def validate_for(self, engine) -> Optional[str]:
+        return _own_unit(engine, self.from_x, self.from_y)
+
+    def execute(self, engine) -> CommandResult:
+        if engine.execute_move(self.from_x, self.from_y, self.to_x, self.to_y):
+            return CommandResult(True, f"Moved to ({self.to_x}, {self.to_y})")
+        steps = engine.get_current_player().crests.get(DieFace.MOVEMENT, 0)
+        return CommandResult(False, f"Cannot reach ({self.to_x}, {self.to_y}) with {steps} Movement Crests")
+
+
+class Attack(Command):
+    kind: Literal["attack"] = "attack"
+    from_x: int
+    from_y: int
+    to_x: int
+    to_y: int
+
+    def validate_for(self, engine) -> Optional[str]:
+        error = _own_unit(engine, self.from_x, self.from_y)
+        if error:
+            return error
+        target = engine.grid.get_cell(self.to_x, self.to_y)
+        if target is None or not target.monster_id or target.monster_owner_id == engine.current_player_id:
+            return f"No enemy monster at ({self.to_x}, {self.to_y})"
+        return None
+
+    def execute(self, engine) -> CommandResult:
+        ok, message = engine.execute_attack(self.from_x, self.from_y, self.to_x, self.to_y)
+        return CommandResult(ok, message)
+
+
+AnyCommand = Annotated[Union[Roll, NextPhase, EndTurn, Summon, Move, Attack], Field(discriminator="kind")]
+
+_COMMAND = TypeAdapter(AnyCommand)
+
+
+def parse_command(data: Union[dict, str]) -> Command:
+    """Command from model_dump() output (or its JSON)."""
+    if isinstance(data, str):
+        return _COMMAND.validate_json(data)
+    return _COMMAND.validate_python(data)
+
+
+def parse_commands(items: Iterable[Union[dict, str]]) -> List[Command]:
+    return [parse_command(item) for item in items]
@@ -0,0 +1,202 @@
+"""
+Generator for the dungeon pattern library: the 11 hexomino nets of a cube.
+
+The generated table (shapes plus precompiled orientation masks) is cached in
+data/patterns/cube_nets.json and read from there at startup. Regenerate it with:
+
+    python -m src.core.cube_nets
+"""
+import json
+import os
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+from src.core.constants import BOARD_HEIGHT
+
+Coord = Tuple[int, int]
+Shape = Tuple[Coord, ...]
+
+CACHE_VERSION = 1
+NET_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data", "patterns", "cube_nets.json",
+)
+
+
+# Hand-listed patterns from earlier versions. The ones that really fold into a
+# cube stay available as aliases of their net; the others are dropped.
+LEGACY_SHAPES: Dict[str, List[Coord]] = {
+    "CROSS": [(0,0), (0,1), (0,-1), (1,0), (-1,0), (0,2)],
+    "T_SHAPE": [(0,0), (0,1), (0,-1), (1,0), (-1,0), (0, -2)],
+    "L_SHAPE": [(0,0), (0,1), (0,2), (0,-1), (1,-1), (2,-1)],
+    "LINE": [(0,0), (0,1), (0,2), (0,-1), (0,-2), (0,3)],
+    "Z_SHAPE": [(0,0), (1,0), (1,1), (0,-1), (-1,-1), (-1,-2)],
+    "H_SHAPE": [(0,0), (0,1), (0,-1), (1,1), (1,-1), (-1,0)],
+}
+
+
+# --- Geometry ---
+
+def _transforms(cells: Iterable[Coord]) -> List[List[Coord]]:
+    """The 8 rotations/reflections of a set of cells."""
+    cells = list(cells)
+    result = []
+    for flipped in (False, True):
+        coords = [(-x, y) for x, y in cells] if flipped else cells
+        for _ in range(4):
+            result.append(coords)
+            coords = [(y, -x) for x, y in coords]
+    return result
+
+
+def _normalize(cells: Iterable[Coord]) -> Shape:
+    cells = list(cells)
+    min_x = min(x for x, _ in cells)
+    min_y = min(y for _, y in cells)
+    return tuple(sorted((x - min_x, y - min_y) for x, y in cells))
+
+
+def canonical_form(cells: Iterable[Coord]) -> Shape:
+    """Smallest normalized shape over every rotation and reflection."""
+    return min(_normalize(t) for t in _transforms(cells))
+
+
+def enumerate_polyominoes(size: int) -> List[Shape]:
+    """All free polyominoes of 'size' cells, as sorted canonical forms."""
+    current = {canonical_form([(0, 0)])}
+    for _ in range(size - 1):
+        grown = set()
+        for shape in current:
+            cells = set(shape)
+            for x, y in shape:
+                for nx, ny in ((x+1, y), (x-1, y), (x, y+1), (x, y-1)):
+                    if (nx, ny) not in cells:
+                        grown.add(canonical_form(cells | {(nx, ny)}))
+        current = grown
+    return sorted(current)
+
+
+def folds_into_cube(cells: Iterable[Coord]) -> bool:
+    """
+    Rolls a cube across the net and checks that every cell lands on a different face.
+    The cube state is the (bottom, north, east) face normals.
+    """
+    cells = set(cells)
+    start = min(cells)
+    states = {start: ((0, 0, -1), (0, 1, 0), (1, 0, 0))}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        bottom, north, east = states[(x, y)]
+        top = tuple(-v for v in bottom)
+        rolls = {
+            (x+1, y): (east, north, top),
+            (x-1, y): (tuple(-v for v in east), north, bottom),
+            (x, y+1): (north, top, east),
+            (x, y-1): (tuple(-v for v in north), bottom, east),
+        }
+        for cell, state in rolls.items():
+            if cell in cells and cell not in states:
+                states[cell] = state
+                queue.append(cell)
+    bottoms = {state[0] for state in states.values()}
+    return len(states) == len(cells) == 6 and len(bottoms) == 6
+
+
+def _anchor(shape: Shape) -> Coord:
+    """Monster cell of a net: the cell with the most neighbours (first in order on ties)."""
+    cells = set(shape)
+    def degree(c):
+        x, y = c
+        return sum((n in cells) for n in ((x+1, y), (x-1, y), (x, y+1), (x, y-1)))
+    return max(shape, key=lambda c: (degree(c), -shape.index(c)))
+
+
+# --- Orientation masks ---
+
+def compile_orientations(shape: Iterable[Coord], board_height: int = BOARD_HEIGHT) -> dict:
+    """
+    Distinct orientations of a shape anchored at (0, 0), with footprint masks.
+    'keys' maps each of the 8 (rotation + 4 * flipped) codes to an entry of 'unique'.
+    """
+    unique = []
+    seen: Dict[FrozenSet[Coord], int] = {}
+    keys = []
+    for code, coords in enumerate(_transforms(shape)):
+        footprint = frozenset(coords)
+        if footprint not in seen:
+            min_dx = min(x for x, _ in coords)
+            min_dy = min(y for _, y in coords)
+            mask = 0
+            for dx, dy in coords:
+                mask |= 1 << ((dx - min_dx) * board_height + (dy - min_dy))
+            seen[footprint] = len(unique)
+            unique.append({
+                "rotation": code % 4,
+                "flipped": code >= 4,
+                "offsets": [list(c) for c in coords],
+                "mask": mask,
+            })
+        keys.append(seen[footprint])
+    return {"unique": unique, "keys": keys}
+
+
+# --- Library ---
+
+def generate_cube_nets(board_height: int = BOARD_HEIGHT) -> dict:
+    """
+    Builds the net library: every cube-foldable hexomino, canonicalized under
+    rotation/reflection, sorted by canonical form and numbered NET_01..NET_11.
+    """
+    nets = []
+    canonical_nets = [s for s in enumerate_polyominoes(6) if folds_into_cube(s)]
+    for number, shape in enumerate(canonical_nets, start=1):
+        ax, ay = _anchor(shape)
+        anchored = [(x - ax, y - ay) for x, y in shape]
+        nets.append({
+            "id": f"NET_{number:02d}",
+            "canonical": [list(c) for c in shape],
+            "shape": [list(c) for c in anchored],
+            "orientations": compile_orientations(anchored, board_height),
+        })
+
+    ids_by_canonical = {tuple(map(tuple, net["canonical"])): net["id"] for net in nets}
+    aliases = {}
+    for name, shape in LEGACY_SHAPES.items():
+        net_id = ids_by_canonical.get(canonical_form(shape))
+        if net_id:
+            aliases[name] = net_id
+
+    return {"version": CACHE_VERSION, "board_height": board_height, "nets": nets, "aliases": aliases}
+
+
+def write_cache(library: dict, path: str = NET_CACHE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(library, f, indent=1)
+
+
+def load_cube_nets(path: str = NET_CACHE_PATH) -> dict:
+    """
+    Loads the cached net library, regenerating (and rewriting) it only if the
+    cache is missing or was built for another version/board size.
+    """
+    try:
+        with open(path, "r") as f:
+            library = json.load(f)
+        if library.get("version") == CACHE_VERSION and library.get("board_height") == BOARD_HEIGHT:
+            return library
+    except (OSError, ValueError):
+        pass
+
+    library = generate_cube_nets()
+    try:
+        write_cache(library, path)
+    except OSError:
+        pass # Read-only install: keep the in-memory table
+    return library
+
+
+if __name__ == "__main__":
+    library = generate_cube_nets()
+    write_cache(library)
+    print(f"Wrote {len(library['nets'])} cube nets to {NET_CACHE_PATH}")
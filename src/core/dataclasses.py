@@ -1,6 +1,8 @@
+import weakref
 from enum import Enum
 from typing import List, Tuple, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+from src.core.effects import CompiledEffect, compile_spec
 
 class DieFace(str, Enum):
     SUMMON = "SUMMON"
@@ -18,14 +20,56 @@ class Pattern(BaseModel):
     """
     shape: List[Tuple[int, int]]
 
+class DieFaceSpec(BaseModel):
+    """One side of a monster's die (from 'die_configuration')."""
+    symbol: DieFace
+    multiplier: int = 1
+
+    class Config:
+        frozen = True
+
+class EffectSpec(BaseModel):
+    """
+    A card effect: its ID, the event that triggers it and its parameters.
+    Compiled on creation (see src/core/effects.py); bad params raise here.
+    """
+    id: str
+    trigger: Optional[str] = None
+    params: dict = {}
+    _program: CompiledEffect = PrivateAttr(default=None)
+
+    class Config:
+        frozen = True
+
+    def model_post_init(self, __context):
+        self._program = compile_spec(self.id, self.trigger, self.params)
+
+    @property
+    def program(self) -> CompiledEffect:
+        return self._program
+
+    # Closures don't pickle (card cache): drop the program and compile again on load
+    def __getstate__(self):
+        return dict(super().__getstate__(), __pydantic_private__={})
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.model_post_init(None)
+
 class Monster(BaseModel):
+    """Card definition. Immutable: one instance is shared by every game."""
+    id: Optional[str] = None # Card ID, defaults to the JSON file name
     name: str
     level: int
     hp: int
     atk: int
     defense: int = Field(alias="def") # 'def' is a reserved keyword
     pattern: Pattern
+    pattern_id: Optional[str] = None # Net ID in patterns_registry.PATTERNS
     effects: List[str] = [] # List of Effect IDs
+    effect_specs: List[EffectSpec] = [] # Same effects with trigger and params
+    attribute: Optional[str] = None # e.g. EARTH, FIRE
+    die_faces: List[DieFaceSpec] = []
     type: str = "Warrior" # Default type
     description: str = ""
     texture_path: Optional[str] = None
@@ -33,6 +77,16 @@ class Monster(BaseModel):
     
     class Config:
         populate_by_name = True
+        frozen = True
+
+# Cards are the flyweight templates of summoned units (see src/core/units.py)
+MonsterTemplate = Monster
+
+_TEMPLATES: "weakref.WeakValueDictionary[str, Monster]" = weakref.WeakValueDictionary()
+
+def intern_template(monster: Monster) -> Monster:
+    """Canonical object for a card definition: equal cards share one instance."""
+    return _TEMPLATES.setdefault(monster.model_dump_json(), monster)
 
 class PlayerState(BaseModel):
     player_id: int
@@ -1,37 +1,216 @@
-from typing import Callable, Any, Dict
+"""
+Card effects, written as data and compiled to closures.
+
+An effect is a trigger, params and optional conditions, as in the card JSON:
+
+    {"id": "E045_COUNTER_STANCE", "trigger": "ON_DEFENSE_SUCCESS",
+     "params": {"damage_reflect": 10, "condition": "ATTACKER_IS_ADJACENT"}}
+
+Every param key is an operation (see OPS) or a modifier ("condition",
+"target"). A card may give only an effect ID; the trigger and params then
+come from EFFECTS_REGISTRY, and any it does give override those.
+
+Each distinct definition is compiled once, when the card is loaded
+(EffectSpec.program), and the compiled effect is shared by every card and
+unit using it: resolving an effect in combat runs closures, it never reads
+the params again.
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+# Trigger types (the "trigger" of a card effect)
+ON_SUMMON = "ON_SUMMON"                   # The unit was just summoned
+ON_ATTACK = "ON_ATTACK"                   # The unit attacks (before damage; event.atk can be changed)
+ON_DEFENSE_SUCCESS = "ON_DEFENSE_SUCCESS" # The unit defended with a DEFENSE crest and survived
+ON_DAMAGED = "ON_DAMAGED"                 # The unit took damage and survived
+ON_TURN_START = "ON_TURN_START"           # Its owner's turn begins
+ON_DESTROYED = "ON_DESTROYED"             # Any unit was destroyed (event.unit; see BOARD_TRIGGERS)
+
+TRIGGERS = (ON_SUMMON, ON_ATTACK, ON_DEFENSE_SUCCESS, ON_DAMAGED, ON_TURN_START, ON_DESTROYED)
+# Heard by every unit on the board, not only by the unit it happened to
+BOARD_TRIGGERS = frozenset({ON_DESTROYED})
+
+
+class TriggerEvent:
+    """What happened: the trigger, the unit it happened to and any details (attacker, atk, ...)."""
+    def __init__(self, trigger: str, unit=None, player_id: Optional[int] = None, **details):
+        self.trigger = trigger
+        self.unit = unit
+        self.player_id = player_id
+        self.__dict__.update(details)
+
+    def __repr__(self):
+        return f"TriggerEvent({self.trigger}, {self.__dict__})"
+
+
+class EffectCompileError(ValueError):
+    pass
+
+
+# (engine, unit owning the effect, event) -> None
+Op = Callable[[Any, Any, TriggerEvent], None]
+
+
+class CompiledEffect(NamedTuple):
+    trigger: Optional[str] # None: the effect never fires
+    run: Callable[[Any, Any, TriggerEvent], bool] # False if a condition did not hold
+
 
 class Effect:
-    """Base class for all card/monster effects."""
-    def __init__(self, effect_id: str, description: str):
+    """A named effect: its description and default trigger and params."""
+    def __init__(self, effect_id: str, description: str, trigger: Optional[str] = None, params: Optional[dict] = None):
         self.effect_id = effect_id
         self.description = description
-    
-    def apply(self, game_engine, **kwargs):
-        """Override this method to implement effect logic."""
-        pass
-
-# --- Specific Effects Implementation ---
-
-class EffectDoubleAttack(Effect):
-    def apply(self, game_engine, **kwargs):
-        attacker = kwargs.get('attacker')
-        if attacker:
-            print(f"Effect Triggered: {self.effect_id} - Doubling Attack for {attacker.name}!")
-            # Logic would go here (e.g. temporary buff)
-
-class EffectHealSelf(Effect):
-    def apply(self, game_engine, **kwargs):
-        monster = kwargs.get('monster')
-        if monster:
-            print(f"Effect Triggered: {self.effect_id} - Healing {monster.name}!")
-            # Logic here
+        self.trigger = trigger
+        self.params = params or {}
+
+# --- Conditions ("condition": a name or a list of names, all must hold) ---
+
+CONDITIONS: Dict[str, Callable[[Any, Any, TriggerEvent], bool]] = {
+    "ATTACKER_IS_ADJACENT": lambda engine, unit, event: (
+        getattr(event, "attacker", None) is not None
+        and abs(event.attacker.x - unit.x) + abs(event.attacker.y - unit.y) == 1
+    ),
+    "IS_DAMAGED": lambda engine, unit, event: unit.hp < unit.max_hp,
+    "OWNERS_TURN": lambda engine, unit, event: engine.current_player_id == unit.owner_id,
+    "UNIT_IS_ALLY": lambda engine, unit, event: (
+        event.unit is not None and event.unit is not unit and event.unit.owner_id == unit.owner_id
+    ),
+    "UNIT_IS_ENEMY": lambda engine, unit, event: event.unit is not None and event.unit.owner_id != unit.owner_id,
+}
+
+# --- Operations (param key -> factory(value, params) -> Op) ---
+
+# Who an operation acts on ("target" param)
+TARGETS: Dict[str, Callable[[Any, TriggerEvent], Any]] = {
+    "SELF": lambda unit, event: unit,
+    "ATTACKER": lambda unit, event: getattr(event, "attacker", None),
+    "TARGET": lambda unit, event: getattr(event, "target", None),
+}
+
+def _number(key: str, value) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise EffectCompileError(f"'{key}' should be a number, got {value!r}")
+    return value
+
+def _target(params: dict, default: str):
+    name = params.get("target", default)
+    if name not in TARGETS:
+        raise EffectCompileError(f"Unknown target '{name}', expected one of {sorted(TARGETS)}")
+    return TARGETS[name]
+
+def _atk_multiplier(value, params) -> Op:
+    value = _number("atk_multiplier", value)
+    def op(engine, unit, event):
+        event.atk = int(event.atk * value)
+    return op
+
+def _atk_bonus(value, params) -> Op:
+    value = _number("atk_bonus", value)
+    def op(engine, unit, event):
+        event.atk += value
+    return op
+
+def _heal(value, params) -> Op:
+    value, select = _number("heal", value), _target(params, "SELF")
+    def op(engine, unit, event):
+        who = select(unit, event)
+        if who is not None:
+            engine.heal_unit(who.x, who.y, value)
+    return op
+
+def _damage(value, params) -> Op:
+    value, select = _number("damage", value), _target(params, "TARGET")
+    def op(engine, unit, event):
+        who = select(unit, event)
+        if who is not None:
+            engine.damage_unit(who.x, who.y, value)
+    return op
+
+def _damage_reflect(value, params) -> Op:
+    return _damage(value, dict(params, target="ATTACKER"))
+
+# Run in this order, whatever the order in the card
+OPS: Dict[str, Callable[[Any, dict], Op]] = {
+    "atk_multiplier": _atk_multiplier,
+    "atk_bonus": _atk_bonus,
+    "heal": _heal,
+    "damage": _damage,
+    "damage_reflect": _damage_reflect,
+}
+MODIFIERS = {"condition", "target"}
 
 # --- Registry ---
 
 EFFECTS_REGISTRY: Dict[str, Effect] = {
-    "E001_DOUBLE_ATK": EffectDoubleAttack("E001_DOUBLE_ATK", "Double Attack Power for one turn."),
-    "E002_HEAL_SELF": EffectHealSelf("E002_HEAL_SELF", "Heal 10 HP."),
+    "E001_DOUBLE_ATK": Effect("E001_DOUBLE_ATK", "Double Attack Power for one turn.",
+                              ON_ATTACK, {"atk_multiplier": 2}),
+    "E002_HEAL_SELF": Effect("E002_HEAL_SELF", "Heal 10 HP.",
+                             ON_TURN_START, {"heal": 10}),
+    "E045_COUNTER_STANCE": Effect("E045_COUNTER_STANCE", "After a successful defense, deal 10 damage to an adjacent attacker.",
+                                  ON_DEFENSE_SUCCESS, {"damage_reflect": 10, "condition": "ATTACKER_IS_ADJACENT"}),
 }
 
 def get_effect(effect_id: str) -> Effect:
     return EFFECTS_REGISTRY.get(effect_id)
+
+# --- Compiler ---
+
+def _never(engine, unit, event):
+    return False
+
+INERT = CompiledEffect(None, _never)
+
+_PROGRAMS: Dict[str, CompiledEffect] = {} # Definition (as JSON) -> compiled effect
+
+def compile_effect(trigger: Optional[str], params: dict) -> CompiledEffect:
+    """Compiled form of an effect definition (cached: equal definitions share one)."""
+    try:
+        key = json.dumps([trigger, params], sort_keys=True)
+    except (TypeError, ValueError) as e:
+        raise EffectCompileError(f"Effect params are not plain data: {e}")
+    program = _PROGRAMS.get(key)
+    if program is None:
+        program = _PROGRAMS[key] = _compile(trigger, params)
+    return program
+
+def compile_spec(effect_id: str, trigger: Optional[str], params: dict) -> CompiledEffect:
+    """Compiles a card effect, filling in what it leaves out from the registry."""
+    known = EFFECTS_REGISTRY.get(effect_id)
+    if known is not None:
+        trigger = trigger or known.trigger
+        params = {**known.params, **params}
+    if trigger is None:
+        return INERT # Bare unknown ID: nothing to run (the validator reports it)
+    return compile_effect(trigger, params)
+
+def _compile(trigger: str, params: dict) -> CompiledEffect:
+    if trigger not in TRIGGERS:
+        raise EffectCompileError(f"Unknown trigger '{trigger}', expected one of {list(TRIGGERS)}")
+    if not isinstance(params, dict):
+        raise EffectCompileError("Effect params should be an object")
+    unknown = params.keys() - OPS.keys() - MODIFIERS
+    if unknown:
+        raise EffectCompileError(f"Unknown effect params {sorted(unknown)}, expected {sorted(OPS)} or {sorted(MODIFIERS)}")
+
+    names = params.get("condition") or []
+    names = [names] if isinstance(names, str) else names
+    conditions = []
+    for name in names:
+        if name not in CONDITIONS:
+            raise EffectCompileError(f"Unknown condition '{name}', expected one of {sorted(CONDITIONS)}")
+        conditions.append(CONDITIONS[name])
+    ops: List[Op] = [factory(params[key], params) for key, factory in OPS.items() if key in params]
+
+    def run(engine, unit, event):
+        for condition in conditions:
+            if not condition(engine, unit, event):
+                return False
+        for op in ops:
+            op(engine, unit, event)
+        return True
+    return CompiledEffect(trigger, run)
+
+def unit_triggers(unit) -> Iterable[str]:
+    """Triggers a unit listens to (see Grid.trigger_masks)."""
+    return {spec.program.trigger for spec in unit.template.effect_specs if spec.program.trigger}
@@ -1,56 +1,266 @@
-from typing import Dict
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 import random
-from src.core.grid import Grid
-from src.core.dataclasses import PlayerState, DieFace
+from src.core.actions import ActionRecord, CREST, HAND, RNG, TURN, Resolution, TurnState, recorded
+from src.core.grid import CellState, Grid, GridState
+from src.core.units import MonsterInstance
+from src.core.dataclasses import Monster, Pattern, PlayerState, DieFace
 from src.core.constants import Phase
+from src.core.bitboard import bit_index
+from src.core.commands import Command, CommandResult
+from src.core.effects import (BOARD_TRIGGERS, ON_ATTACK, ON_DAMAGED, ON_DEFENSE_SUCCESS, ON_DESTROYED,
+                              ON_SUMMON, ON_TURN_START, TriggerEvent)
+from src.core.log import EVENT, event, get_logger
+from src.core.zobrist import crest_key, turn_key
+
+log = get_logger("engine")
+
+DIE_FACES = tuple(DieFace)
+
+class PlayerSnapshot(NamedTuple):
+    player_id: int
+    hp: int
+    crests: Tuple[int, ...] # Counts in DIE_FACES order
+    hand: Tuple[Monster, ...]
+    dice_pool: Tuple[dict, ...]
+
+class EngineSnapshot(NamedTuple):
+    """Immutable game position, see GameEngine.snapshot()."""
+    grid: GridState
+    players: Tuple[PlayerSnapshot, ...]
+    current_player_id: int
+    turn_count: int
+    current_phase: Phase
+
+MAX_TRIGGER_DEPTH = 32 # Longest chain of triggers caused by triggers
+
+# Deals the card pool into starting hands: pool -> {player_id: hand}
+HandSplit = Callable[[Sequence[Monster]], Dict[int, List[Monster]]]
+
+def alternate_hands(pool: Sequence[Monster]) -> Dict[int, List[Monster]]:
+    """Default deal: even cards to P1, odd cards to P2."""
+    return {1: list(pool[0::2]), 2: list(pool[1::2])}
+
+def mirror_hands(pool: Sequence[Monster]) -> Dict[int, List[Monster]]:
+    """Both players get the whole pool (mirror matches for balance testing)."""
+    return {1: list(pool), 2: list(pool)}
+
+def _reloaded_hp(hp: int, old: Monster, new: Monster) -> int:
+    """HP of a unit after its card changed from 'old' to 'new': same damage, at least 1."""
+    return max(1, new.hp - (old.hp - hp))
 
 class GameEngine:
-    def __init__(self):
+    max_trigger_depth = MAX_TRIGGER_DEPTH
+
+    def __init__(self, rng: Optional[random.Random] = None,
+                 card_pool: Optional[Sequence[Monster]] = None,
+                 deal: HandSplit = alternate_hands):
+        """
+        'card_pool' defaults to the shared card database (loaded once per process).
+        Cards are read-only and shared between engines; only the hands are per game.
+        """
+        self.rng = rng or random.Random() # Dice source; seed it for reproducible games
         self.grid = Grid()
         self.players: Dict[int, PlayerState] = {
             1: PlayerState(player_id=1),
             2: PlayerState(player_id=2)
         }
         
-        # Load and Distribute Monsters
-        from src.core.monster_loader import MonsterLoader
-        all_monsters = MonsterLoader.load_monsters("data/monsters")
-        
-        # Simple split: Evens to P1, Odds to P2 (or split half/half)
-        # We need to make copies if we want independent instances, 
-        # but for now shared reference (read-only stats) is fine, 
-        # BUT 'hand' is a list on PlayerState, so that is distinct.
-        # Wait - if we modify the Monster object (e.g. current HP), we need deep copies.
-        # Currently Monster is a Pydantic model. 
-        # Let's just distribute references for now, assuming base stats don't execute logic on the card instance itself 
-        # (logic should be on the board instance).
-        
-        # Split logic:
-        mid_idx = len(all_monsters) // 2
-        # P1 gets first half, P2 gets second half
-        # To ensure fair distribution of types, maybe alternating?
-        
-        for i, monster in enumerate(all_monsters):
-            if i % 2 == 0:
-                self.players[1].hand.append(monster)
-            else:
-                self.players[2].hand.append(monster)
+        # Distribute Monsters
+        if card_pool is None:
+            from src.core.monster_loader import MonsterLoader
+            card_pool = MonsterLoader.load_card_pool()
+        for player_id, hand in deal(card_pool).items():
+            self.players[player_id].hand.extend(hand)
         
         self.current_player_id = 1
         self.turn_count = 1
         self.current_phase = Phase.ROLL
+
+        # Undo/redo: one ActionRecord per player action
+        self.history: List[ActionRecord] = []
+        self.redo_stack: List[ActionRecord] = []
+        self._recording: Optional[ActionRecord] = None
+
+        # Effect resolution queue: (depth, event); depth -1 when nothing resolves
+        self._triggers: Deque[Tuple[int, TriggerEvent]] = deque()
+        self._trigger_depth = -1
         
         # Initialize Dungeon Masters (simplified for now)
         # Player 1 DM at (6, 0) - Bottom center
-        self.grid.set_owner(6, 0, 1)
-        self.grid.get_cell(6, 0).is_dungeon_master = True
+        self.grid.set_dungeon_master(6, 0, 1)
         
         # Player 2 DM at (6, 18) - Top center
-        self.grid.set_owner(6, 18, 2)
-        self.grid.get_cell(6, 18).is_dungeon_master = True
+        self.grid.set_dungeon_master(6, 18, 2)
 
+        # Zobrist hash of everything off the board (crests, turn); see state_hash()
+        self._zobrist = self._compute_zobrist()
+
+    def snapshot(self) -> EngineSnapshot:
+        """Captures the whole game position as nested tuples."""
+        return EngineSnapshot(
+            grid=self.grid.snapshot(),
+            players=tuple(
+                PlayerSnapshot(
+                    player_id=p.player_id,
+                    hp=p.hp,
+                    crests=tuple(p.crests.get(face, 0) for face in DIE_FACES),
+                    hand=tuple(p.hand),
+                    dice_pool=tuple(p.dice_pool),
+                )
+                for p in self.players.values()
+            ),
+            current_player_id=self.current_player_id,
+            turn_count=self.turn_count,
+            current_phase=self.current_phase,
+        )
+
+    def restore(self, snapshot: EngineSnapshot):
+        """Resets the game to a position captured with snapshot()."""
+        self.grid.restore(snapshot.grid)
+        self.players = {p.player_id: self._player_from_snapshot(p) for p in snapshot.players}
+        self.current_player_id = snapshot.current_player_id
+        self.turn_count = snapshot.turn_count
+        self.current_phase = snapshot.current_phase
+        self._zobrist = self._compute_zobrist()
+        self.history.clear()
+        self.redo_stack.clear()
+        self._triggers.clear()
+
+    def clone(self) -> "GameEngine":
+        """
+        Independent copy of the game for lookahead, without re-running __init__.
+        Cards are shared (read-only); board and player state are copied.
+        """
+        other = GameEngine.__new__(GameEngine)
+        other.rng = random.Random(0) # Cheaper than OS seeding; the state is overwritten
+        other.rng.setstate(self.rng.getstate()) # Same upcoming dice as this game
+        other.grid = self.grid.clone()
+        other.players = {
+            pid: PlayerState.model_construct(
+                player_id=p.player_id,
+                hp=p.hp,
+                crests=dict(p.crests),
+                hand=list(p.hand),
+                dice_pool=list(p.dice_pool),
+            )
+            for pid, p in self.players.items()
+        }
+        other.current_player_id = self.current_player_id
+        other.turn_count = self.turn_count
+        other.current_phase = self.current_phase
+        other._zobrist = self._zobrist
+        other.history = [] # Lookahead copies start with a fresh undo history
+        other.redo_stack = []
+        other._recording = None
+        other._triggers = deque()
+        other._trigger_depth = -1
+        return other
+
+    def state_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the position (board, crests, current player and phase).
+        Kept up to date incrementally, so this is O(1).
+        The turn counter and the cards in hand are not part of the position.
+        """
+        return self.grid.zobrist ^ self._zobrist
+
+    def compute_state_hash(self) -> int:
+        """state_hash() recomputed from scratch, to check the incremental one."""
+        return self.grid.compute_zobrist() ^ self._compute_zobrist()
+
+    def _compute_zobrist(self) -> int:
+        h = turn_key(self.current_player_id, self.current_phase)
+        for player in self.players.values():
+            for face, count in player.crests.items():
+                h ^= crest_key(player.player_id, face, count)
+        return h
+
+    @staticmethod
+    def _player_from_snapshot(p: PlayerSnapshot) -> PlayerState:
+        # model_construct skips pydantic validation: snapshot data is already valid
+        return PlayerState.model_construct(
+            player_id=p.player_id,
+            hp=p.hp,
+            crests=dict(zip(DIE_FACES, p.crests)),
+            hand=list(p.hand),
+            dice_pool=list(p.dice_pool),
+        )
+
+    # --- Undo / Redo ---
+
+    def _begin_action(self, label: str):
+        self._recording = ActionRecord(label)
+        self.grid.begin_journal()
+
+    def _end_action(self):
+        self.resolve_triggers() # Effects caused by the action belong to its record
+        record, self._recording = self._recording, None
+        record.cells = self.grid.end_journal()
+        if not record.is_empty():
+            self.history.append(record)
+            self.redo_stack.clear()
+
+    def _turn_state(self) -> TurnState:
+        return TurnState(self.current_player_id, self.turn_count, self.current_phase)
+
+    def _set_turn_state(self, state: TurnState):
+        before = self._turn_state()
+        self.current_player_id, self.turn_count, self.current_phase = state
+        self._zobrist ^= turn_key(before.current_player_id, before.current_phase) ^ turn_key(state.current_player_id, state.current_phase)
+
+    def _turn_changed(self, before: TurnState):
+        """Called after next_phase/end_turn: rehashes and records the turn change."""
+        after = self._turn_state()
+        self._zobrist ^= turn_key(before.current_player_id, before.current_phase) ^ turn_key(after.current_player_id, after.current_phase)
+        if self._recording is not None:
+            self._recording.changes.append((TURN, before, after))
+
+    def undo(self) -> Optional[ActionRecord]:
+        """Reverts the last action. Returns it, or None if there is nothing to undo."""
+        if not self.history:
+            return None
+        record = self.history.pop()
+        self._replay(record, forward=False)
+        self.redo_stack.append(record)
+        return record
+
+    def redo(self) -> Optional[ActionRecord]:
+        """Re-applies the last undone action."""
+        if not self.redo_stack:
+            return None
+        record = self.redo_stack.pop()
+        self._replay(record, forward=True)
+        self.history.append(record)
+        return record
+
+    def _replay(self, record: ActionRecord, forward: bool):
+        changes = record.changes if forward else reversed(record.changes)
+        for change in changes:
+            kind = change[0]
+            if kind == CREST:
+                _, player_id, face, delta = change
+                self._change_crest(self.players[player_id], face, delta if forward else -delta)
+            elif kind == TURN:
+                _, before, after = change
+                self._set_turn_state(after if forward else before)
+            elif kind == HAND:
+                _, player_id, position, monster = change
+                hand = self.players[player_id].hand
+                if forward:
+                    del hand[position]
+                else:
+                    hand.insert(position, monster)
+            elif kind == RNG:
+                _, before, after = change
+                self.rng.setstate(after if forward else before)
+        for index, before, after in record.cells:
+            self.grid.set_cell_state(index, after if forward else before)
+
+    @recorded("next_phase")
     def next_phase(self):
         """Cycles through phases: ROLL -> MAIN -> ATTACK -> ADJUST -> END"""
+        before = self._turn_state()
         if self.current_phase == Phase.ROLL:
             self.current_phase = Phase.MAIN
         elif self.current_phase == Phase.MAIN:
@@ -64,22 +274,31 @@ class GameEngine:
              # Let's say the phase *is* END, and in END phase, End Turn button works.
              self.current_phase = Phase.END
 
-        print(f"Phase Changed to: {self.current_phase.value}")
+        self._turn_changed(before)
+        if log.isEnabledFor(EVENT):
+            event(log, "phase", "Phase Changed to: %s", self.current_phase.value,
+                  player=self.current_player_id, phase=self.current_phase.value)
         return self.current_phase
 
+    @recorded("end_turn")
     def end_turn(self):
         """Ends the turn and passes to next player, resetting phase."""
+        before = self._turn_state()
         self.current_player_id = 2 if self.current_player_id == 1 else 1
         self.current_phase = Phase.ROLL # Reset to Roll
         if self.current_player_id == 1:
             self.turn_count += 1
-        print(f"Turn Ended. Now Player {self.current_player_id} - {self.current_phase.value}")
+        self._turn_changed(before)
+        if log.isEnabledFor(EVENT):
+            event(log, "turn", "Turn Ended. Now Player %s - %s", self.current_player_id, self.current_phase.value,
+                  player=self.current_player_id, turn=self.turn_count)
+        self.raise_trigger(ON_TURN_START, player_id=self.current_player_id)
 
     def add_crests(self, player_id: int, crests: Dict[DieFace, int]):
         player = self.players.get(player_id)
         if player:
             for face, amount in crests.items():
-                player.crests[face] += amount
+                self._change_crest(player, face, amount)
 
     def remove_crests(self, player_id: int, crests: Dict[DieFace, int]) -> bool:
         player = self.players.get(player_id)
@@ -93,17 +312,230 @@ class GameEngine:
                 
         # 2. Deduct
         for face, cost in crests.items():
-            player.crests[face] -= cost
+            self._change_crest(player, face, -cost)
             
         return True
 
+    def _change_crest(self, player: PlayerState, face: DieFace, delta: int):
+        """Single entry point for crest changes, so they can be undone."""
+        if not delta:
+            return
+        count = player.crests.get(face, 0)
+        player.crests[face] = count + delta
+        self._zobrist ^= crest_key(player.player_id, face, count) ^ crest_key(player.player_id, face, count + delta)
+        if self._recording is not None:
+            self._recording.changes.append((CREST, player.player_id, face, delta))
+
+    def replace_templates(self, replaced: Sequence[Tuple[Monster, Monster]]) -> List[Tuple[int, int]]:
+        """
+        Swaps card templates after a hot reload: cards in hand (and in the undo
+        history) and units on the board switch to the new version. Units keep
+        the damage they took, on the board and in the undo history. Returns
+        the board cells whose unit changed.
+        """
+        mapping = {id(old): new for old, new in replaced}
+        if not mapping:
+            return []
+        for player in self.players.values():
+            player.hand[:] = [mapping.get(id(card), card) for card in player.hand]
+        journaled = {} # id -> unit, for the units only the history still holds
+        for record in self.history + self.redo_stack:
+            record.changes = [
+                change[:3] + (mapping.get(id(change[3]), change[3]),) if change[0] == HAND else change
+                for change in record.changes
+            ]
+            record.cells = [(index, self._reload_state(before, mapping, journaled),
+                             self._reload_state(after, mapping, journaled))
+                            for index, before, after in record.cells]
+
+        cells = []
+        for x, y, unit in list(self.grid.units()):
+            new = mapping.get(id(unit.template)) if isinstance(unit, MonsterInstance) else None
+            if new is None:
+                continue
+            hp = _reloaded_hp(unit.hp, unit.template, new)
+            unit.template = new
+            self.grid.set_monster_hp(x, y, hp)
+            self.grid.relisten(x, y)
+            cells.append((x, y))
+        for unit in journaled.values():
+            unit.template = mapping.get(id(unit.template), unit.template)
+        return cells
+
+    @staticmethod
+    def _reload_state(state: CellState, mapping: Dict[int, Monster], journaled: Dict[int, MonsterInstance]) -> CellState:
+        unit = state.monster[1] if state.monster else None
+        if not isinstance(unit, MonsterInstance) or id(unit.template) not in mapping:
+            return state
+        journaled[id(unit)] = unit
+        return state._replace(monster_hp=_reloaded_hp(state.monster_hp, unit.template, mapping[id(unit.template)]))
+
+    # --- Commands ---
+
+    def apply(self, command: Command) -> CommandResult:
+        """Validates and plays one command (see src/core/commands.py)."""
+        error = command.check() or command.validate_for(self)
+        if error:
+            log.info("Rejected %s: %s", command.kind, error)
+            return CommandResult(False, error)
+        if log.isEnabledFor(EVENT):
+            event(log, "command", "%s", command.kind, **command.model_dump())
+        return command.execute(self)
+
+    def apply_many(self, commands: Iterable[Command], label: str = "commands") -> List[CommandResult]:
+        """
+        Plays commands in order as one undoable action, stopping at the first
+        one that fails; returns the results up to it. The checks that don't
+        depend on the game (Command.check) run first for the whole batch: if
+        one fails, nothing is played and the only result is that rejection.
+        The rest is validated per command, since each one sees the state the
+        previous ones left. Triggers resolve after every command. The log
+        gets one event for the whole batch.
+        """
+        commands = list(commands)
+        for number, command in enumerate(commands):
+            error = command.check()
+            if error:
+                log.info("Rejected batch: command %d (%s): %s", number, command.kind, error)
+                return [CommandResult(False, f"Command {number} ({command.kind}): {error}")]
+        results: List[CommandResult] = []
+        applied: List[Command] = []
+        batch = self._recording is None
+        if batch:
+            self._begin_action(label)
+        try:
+            for command in commands:
+                error = command.validate_for(self)
+                result = CommandResult(False, error) if error else command.execute(self)
+                results.append(result)
+                self.resolve_triggers()
+                if not result.ok:
+                    log.info("Rejected %s: %s", command.kind, result.message)
+                    break
+                applied.append(command)
+        finally:
+            if batch:
+                self._end_action()
+        if log.isEnabledFor(EVENT):
+            event(log, "commands", "Applied %d of %d commands", len(applied), len(results),
+                  commands=[c.model_dump() for c in applied])
+        return results
+
+    # --- Effects ---
+
+    def raise_trigger(self, trigger: str, unit: Optional[MonsterInstance] = None,
+                      player_id: Optional[int] = None, **details):
+        """
+        Queues a trigger for the effects listening to it: those of 'unit' if
+        given (every unit's for BOARD_TRIGGERS), else of every unit of
+        'player_id' (or of everyone). The queue resolves when the current
+        action ends, see resolve_triggers().
+        """
+        if self.grid.trigger_masks.get(trigger): # Nobody listens: nothing to queue
+            self._triggers.append((self._trigger_depth + 1, TriggerEvent(trigger, unit, player_id, **details)))
+
+    def fire(self, trigger: str, unit: Optional[MonsterInstance] = None, player_id: Optional[int] = None,
+             **details) -> TriggerEvent:
+        """
+        Resolves 'trigger' right away instead of queueing it, for triggers that
+        change the action in progress. Returns the event, which effects may have
+        changed (e.g. event.atk). Triggers they raise are queued as usual.
+        """
+        event = TriggerEvent(trigger, unit, player_id, **details)
+        self._resolve_event(self._trigger_depth + 1, event)
+        return event
+
+    def resolve_triggers(self):
+        """
+        Resolves queued triggers, including the ones their effects raise, in a
+        single pass: first in, first out, so the triggers of one step all
+        resolve before those they cause. Chains deeper than max_trigger_depth
+        are cut. Called at the end of every recorded action.
+        """
+        if self._trigger_depth >= 0:
+            return # Already resolving: the running loop picks them up
+        queue = self._triggers
+        cut = 0
+        while queue:
+            depth, event = queue.popleft()
+            if depth > self.max_trigger_depth:
+                cut += 1
+                continue
+            self._resolve_event(depth, event)
+        if cut:
+            log.warning("Trigger chain too deep: %d triggers past depth %d ignored", cut, self.max_trigger_depth)
+
+    def _resolve_event(self, depth: int, event: TriggerEvent):
+        """
+        Runs the listeners of one event. Order: the current player's units,
+        then the opponent's, each by board position, and each unit's effects
+        in card order. Only the listeners are visited (Grid.trigger_masks).
+        """
+        grid = self.grid
+        unit = event.unit
+        if unit is not None and event.trigger not in BOARD_TRIGGERS:
+            if unit.x < 0 or grid.get_cell(unit.x, unit.y).monster_ref is not unit:
+                return # Left the board since the trigger was raised
+            mask = 1 << bit_index(unit.x, unit.y)
+        elif event.player_id is not None:
+            mask = grid.monster_masks.get(event.player_id, 0)
+        else:
+            mask = grid.monsters_mask()
+        active = mask & grid.monster_masks.get(self.current_player_id, 0)
+        listeners = list(grid.listeners(event.trigger, active)) + list(grid.listeners(event.trigger, mask & ~active))
+
+        outer, self._trigger_depth = self._trigger_depth, depth
+        try:
+            for x, y, listener in listeners:
+                for spec in listener.template.effect_specs:
+                    program = spec.program
+                    # An earlier effect may have destroyed it
+                    if program.trigger != event.trigger or grid.get_cell(x, y).monster_ref is not listener:
+                        continue
+                    if program.run(self, listener, event) and self._recording is not None:
+                        self._recording.resolutions.append(
+                            Resolution(depth, event.trigger, spec.id, listener.owner_id, x, y))
+        finally:
+            self._trigger_depth = outer
+
+    def _destroy(self, x: int, y: int, by: Optional[MonsterInstance] = None):
+        unit = self.grid.get_cell(x, y).monster_ref
+        self.grid.remove_monster(x, y)
+        if isinstance(unit, MonsterInstance):
+            self.raise_trigger(ON_DESTROYED, unit, by=by)
+
+    @recorded("damage")
+    def damage_unit(self, x: int, y: int, amount: int) -> bool:
+        """Takes 'amount' HP off the unit on (x, y); destroys it at 0. Returns True if destroyed."""
+        unit = self.grid.get_cell(x, y).monster_ref
+        if not isinstance(unit, MonsterInstance) or amount <= 0:
+            return False
+        if unit.hp - amount <= 0:
+            if log.isEnabledFor(EVENT):
+                event(log, "destroyed", "%s (P%s) was destroyed by an effect!", unit.name, unit.owner_id,
+                      unit=unit.name, owner=unit.owner_id, x=x, y=y)
+            self._destroy(x, y)
+            return True
+        self.grid.set_monster_hp(x, y, unit.hp - amount)
+        self.raise_trigger(ON_DAMAGED, unit, damage=amount)
+        return False
+
+    @recorded("heal")
+    def heal_unit(self, x: int, y: int, amount: int):
+        """Restores up to 'amount' HP to the unit on (x, y), never above its max."""
+        unit = self.grid.get_cell(x, y).monster_ref
+        if isinstance(unit, MonsterInstance) and unit.hp < unit.max_hp:
+            self.grid.set_monster_hp(x, y, min(unit.max_hp, unit.hp + amount))
+
     def get_current_player(self) -> PlayerState:
         return self.players[self.current_player_id]
 
+    @recorded("roll")
     def roll_dice(self) -> Dict[DieFace, int]:
         """
         Simulate rolling 3 dice with real random logic.
         Each die has 6 faces (Uniform distribution).
+        Undoing the roll rewinds the dice too, so rolling again gives the same result.
         """
         results = {}
         
@@ -111,7 +543,9 @@ class GameEngine:
         faces = list(DieFace)
         
         # Roll 3 dice
-        rolls = random.choices(faces, k=3)
+        before = self.rng.getstate()
+        rolls = self.rng.choices(faces, k=3)
+        self._recording.changes.append((RNG, before, self.rng.getstate()))
         
         for roll in rolls:
             results[roll] = results.get(roll, 0) + 1
@@ -119,39 +553,67 @@ class GameEngine:
         self.add_crests(self.current_player_id, results)
         return results
     
+    @recorded("summon_cost")
     def deduct_summon_cost(self, cost=2):
         """Deduct summon crests from current player (default cost: 2)"""
         # Use centralized optional deduction
         if self.remove_crests(self.current_player_id, {DieFace.SUMMON: cost}):
-            player = self.get_current_player()
-            print(f"Deducted {cost} SUMMON crests. Remaining: {player.crests[DieFace.SUMMON]}")
+            log.info("Deducted %d SUMMON crests. Remaining: %d", cost, self.get_current_player().crests[DieFace.SUMMON])
             return True
             
-        print(f"Not enough SUMMON crests.")
+        log.info("Not enough SUMMON crests.")
         return False
 
 
+    @recorded("summon")
     def summon_monster(self, player_id: int, monster_id: str, x: int, y: int, monster_obj=None):
         """
-        Spawns a monster at x,y. For MVP testing.
+        Spawns a monster at x,y. A card ('monster_obj') becomes a new
+        MonsterInstance with its own HP; the card itself stays shared.
+        """
+        unit = MonsterInstance(monster_obj, player_id) if isinstance(monster_obj, Monster) else monster_obj
+        self.grid.place_monster(x, y, player_id, monster_id, unit)
+        if isinstance(unit, MonsterInstance):
+            self.raise_trigger(ON_SUMMON, unit)
+
+    @recorded("dimension")
+    def execute_dimension(self, pattern: Pattern, x: int, y: int, rotation: int = 0, flipped: bool = False,
+                          monster: Optional[Monster] = None, cost: int = 2) -> Tuple[bool, str]:
         """
-        cell = self.grid.get_cell(x, y)
-        if cell:
-            cell.monster_id = monster_id
-            cell.monster_owner_id = player_id
-            cell.monster_ref = monster_obj
+        Dimensions the dice for the current player: pays the SUMMON crests,
+        unfolds the pattern at (x, y) and summons 'monster' on the origin,
+        taking it out of the player's hand. Undoes as a single action.
+        """
+        player = self.get_current_player()
+        if not self.grid.validate_dimension(player.player_id, pattern, x, y, rotation, flipped):
+            return False, "Invalid placement"
+        if not self.deduct_summon_cost(cost):
+            return False, "Not enough Summon Crests"
 
+        self.grid.apply_dimension(player.player_id, pattern, x, y, rotation, flipped)
+        if monster is None:
+            return True, "Dimensioned"
+
+        self.summon_monster(player.player_id, monster.name, x, y, monster)
+        for position, card in enumerate(player.hand):
+            if card is monster:
+                del player.hand[position]
+                self._recording.changes.append((HAND, player.player_id, position, monster))
+                break
+        return True, f"Summoned {monster.name}"
+
+    @recorded("move")
     def execute_move(self, from_x: int, from_y: int, to_x: int, to_y: int) -> bool:
         player = self.get_current_player()
         
         move_power = player.crests.get(DieFace.MOVEMENT, 0)
-        valid_moves = self.grid.get_valid_moves(from_x, from_y, move_power, player.player_id)
+        search = self.grid.search_moves(from_x, from_y, move_power, player.player_id)
         
-        if (to_x, to_y) not in valid_moves:
+        if not search.can_stop_at(to_x, to_y):
             return False
             
-        # Re-calculate simple cost (Manhattan)
-        dist = abs(from_x - to_x) + abs(from_y - to_y)
+        # Charge the real walking distance (detours included), not Manhattan
+        dist = search.cost_to(to_x, to_y)
         
         if not self.remove_crests(player.player_id, {DieFace.MOVEMENT: dist}):
             return False
@@ -159,6 +621,7 @@ class GameEngine:
         self.grid.move_monster(from_x, from_y, to_x, to_y)
         return True
 
+    @recorded("attack")
     def execute_attack(self, attacker_x: int, attacker_y: int, target_x: int, target_y: int) -> tuple[bool, str]:
         attacker_cell = self.grid.get_cell(attacker_x, attacker_y)
         target_cell = self.grid.get_cell(target_x, target_y)
@@ -179,12 +642,14 @@ class GameEngine:
         if not self.remove_crests(attacker_player.player_id, {DieFace.ATTACK: 1}):
             return False, "Not enough Attack Crests"
 
-        # Stats
+        # Stats: per-unit state lives on the MonsterInstance, base stats on its card
         attacker = attacker_cell.monster_ref
         target = target_cell.monster_ref
         
-        atk_power = attacker.atk
-        def_power = target.defense
+        atk_power = attacker.template.atk
+        if isinstance(attacker, MonsterInstance):
+            atk_power = self.fire(ON_ATTACK, attacker, attacker=attacker, target=target, atk=atk_power).atk
+        def_power = target.template.defense
         hp_power = target.hp
         
         # Defense Policy: Auto-Spend if available
@@ -197,30 +662,38 @@ class GameEngine:
             defense_bonus = def_power
             spent_defense = True
             
-        # Calculation
-        resistance = hp_power + defense_bonus
-        impact = atk_power - resistance
+        # Calculation: damage that gets through the defense comes off the target's HP
+        damage = max(0, atk_power - defense_bonus)
+        remaining = hp_power - damage
         
         attacker_name = f"{attacker.name} (P{attacker_cell.monster_owner_id})"
         target_name = f"{target.name} (P{target_cell.monster_owner_id})"
         
-        print(f"BATTLE: {attacker_name} [ATK {atk_power}] vs {target_name} [HP {hp_power} + DEF {defense_bonus if spent_defense else 0}]")
-        print(f"Impact: {atk_power} - {resistance} = {impact}")
+        log.debug("BATTLE: %s [ATK %d] vs %s [HP %d + DEF %d]", attacker_name, atk_power, target_name, hp_power, defense_bonus)
+        if log.isEnabledFor(EVENT):
+            event(log, "attack", "Damage: %d - %d = %d, HP left: %d", atk_power, defense_bonus, damage, remaining,
+                  attacker=attacker.name, attacker_owner=attacker_cell.monster_owner_id, attacker_x=attacker_x,
+                  attacker_y=attacker_y, target=target.name, target_owner=target_cell.monster_owner_id,
+                  target_x=target_x, target_y=target_y, atk=atk_power, defense=defense_bonus,
+                  damage=damage, hp_left=max(0, remaining))
 
-        if impact >= 0:
+        if remaining <= 0:
             # Destroy Target
-            msg = f"{attacker_name} destroyed {target_name}! (Impact: {impact})"
-            target_cell.monster_id = None
-            target_cell.monster_owner_id = None
-            target_cell.monster_ref = None
-            
-            # Remove from defender hand if it was mostly tracking via grid, 
-            # but PlayerState.hand only tracked *unsummoned* cards mostly.
-            # If we tracked summoned monsters in a list, we'd remove it there too.
-            print(msg)
+            msg = f"{attacker_name} destroyed {target_name}! (Damage: {damage})"
+            self._destroy(target_x, target_y, by=attacker)
+            log.info("%s", msg)
             return True, msg
         else:
-            # Attack Failed
-            msg = f"{attacker_name} failed to damage {target_name}. (Impact: {impact})"
-            print(msg)
+            self.grid.set_monster_hp(target_x, target_y, remaining)
+            if damage:
+                msg = f"{attacker_name} hit {target_name} for {damage}. (HP left: {remaining})"
+            else:
+                # Attack Failed
+                msg = f"{attacker_name} failed to damage {target_name}."
+            log.info("%s", msg)
+            if isinstance(target, MonsterInstance):
+                if damage:
+                    self.raise_trigger(ON_DAMAGED, target, attacker=attacker, damage=damage)
+                if spent_defense:
+                    self.raise_trigger(ON_DEFENSE_SUCCESS, target, attacker=attacker, target=target, damage=damage)
             return True, msg
@@ -1,98 +1,541 @@
-from typing import List, Tuple, Optional
+from array import array
+from typing import Dict, List, NamedTuple, Tuple, Optional
 from src.core.constants import BOARD_WIDTH, BOARD_HEIGHT
 from src.core.dataclasses import Pattern
+from src.core.effects import unit_triggers
+from src.core.bitboard import CELL_COUNT, FULL_MASK, bit_index, iter_bits, neighbor_mask, shift_mask
+from src.core.patterns_registry import Orientation, get_orientations
+from src.core.placement_index import PlacementIndex
+from src.core.units import MonsterInstance
+from src.core.zobrist import dungeon_master_key, monster_key, owner_key
+
+MOVE_CACHE_LIMIT = 512 # Cached move searches kept before the cache is reset
+
+NO_MONSTER = -1 # monster_slots value of an empty cell
+
+class GridState(NamedTuple):
+    """Immutable board snapshot, see Grid.snapshot()."""
+    owner_masks: Tuple[Tuple[int, int], ...]
+    monster_masks: Tuple[Tuple[int, int], ...]
+    dungeon_master_mask: int
+    monster_slots: bytes
+    monster_table: Tuple[Tuple[str, object], ...] # Live units only, in board order
+    zobrist: int
+
+
+class CellState(NamedTuple):
+    """Everything stored for one cell, used to journal and revert changes."""
+    owner_id: Optional[int]
+    is_dungeon_master: bool
+    monster_owner_id: Optional[int]
+    monster: Optional[Tuple[str, object]] # (monster_id, monster_ref) table entry, None if empty
+    monster_hp: Optional[int] # Current HP of a MonsterInstance, else None
+
 
 class Cell:
-    def __init__(self, x: int, y: int):
+    """
+    Read-only view of a single board square.
+    The actual state lives in the Grid bitboards and arrays; the UI reads it through here.
+    """
+    __slots__ = ("x", "y", "_grid", "_index", "_bit")
+
+    def __init__(self, grid: "Grid", x: int, y: int):
         self.x = x
         self.y = y
-        self.owner_id: Optional[int] = None
-        self.monster_id: Optional[str] = None # ID of the monster occupying this cell
-        self.monster_ref = None # Reference to Monster object
-        self.monster_owner_id: Optional[int] = None # Player ID who owns the monster
-        self.is_dungeon_master: bool = False
+        self._grid = grid
+        self._index = bit_index(x, y)
+        self._bit = 1 << self._index
+
+    @property
+    def owner_id(self) -> Optional[int]:
+        return self._grid._player_at(self._grid.owner_masks, self._bit)
+
+    @property
+    def monster_id(self) -> Optional[str]:
+        slot = self._grid.monster_slots[self._index]
+        return self._grid.monster_table[slot][0] if slot != NO_MONSTER else None
+
+    @property
+    def monster_ref(self):
+        slot = self._grid.monster_slots[self._index]
+        return self._grid.monster_table[slot][1] if slot != NO_MONSTER else None
+
+    @property
+    def monster_owner_id(self) -> Optional[int]:
+        return self._grid._player_at(self._grid.monster_masks, self._bit)
+
+    @property
+    def is_dungeon_master(self) -> bool:
+        return bool(self._grid.dungeon_master_mask & self._bit)
+
+
+class MoveSearch:
+    """
+    Result of one movement search.
+    layers[k] is the bitboard of cells first reached after exactly k steps,
+    which is the distance field; parent pointers are derived from it on demand.
+    """
+    def __init__(self, start: Tuple[int, int], layers: List[int], destinations: List[Tuple[int, int]], region: int):
+        self.start = start
+        self.layers = layers
+        self.destinations = destinations
+        self.region = region # Cells whose ownership/occupancy the result depends on
+        self._destination_set = set(destinations)
+        self._parents: Optional[Dict[Tuple[int, int], Tuple[int, int]]] = None
+
+    def can_stop_at(self, x: int, y: int) -> bool:
+        return (x, y) in self._destination_set
+
+    def distance(self, x: int, y: int) -> Optional[int]:
+        """Steps from the start to (x, y), or None if it was not reached."""
+        if not (0 <= x < BOARD_WIDTH and 0 <= y < BOARD_HEIGHT):
+            return None
+        bit = 1 << bit_index(x, y)
+        for steps, layer in enumerate(self.layers):
+            if layer & bit:
+                return steps
+        return None
+
+    def distances(self) -> Dict[Tuple[int, int], int]:
+        """Distance field over every reached cell."""
+        field = {}
+        for steps, layer in enumerate(self.layers):
+            for index in iter_bits(layer):
+                field[divmod(index, BOARD_HEIGHT)] = steps
+        return field
+
+    def parents(self) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """Parent pointer of every reached cell (one step closer to the start)."""
+        if self._parents is None:
+            self._parents = {}
+            for steps in range(1, len(self.layers)):
+                previous = self.layers[steps - 1]
+                for index in iter_bits(self.layers[steps]):
+                    x, y = divmod(index, BOARD_HEIGHT)
+                    for px, py in ((x-1, y), (x+1, y), (x, y-1), (x, y+1)):
+                        if 0 <= px < BOARD_WIDTH and 0 <= py < BOARD_HEIGHT and previous & (1 << bit_index(px, py)):
+                            self._parents[(x, y)] = (px, py)
+                            break
+        return self._parents
+
+    def path_to(self, x: int, y: int) -> Optional[List[Tuple[int, int]]]:
+        """Shortest path from the start to (x, y), both included."""
+        if (x, y) == self.start:
+            return [self.start]
+        parents = self.parents()
+        if (x, y) not in parents:
+            return None
+        path = [(x, y)]
+        while path[-1] != self.start:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def cost_to(self, x: int, y: int) -> Optional[int]:
+        """MOVEMENT crests needed to walk to (x, y) along the shortest path."""
+        return self.distance(x, y)
+
 
 class Grid:
     def __init__(self):
         self.width = BOARD_WIDTH
         self.height = BOARD_HEIGHT
-        self.cells: List[List[Cell]] = [
-            [Cell(x, y) for y in range(self.height)]
-            for x in range(self.width)
-        ]
+
+        # Bitboards
+        self.owner_masks: Dict[int, int] = {}    # player_id -> dungeon cells owned
+        self.monster_masks: Dict[int, int] = {}  # player_id -> cells holding their monsters
+        self.dungeon_mask = 0                    # Union of all owner masks
+        self.dungeon_master_mask = 0
+
+        # Monster identity: flat per-cell array (index x*height+y) of slots
+        # into a table of (monster_id, monster_ref) entries. Slots freed when a
+        # monster leaves the board are reused, so the table stays as small as
+        # the most units ever on the board at once.
+        self.monster_slots = array('i', [NO_MONSTER]) * CELL_COUNT
+        self.monster_table: List[Optional[Tuple[str, object]]] = []
+        self._free_slots: List[int] = []
+
+        # Legal summon placements, updated from the cells set_owner touches
+        self.placement_index = PlacementIndex(self)
+        # (start_x, start_y, player_id, max_steps) -> MoveSearch
+        self._move_cache: Dict[Tuple[int, int, int, int], MoveSearch] = {}
+        # bit index -> state before the current journaled action (None when not journaling)
+        self._journal: Optional[Dict[int, CellState]] = None
+        # Zobrist hash of the board, updated by every mutation below
+        self.zobrist = 0
+        # Effect dispatch table: trigger -> cells whose unit has an effect on it
+        self.trigger_masks: Dict[str, int] = {}
+
+    @staticmethod
+    def _player_at(masks: Dict[int, int], bit: int) -> Optional[int]:
+        for player_id, mask in masks.items():
+            if mask & bit:
+                return player_id
+        return None
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
 
     def get_cell(self, x: int, y: int) -> Optional[Cell]:
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.cells[x][y]
+            return Cell(self, x, y)
         return None
 
-    def set_owner(self, x: int, y: int, player_id: int):
-        cell = self.get_cell(x, y)
-        if cell:
-            cell.owner_id = player_id
+    def clone(self) -> "Grid":
+        """
+        Independent copy of the board: the bitboards are ints and the monster
+        slots a single buffer copy. Monster entries are shared, not duplicated.
+        """
+        other = Grid.__new__(Grid)
+        other.width = self.width
+        other.height = self.height
+        other.owner_masks = dict(self.owner_masks)
+        other.monster_masks = dict(self.monster_masks)
+        other.dungeon_mask = self.dungeon_mask
+        other.dungeon_master_mask = self.dungeon_master_mask
+        other.monster_slots = array('i', self.monster_slots)
+        other.monster_table = self._copy_table(self.monster_table)
+        other._free_slots = list(self._free_slots)
+        other.placement_index = self.placement_index.copy_for(other)
+        other._move_cache = dict(self._move_cache) # MoveSearch results are immutable
+        other._journal = None
+        other.zobrist = self.zobrist
+        other.trigger_masks = dict(self.trigger_masks)
+        return other
 
-    def rotate_pattern(self, pattern: Pattern, rotations: int = 0) -> List[Tuple[int, int]]:
+    def snapshot(self) -> "GridState":
         """
-        Rotates the pattern 90 degrees clockwise 'rotations' times.
+        Immutable copy of the board state. Slots are renumbered in board order,
+        so equal positions give equal snapshots whatever their history.
         """
-        coords = pattern.shape
-        for _ in range(rotations % 4):
-            # Rotate 90 degrees clockwise: (x, y) -> (y, -x)
-            coords = [(y, -x) for x, y in coords]
-        return coords
+        slots = array('i', [NO_MONSTER]) * CELL_COUNT
+        table = []
+        for index in iter_bits(self.monsters_mask()):
+            slots[index] = len(table)
+            table.append(self.monster_table[self.monster_slots[index]])
+        return GridState(
+            owner_masks=tuple(sorted((pid, mask) for pid, mask in self.owner_masks.items() if mask)),
+            monster_masks=tuple(sorted((pid, mask) for pid, mask in self.monster_masks.items() if mask)),
+            dungeon_master_mask=self.dungeon_master_mask,
+            monster_slots=slots.tobytes(),
+            monster_table=tuple(self._copy_table(table)),
+            zobrist=self.zobrist,
+        )
+
+    def restore(self, state: "GridState"):
+        """Resets the board to a snapshot taken with snapshot()."""
+        self.owner_masks = dict(state.owner_masks)
+        self.monster_masks = dict(state.monster_masks)
+        self.dungeon_mask = 0
+        for mask in self.owner_masks.values():
+            self.dungeon_mask |= mask
+        self.dungeon_master_mask = state.dungeon_master_mask
+        self.monster_slots = array('i')
+        self.monster_slots.frombytes(state.monster_slots)
+        self.monster_table = self._copy_table(state.monster_table)
+        self._free_slots = []
+        self.placement_index.reset()
+        self._move_cache.clear()
+        self.zobrist = state.zobrist
+        self.trigger_masks = {}
+        for index in iter_bits(self.monsters_mask()):
+            self._listen(index)
+
+    def compute_zobrist(self) -> int:
+        """Board hash computed from scratch (self.zobrist is the incremental one)."""
+        h = 0
+        for pid, mask in self.owner_masks.items():
+            for index in iter_bits(mask):
+                h ^= owner_key(pid, index)
+        for pid, mask in self.monster_masks.items():
+            for index in iter_bits(mask):
+                h ^= self._unit_key(pid, index)
+        for index in iter_bits(self.dungeon_master_mask):
+            h ^= dungeon_master_key(index)
+        return h
+
+    # --- Journal (used by the engine for undo/redo) ---
+
+    def cell_state(self, index: int) -> CellState:
+        bit = 1 << index
+        slot = self.monster_slots[index]
+        entry = self.monster_table[slot] if slot != NO_MONSTER else None
+        return CellState(
+            owner_id=self._player_at(self.owner_masks, bit),
+            is_dungeon_master=bool(self.dungeon_master_mask & bit),
+            monster_owner_id=self._player_at(self.monster_masks, bit),
+            monster=entry,
+            monster_hp=entry[1].hp if entry and isinstance(entry[1], MonsterInstance) else None,
+        )
+
+    def set_cell_state(self, index: int, state: CellState):
+        """Writes back a state returned by cell_state()."""
+        bit = 1 << index
+        self._claim(bit, state.owner_id)
+        if state.is_dungeon_master != bool(self.dungeon_master_mask & bit):
+            self.dungeon_master_mask ^= bit
+            self.zobrist ^= dungeon_master_key(index)
+        slot = self.monster_slots[index]
+        if state.monster is None or (slot != NO_MONSTER and self.monster_table[slot] is not state.monster):
+            self.remove_monster(*divmod(index, self.height))
+        if state.monster is not None:
+            self._put_entry(index, state.monster_owner_id, state.monster)
+            if state.monster_hp is not None:
+                self.set_monster_hp(*divmod(index, self.height), state.monster_hp)
+
+    def begin_journal(self):
+        """Starts recording the prior state of every cell that gets modified."""
+        self._journal = {}
+
+    def end_journal(self) -> List[Tuple[int, CellState, CellState]]:
+        """Stops recording; returns (index, before, after) for each changed cell."""
+        journal, self._journal = self._journal or {}, None
+        changes = []
+        for index, before in journal.items():
+            after = self.cell_state(index)
+            if after != before:
+                changes.append((index, before, after))
+        return changes
+
+    def _record(self, mask: int):
+        journal = self._journal
+        if journal is not None:
+            for index in iter_bits(mask):
+                if index not in journal:
+                    journal[index] = self.cell_state(index)
+
+    def set_owner(self, x: int, y: int, player_id: Optional[int]):
+        """Sets (or clears, with None) the dungeon owner of a cell."""
+        if not self.in_bounds(x, y):
+            return
+        self._claim(1 << bit_index(x, y), player_id)
+
+    def _claim(self, mask: int, player_id: Optional[int]):
+        """Sets the dungeon owner of every cell in 'mask'."""
+        self._record(mask)
+        for pid, owned in self.owner_masks.items():
+            for index in iter_bits(owned & mask):
+                self.zobrist ^= owner_key(pid, index)
+            self.owner_masks[pid] = owned & ~mask
+        if player_id is None:
+            self.dungeon_mask &= ~mask
+        else:
+            for index in iter_bits(mask):
+                self.zobrist ^= owner_key(player_id, index)
+            self.owner_masks[player_id] = self.owner_masks.get(player_id, 0) | mask
+            self.dungeon_mask |= mask
+        self.placement_index.mark_dirty(mask)
+        self._invalidate_moves(mask)
 
-    def validate_dimension(self, 
-                         player_id: int, 
-                         pattern: Pattern, 
-                         origin_x: int, 
+    def set_dungeon_master(self, x: int, y: int, player_id: int):
+        """Claims the cell for player_id and marks it as their Dungeon Master."""
+        if not self.in_bounds(x, y):
+            return
+        self.set_owner(x, y, player_id)
+        index = bit_index(x, y)
+        self._record(1 << index)
+        if not self.dungeon_master_mask & (1 << index):
+            self.dungeon_master_mask |= 1 << index
+            self.zobrist ^= dungeon_master_key(index)
+
+    def place_monster(self, x: int, y: int, player_id: int, monster_id: str, monster_ref=None):
+        if not self.in_bounds(x, y):
+            return
+        self.remove_monster(x, y)
+        self._put_entry(bit_index(x, y), player_id, (monster_id, monster_ref))
+
+    def _put_entry(self, index: int, player_id: int, entry: Tuple[str, object]):
+        """Puts a table entry on the cell, in its current slot or a free one."""
+        self._record(1 << index)
+        self._clear_monster_bit(index)
+        slot = self.monster_slots[index]
+        if slot == NO_MONSTER:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = len(self.monster_table)
+                self.monster_table.append(None)
+            self.monster_slots[index] = slot
+        self.monster_table[slot] = entry
+        self.monster_masks[player_id] = self.monster_masks.get(player_id, 0) | (1 << index)
+        ref = entry[1]
+        if isinstance(ref, MonsterInstance):
+            ref.owner_id = player_id
+            ref.x, ref.y = divmod(index, self.height)
+        self.zobrist ^= self._unit_key(player_id, index)
+        self._listen(index)
+        self._invalidate_moves(1 << index)
+
+    def remove_monster(self, x: int, y: int):
+        if not self.in_bounds(x, y):
+            return
+        index = bit_index(x, y)
+        bit = 1 << index
+        self._record(bit)
+        self._clear_monster_bit(index)
+        slot = self.monster_slots[index]
+        if slot != NO_MONSTER:
+            self.monster_table[slot] = None
+            self._free_slots.append(slot)
+            self.monster_slots[index] = NO_MONSTER
+        self._invalidate_moves(bit)
+
+    def _clear_monster_bit(self, index: int):
+        """Takes the monster on the cell off the masks (and the hash); its slot is left as is."""
+        bit = 1 << index
+        for pid, mask in self.monster_masks.items():
+            if mask & bit:
+                self.monster_masks[pid] = mask & ~bit
+                self.zobrist ^= self._unit_key(pid, index)
+                for trigger, cells in self.trigger_masks.items():
+                    self.trigger_masks[trigger] = cells & ~bit
+
+    def _listen(self, index: int):
+        """Subscribes the unit on the cell to the triggers of its effects."""
+        ref = self.monster_table[self.monster_slots[index]][1]
+        if isinstance(ref, MonsterInstance):
+            for trigger in unit_triggers(ref):
+                self.trigger_masks[trigger] = self.trigger_masks.get(trigger, 0) | (1 << index)
+
+    def relisten(self, x: int, y: int):
+        """Re-reads the triggers of the unit on (x, y), e.g. after its template changed."""
+        index = bit_index(x, y)
+        bit = 1 << index
+        for trigger, cells in self.trigger_masks.items():
+            self.trigger_masks[trigger] = cells & ~bit
+        if self.monsters_mask() & bit:
+            self._listen(index)
+
+    def listeners(self, trigger: str, mask: int = FULL_MASK):
+        """(x, y, unit) for every unit in 'mask' with an effect on 'trigger'."""
+        for index in iter_bits(self.trigger_masks.get(trigger, 0) & mask):
+            x, y = divmod(index, self.height)
+            yield x, y, self.monster_table[self.monster_slots[index]][1]
+
+    def units(self):
+        """(x, y, monster_ref) for every occupied cell."""
+        for index in iter_bits(self.monsters_mask()):
+            x, y = divmod(index, self.height)
+            yield x, y, self.monster_table[self.monster_slots[index]][1]
+
+    def _unit_key(self, player_id: int, index: int) -> int:
+        monster_id, ref = self.monster_table[self.monster_slots[index]]
+        hp = ref.hp if isinstance(ref, MonsterInstance) else None
+        return monster_key(player_id, monster_id, index, hp)
+
+    def set_monster_hp(self, x: int, y: int, hp: int):
+        """Sets the current HP of the MonsterInstance on (x, y)."""
+        index = bit_index(x, y)
+        slot = self.monster_slots[index]
+        ref = self.monster_table[slot][1] if slot != NO_MONSTER else None
+        if not isinstance(ref, MonsterInstance):
+            return
+        self._record(1 << index)
+        player_id = ref.owner_id
+        self.zobrist ^= self._unit_key(player_id, index)
+        ref.hp = hp
+        self.zobrist ^= self._unit_key(player_id, index)
+
+    @staticmethod
+    def _copy_table(table) -> List[Tuple[str, object]]:
+        # Instances are mutable (HP), so each board gets its own; templates stay shared
+        return [(entry[0], entry[1].copy()) if entry and isinstance(entry[1], MonsterInstance) else entry
+                for entry in table]
+
+    def monsters_mask(self) -> int:
+        """Union of every player's monster occupancy."""
+        mask = 0
+        for m in self.monster_masks.values():
+            mask |= m
+        return mask
+
+    def rotate_pattern(self, pattern: Pattern, rotations: int = 0, flipped: bool = False) -> List[Tuple[int, int]]:
+        """
+        Rotates the pattern 90 degrees clockwise 'rotations' times,
+        after mirroring it when 'flipped'.
+        """
+        return list(get_orientations(pattern).get(rotations, flipped).offsets)
+
+    def validate_dimension(self,
+                         player_id: int,
+                         pattern: Pattern,
+                         origin_x: int,
                          origin_y: int,
-                         rotations: int = 0) -> bool:
+                         rotations: int = 0,
+                         flipped: bool = False) -> bool:
         """
         Validates if a pattern can be placed at the given origin.
         """
-        rotated_shape = self.rotate_pattern(pattern, rotations)
-        
-        # Calculate absolute coordinates
-        abs_coords = []
-        for dx, dy in rotated_shape:
-            abs_x = origin_x + dx
-            abs_y = origin_y + dy
-            abs_coords.append((abs_x, abs_y))
+        orientation = get_orientations(pattern).get(rotations, flipped)
 
         # 1. Check Boundaries & Collisions
-        for x, y in abs_coords:
-            cell = self.get_cell(x, y)
-            if not cell:
-                return False # Out of bounds
-            if cell.owner_id is not None:
-                return False # Already occupied
+        mask = orientation.mask_at(origin_x, origin_y)
+        if mask is None:
+            return False # Out of bounds
+        if mask & self.dungeon_mask:
+            return False # Already occupied
 
         # 2. Check Adjacency (Must touch own territory)
-        # For the very first turn, special rules might apply (touching DM), 
+        # For the very first turn, special rules might apply (touching DM),
         # but generally it must touch a cell owned by player_id.
-        has_adjacency = False
-        for x, y in abs_coords:
-            neighbors = [
-                (x+1, y), (x-1, y), (x, y+1), (x, y-1)
-            ]
-            for nx, ny in neighbors:
-                n_cell = self.get_cell(nx, ny)
-                if n_cell and n_cell.owner_id == player_id:
-                    has_adjacency = True
-                    break
-            if has_adjacency:
-                break
-        
-        return has_adjacency
+        return bool(neighbor_mask(mask) & self.owner_masks.get(player_id, 0))
 
-    def apply_dimension(self, player_id: int, pattern: Pattern, origin_x: int, origin_y: int, rotations: int = 0):
+    def placement_masks(self, player_id: int, pattern: Pattern, flipped: bool = False) -> List[int]:
+        """
+        Bitboards of every legal origin for the pattern, one per rotation.
+        Whole-board equivalent of calling validate_dimension on each cell:
+        - fits:    every pattern cell lands on a free, in-bounds square.
+        - touches: at least one pattern cell is adjacent to own territory.
+        Symmetric rotations share one Orientation and are only computed once.
+        """
+        free = FULL_MASK & ~self.dungeon_mask
+        frontier = neighbor_mask(self.owner_masks.get(player_id, 0)) & free
+        table = get_orientations(pattern)
+
+        computed: Dict[int, int] = {}
+        masks = []
+        for rotation in range(4):
+            orientation = table.get(rotation, flipped)
+            legal = computed.get(id(orientation))
+            if legal is None:
+                legal = self.orientation_origins(orientation, free, frontier)
+                computed[id(orientation)] = legal
+            masks.append(legal)
+        return masks
+
+    @staticmethod
+    def orientation_origins(orientation: Orientation, free: int, frontier: int) -> int:
+        """Legal origins of one orientation given the free cells and the player's frontier."""
+        fits = FULL_MASK
+        touches = 0
+        for dx, dy in orientation.offsets:
+            fits &= shift_mask(free, -dx, -dy)
+            touches |= shift_mask(frontier, -dx, -dy)
+        return fits & touches
+
+    def placement_map(self, player_id: int, pattern: Pattern, flipped: bool = False) -> List[List[List[bool]]]:
+        """
+        Legal placements as nested booleans indexed [rotation][x][y], i.e. shape
+        (4, width, height). Convenience for display and tests: hot paths should
+        test bits of placement_masks() instead.
+        """
+        result = []
+        for mask in self.placement_masks(player_id, pattern, flipped):
+            rows = [[False] * self.height for _ in range(self.width)]
+            for index in iter_bits(mask):
+                x, y = divmod(index, self.height)
+                rows[x][y] = True
+            result.append(rows)
+        return result
+
+    def apply_dimension(self, player_id: int, pattern: Pattern, origin_x: int, origin_y: int, rotations: int = 0, flipped: bool = False):
         """
         Applies the pattern to the grid, setting ownership.
         Assumes validation has already passed.
         """
-        rotated_shape = self.rotate_pattern(pattern, rotations)
-        for dx, dy in rotated_shape:
-            self.set_owner(origin_x + dx, origin_y + dy, player_id)
+        mask = get_orientations(pattern).get(rotations, flipped).mask_at(origin_x, origin_y)
+        if mask is not None:
+            self._claim(mask, player_id)
 
     def is_walkable(self, x: int, y: int, player_id: int) -> bool:
         """
@@ -102,66 +545,81 @@ class Grid:
            NOTE: In DDM, you can walk on enemy terrain.
         3. It is NOT occupied by an ENEMY monster.
         """
-        cell = self.get_cell(x, y)
-        if not cell:
+        if not (0 <= x < self.width and 0 <= y < self.height):
             return False
-        if cell.owner_id is None:
+        bit = 1 << (x * self.height + y)
+        if not self.dungeon_mask & bit:
             return False # Not part of dungeon
-        
-        # Check occupancy
-        if cell.monster_id:
-             # TODO: Need to know if monster is friendly or enemy. 
-             # For Grid level, we might just store owner_id of the monster or need a way to look it up.
-             # For now, let's assume we can pass if it's NOT an enemy.
-             # We need to pass the monster logic or store owner in cell.
-             # Let's add 'monster_owner_id' to Cell for easier checking.
-             if cell.monster_owner_id != player_id:
-                 return False # Enemy blocks
-        
-        return True
+
+        # Enemy monsters block, friendly ones can be passed through
+        enemies = self.monsters_mask() & ~self.monster_masks.get(player_id, 0)
+        return not enemies & bit
 
     def get_valid_moves(self, start_x: int, start_y: int, max_steps: int, player_id: int) -> List[Tuple[int, int]]:
         """
         Returns all reachable (x, y) coordinates within max_steps.
-        BFS implementation.
         """
+        return list(self.search_moves(start_x, start_y, max_steps, player_id).destinations)
+
+    def search_moves(self, start_x: int, start_y: int, max_steps: int, player_id: int) -> "MoveSearch":
+        """
+        Movement search from a start cell, with distances and shortest paths.
+        Results are cached per (start, player, max_steps) until a cell inside
+        the explored region changes ownership or occupancy.
+        """
+        key = (start_x, start_y, player_id, max_steps)
+        search = self._move_cache.get(key)
+        if search is None:
+            if len(self._move_cache) >= MOVE_CACHE_LIMIT:
+                self._move_cache.clear()
+            search = self._search_moves(start_x, start_y, max_steps, player_id)
+            self._move_cache[key] = search
+        return search
+
+    def _search_moves(self, start_x: int, start_y: int, max_steps: int, player_id: int) -> "MoveSearch":
+        """
+        Breadth-first search with a bitboard frontier: each step expands the
+        whole frontier at once with neighbor_mask.
+        """
+        if not self.in_bounds(start_x, start_y):
+            return MoveSearch((start_x, start_y), [], [], 0)
+
+        occupied = self.monsters_mask()
+        enemies = occupied & ~self.monster_masks.get(player_id, 0)
+        walkable = self.dungeon_mask & ~enemies # Enemy monsters block, friends can be passed
+
         valid_destinations = []
-        queue = [(start_x, start_y, 0)] # (x, y, dist)
-        visited = set([(start_x, start_y)])
-        
-        while queue:
-            cx, cy, dist = queue.pop(0)
-            
-            # If we have moves left, explore neighbors
-            if dist < max_steps:
-                neighbors = [
-                    (cx+1, cy), (cx-1, cy), (cx, cy+1), (cx, cy-1)
-                ]
-                for nx, ny in neighbors:
-                    if (nx, ny) in visited:
-                        continue
-                    
-                    if self.is_walkable(nx, ny, player_id):
-                        visited.add((nx, ny))
-                        queue.append((nx, ny, dist + 1))
-                        
-                        # Can we STOP here?
-                        # Cannot stop on ANY monster (friend or foe)
-                        n_cell = self.get_cell(nx, ny)
-                        if n_cell and n_cell.monster_id is None:
-                            valid_destinations.append((nx, ny))
-                            
-        return valid_destinations
-    
+        visited = frontier = 1 << bit_index(start_x, start_y)
+        layers = [frontier]
+        for _ in range(max_steps):
+            frontier = neighbor_mask(frontier) & walkable & ~visited
+            if not frontier:
+                break
+            visited |= frontier
+            layers.append(frontier)
+
+            # Cannot STOP on ANY monster (friend or foe)
+            for index in iter_bits(frontier & ~occupied):
+                valid_destinations.append(divmod(index, self.height))
+
+        return MoveSearch((start_x, start_y), layers, valid_destinations, visited | neighbor_mask(visited))
+
+    def _invalidate_moves(self, mask: int):
+        """Drops cached move searches whose explored region overlaps 'mask'."""
+        if not self._move_cache:
+            return
+        stale = [key for key, search in self._move_cache.items() if search.region & mask]
+        for key in stale:
+            del self._move_cache[key]
+
     def move_monster(self, from_x: int, from_y: int, to_x: int, to_y: int):
-        source = self.get_cell(from_x, from_y)
-        dest = self.get_cell(to_x, to_y)
-        
-        if source and dest:
-            dest.monster_id = source.monster_id
-            dest.monster_owner_id = source.monster_owner_id
-            dest.monster_ref = source.monster_ref
-            
-            source.monster_id = None
-            source.monster_owner_id = None
-            source.monster_ref = None
+        if not (self.in_bounds(from_x, from_y) and self.in_bounds(to_x, to_y)):
+            return
+        source = bit_index(from_x, from_y)
+        slot = self.monster_slots[source]
+        entry = self.monster_table[slot] if slot != NO_MONSTER else None
+        owner_id = self._player_at(self.monster_masks, 1 << source)
+        self.remove_monster(from_x, from_y)
+        self.remove_monster(to_x, to_y)
+        if entry is not None:
+            self._put_entry(bit_index(to_x, to_y), owner_id, entry)
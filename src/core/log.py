@@ -0,0 +1,119 @@
+"""
+Game logging, on top of the standard logging module.
+
+Each subsystem logs to its own logger ("ddm.engine", "ddm.ui.board", ...):
+
+    log = get_logger("engine")
+    log.info("Phase changed to %s", phase.value) # Formatted only if emitted
+    if log.isEnabledFor(EVENT):
+        event(log, "attack", "%s hit %s", a, b, damage=...) # Structured game event
+
+Nothing below WARNING is emitted until configure() is called (the UI and the
+CLIs do), so a headless engine only pays a cached level check per call.
+Levels are set per subsystem, and game events can go to a JSON lines file
+written from a background thread:
+
+    configure({"engine": "DEBUG", "ui": "WARNING"}, events_path="game.jsonl")
+    configure(parse_levels("engine=INFO,ui.board=DEBUG"))
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Dict, Optional, Union
+
+ROOT = "ddm"
+EVENT = logging.INFO # Level of structured game events
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Logger of a subsystem, e.g. "engine" or "ui.board" (levels apply to sub-loggers too)."""
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+def event(logger: logging.Logger, name: str, message: str, *args, **fields):
+    """
+    Logs a structured game event: the message on the console, the message and
+    fields in the events file. Fields should be plain values (the file is
+    written later, from another thread). Check logger.isEnabledFor(EVENT)
+    before building them in hot code.
+    """
+    logger.log(EVENT, message, *args, extra={"event": name, "fields": fields})
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: time, subsystem, level, event, message and event fields."""
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": round(record.created, 6),
+            "subsystem": record.name[len(ROOT) + 1:] if record.name.startswith(ROOT + ".") else record.name,
+            "level": record.levelname,
+        }
+        name = getattr(record, "event", None)
+        if name is not None:
+            data["event"] = name
+            data["message"] = record.getMessage()
+            data.update(record.fields)
+        else:
+            data["message"] = record.getMessage()
+        return json.dumps(data, default=str)
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """'engine=DEBUG,ui=WARNING' (or a bare level for everything) -> {subsystem: level}."""
+    levels = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        subsystem, sep, level = part.rpartition("=")
+        levels[subsystem if sep else ""] = level.upper()
+    return levels
+
+
+def configure(levels: Optional[Dict[str, Union[str, int]]] = None, console: bool = True,
+              events_path: Optional[str] = None, default_level: Union[str, int] = "INFO"):
+    """
+    Sets up the game's logging (again, if it was already configured).
+    'levels': {subsystem: level}; "" is every subsystem (default_level if missing).
+    'console': human-readable lines on stdout.
+    'events_path': append records as JSON lines to this file, off the calling thread.
+    """
+    shutdown()
+    root = logging.getLogger(ROOT)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.propagate = False
+    for name, logger in logging.root.manager.loggerDict.items():
+        if name.startswith(ROOT + ".") and isinstance(logger, logging.Logger):
+            logger.setLevel(logging.NOTSET) # Levels from an earlier configure()
+    levels = dict(levels or {})
+    root.setLevel(levels.pop("", default_level))
+    for subsystem, level in levels.items():
+        get_logger(subsystem).setLevel(level)
+
+    if console:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        root.addHandler(handler)
+    if events_path:
+        global _listener
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        sink = logging.FileHandler(events_path, mode="a", encoding="utf-8", delay=True)
+        sink.setFormatter(JsonLinesFormatter())
+        _listener = logging.handlers.QueueListener(records, sink)
+        _listener.start()
+        root.addHandler(logging.handlers.QueueHandler(records))
+
+
+def shutdown():
+    """Flushes and closes the events file (also done at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(shutdown)
@@ -1,32 +1,280 @@
+import hashlib
 import json
 import os
-from src.core.dataclasses import Monster, Pattern
-from src.core.patterns_registry import PATTERNS
+import pickle
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from src.core.dataclasses import DieFace, DieFaceSpec, EffectSpec, Monster, intern_template
+from src.core.patterns_registry import PATTERNS, DEFAULT_PATTERN_ID, resolve_pattern_id
+from src.core.log import get_logger
+
+log = get_logger("loader")
+
+# Card directory of the game, independent of the working directory
+MONSTER_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data", "monsters",
+)
+
+# Compiled cards, one cache file per card directory in the user's cache
+# directory (DDM_CACHE_DIR overrides it). Bump the version whenever
+# parse_monster or the Monster model changes, so old caches are rebuilt.
+CARD_CACHE_VERSION = 3
+
+def card_cache_dir() -> str:
+    if os.environ.get("DDM_CACHE_DIR"):
+        return os.environ["DDM_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ddm")
+
+def card_cache_path(directory_path) -> str:
+    """Cache file of a card directory (outside it, so the data stays clean)."""
+    digest = hashlib.sha1(os.path.abspath(directory_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(card_cache_dir(), f"cards-{digest}.pkl")
+
+HEADER_BATCH = 256 # Files per thread-pool task in load_lazy
+
+# Shared card database: absolute directory -> cards, parsed once per process
+_CARD_POOLS: Dict[str, Tuple[Monster, ...]] = {}
+
+class CardHeader(NamedTuple):
+    """The few fields needed to list or filter a card without building it."""
+    id: str
+    name: str
+    level: int
+    type: str
+    path: str
+
+
+class LazyCardPool(Mapping):
+    """
+    Read-only mapping of card id -> Monster over a card directory.
+    Headers are known up front; each Monster is parsed on first access and
+    then kept, so a match only pays for the cards it actually uses.
+    """
+    def __init__(self, directory_path: str, headers: List[CardHeader]):
+        self.directory_path = directory_path
+        self.headers: Dict[str, CardHeader] = {}
+        for header in headers: # Filename order, like load_monsters
+            if header.id in self.headers:
+                log.warning("Duplicate card id %s in %s, ignored", header.id, os.path.basename(header.path))
+                continue
+            self.headers[header.id] = header
+        self._monsters: Dict[str, Monster] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, card_id: str) -> Monster:
+        monster = self._monsters.get(card_id)
+        if monster is None:
+            header = self.headers[card_id]
+            with self._lock:
+                monster = self._monsters.get(card_id)
+                if monster is None:
+                    monster = MonsterLoader._load_file(header.path, os.path.basename(header.path), self.directory_path)
+                    if monster is None:
+                        raise KeyError(card_id)
+                    self._monsters[card_id] = monster
+        return monster
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.headers)
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+    def __contains__(self, card_id) -> bool:
+        return card_id in self.headers
+
+    def loaded_count(self) -> int:
+        """How many cards have been materialized so far."""
+        return len(self._monsters)
+
 
 class MonsterLoader:
     @staticmethod
-    def load_monsters(directory_path):
-        """Loads all .json monster files from the given directory."""
-        monsters = []
-        
-        # Ensure directory exists
+    def load_card_pool(directory_path=MONSTER_DIR) -> Tuple[Monster, ...]:
+        """
+        Read-only card pool for GameEngine, loaded on first use and then
+        shared by every engine in the process.
+        """
+        key = os.path.abspath(directory_path)
+        pool = _CARD_POOLS.get(key)
+        if pool is None:
+            pool = tuple(MonsterLoader.load_monsters(key))
+            _CARD_POOLS[key] = pool
+        return pool
+
+    @staticmethod
+    def replace_card_pool(directory_path, cards):
+        """Swaps in a new shared pool for the directory (used by hot reload)."""
+        _CARD_POOLS[os.path.abspath(directory_path)] = tuple(cards)
+
+    @staticmethod
+    def watch(directory_path=MONSTER_DIR):
+        """CardWatcher polling the directory for edited cards, see src/core/card_watcher.py."""
+        from src.core.card_watcher import CardWatcher
+        return CardWatcher(directory_path)
+
+    @staticmethod
+    def clear_card_pools():
+        """Forgets the shared pools, e.g. after the card files changed."""
+        _CARD_POOLS.clear()
+
+    @staticmethod
+    def load_monsters(directory_path, use_cache=True):
+        """
+        Loads all .json monster files from the given directory, in filename order.
+        Cards are read from the compiled cache; only files whose mtime or size
+        changed since the cache was written are parsed (and the cache updated).
+        """
+        return [monster for _, monster in MonsterLoader.load_entries(directory_path, use_cache).values() if monster]
+
+    @staticmethod
+    def load_entries(directory_path, use_cache=True) -> Dict[str, Tuple[Tuple[int, int], Optional[Monster]]]:
+        """
+        {filename: ((mtime_ns, size), Monster or None if it failed to load)},
+        in filename order. Failures are cached too: a broken file is parsed
+        again only once it changes.
+        """
         if not os.path.exists(directory_path):
-            print(f"Warning: Monster directory {directory_path} does not exist.")
-            return monsters
+            log.warning("Monster directory %s does not exist.", directory_path)
+            return {}
+
+        cached = MonsterLoader._read_cache(directory_path) if use_cache else {}
+        entries = {}
+        changed = False
+        with os.scandir(directory_path) as scan:
+            files = sorted((e for e in scan if e.name.endswith(".json") and e.is_file()), key=lambda e: e.name)
+        for entry in files:
+            stat = entry.stat()
+            key = (stat.st_mtime_ns, stat.st_size)
+            hit = cached.get(entry.name)
+            if hit and hit[0] == key:
+                monster = intern_template(hit[1]) if hit[1] else None
+                if monster is None:
+                    log.warning("Skipping %s: it failed to load and has not changed since", entry.name)
+            else:
+                monster = MonsterLoader._load_file(entry.path, entry.name, directory_path)
+                changed = True
+            entries[entry.name] = (key, monster)
+
+        if use_cache and (changed or entries.keys() != cached.keys()):
+            MonsterLoader._write_cache(directory_path, entries)
+        return entries
+
+    @staticmethod
+    def stream_pack(pack_path, use_mmap=False) -> Iterator[Monster]:
+        """Yields the cards of a card pack one at a time (constant memory)."""
+        from src.core.card_pack import CardPack
+        with CardPack(pack_path, use_mmap) as pack:
+            yield from pack.iter_cards()
+
+    @staticmethod
+    def open_pack(pack_path, use_mmap=False):
+        """Opens a card pack for random access by card id: open_pack(path).get(card_id)."""
+        from src.core.card_pack import CardPack
+        return CardPack(pack_path, use_mmap)
 
-        for filename in os.listdir(directory_path):
+    @staticmethod
+    def load_lazy(directory_path, workers=None) -> LazyCardPool:
+        """
+        Lazy alternative to load_monsters: reads only the card headers, in a
+        thread pool, and builds each Monster when it is first looked up.
+        Lookups return the same objects load_monsters would.
+        """
+        if not os.path.exists(directory_path):
+            log.warning("Monster directory %s does not exist.", directory_path)
+            return LazyCardPool(directory_path, [])
+
+        with os.scandir(directory_path) as scan:
+            paths = sorted(e.path for e in scan if e.name.endswith(".json") and e.is_file())
+        # Batches keep the per-task overhead of the pool small next to a file read
+        batches = [paths[i:i + HEADER_BATCH] for i in range(0, len(paths), HEADER_BATCH)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            headers = [h for batch in pool.map(MonsterLoader._read_headers, batches) for h in batch if h]
+        return LazyCardPool(directory_path, headers)
+
+    @staticmethod
+    def _read_headers(paths) -> List[Optional[CardHeader]]:
+        return [MonsterLoader._read_header(path) for path in paths]
+
+    @staticmethod
+    def _read_header(file_path) -> Optional[CardHeader]:
+        filename = os.path.basename(file_path)
+        try:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            log.error("Error loading monster from %s: %s", filename, e)
+            return None
+        return CardHeader(
+            id=data.get("id", os.path.splitext(filename)[0]), # Same default as _load_file
+            name=data.get("name", "Unknown"),
+            level=data.get("level", 1),
+            type=data.get("type", "Normal"),
+            path=file_path,
+        )
+
+    @staticmethod
+    def _load_file(file_path, filename, directory_path) -> Optional[Monster]:
+        try:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+            data.setdefault("id", os.path.splitext(filename)[0])
+            return MonsterLoader.parse_monster(data, directory_path)
+        except Exception as e:
+            log.error("Error loading monster from %s: %s", filename, e)
+            return None
+
+    @staticmethod
+    def _read_cache(directory_path) -> Dict[str, Tuple[Tuple[int, int], Monster]]:
+        """{filename: ((mtime_ns, size), Monster or None)} from the compiled cache, or {} if unusable."""
+        try:
+            with open(card_cache_path(directory_path), 'rb') as f:
+                cache = pickle.load(f)
+            if cache.get("version") == CARD_CACHE_VERSION:
+                return cache["entries"]
+        except Exception:
+            pass # Missing, stale or corrupt: rebuild from the JSON files
+        return {}
+
+    @staticmethod
+    def _write_cache(directory_path, entries):
+        path = card_cache_path(directory_path)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so a concurrent reader never sees half a cache
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({"version": CARD_CACHE_VERSION, "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass # No writable cache directory: keep parsing the JSON files
+
+    @staticmethod
+    def pattern_name(data):
+        """Pattern reference of a card JSON (top level or metadata), or None."""
+        pattern_name = data.get("pattern")
+        if not pattern_name and "metadata" in data:
+             pattern_name = data["metadata"].get("pattern")
+        return pattern_name
+
+    @staticmethod
+    def validate_patterns(directory_path):
+        """
+        Checks that every monster JSON references a real cube net.
+        Returns {filename: pattern name} for the ones that do not.
+        """
+        invalid = {}
+        for filename in sorted(os.listdir(directory_path)):
             if filename.endswith(".json"):
-                file_path = os.path.join(directory_path, filename)
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                        monster = MonsterLoader.parse_monster(data, directory_path)
-                        if monster:
-                            monsters.append(monster)
-                except Exception as e:
-                    print(f"Error loading monster from {filename}: {e}")
-        
-        return monsters
+                with open(os.path.join(directory_path, filename), 'r') as f:
+                    pattern_name = MonsterLoader.pattern_name(json.load(f))
+                if pattern_name and not resolve_pattern_id(pattern_name):
+                    invalid[filename] = pattern_name
+        return invalid
 
     @staticmethod
     def parse_monster(data, base_path=""):
@@ -34,18 +282,13 @@ class MonsterLoader:
         
         # 1. Pattern Logic
         # New format might lack 'pattern' or have it in metadata/mechanics. 
-        # Fallback to RECT_2X3 if missing.
-        pattern_name = data.get("pattern")
-        if not pattern_name and "metadata" in data:
-             pattern_name = data["metadata"].get("pattern")
-        
-        # Default to RECT_2X3
-        if not pattern_name:
-             pattern_name = "RECT_2X3"
-             
-        pattern = PATTERNS.get(pattern_name)
-        if not pattern:
-            pattern = Pattern(shape=[(0,0), (0,1), (0,2), (1,0), (1,1), (1,2)])
+        # Every pattern must be a real cube net; fall back to the default net otherwise.
+        pattern_name = MonsterLoader.pattern_name(data)
+        pattern_id = resolve_pattern_id(pattern_name) if pattern_name else DEFAULT_PATTERN_ID
+        if not pattern_id:
+            log.warning("Unknown pattern '%s' for %s, using %s", pattern_name, data.get('name', 'Unknown'), DEFAULT_PATTERN_ID)
+            pattern_id = DEFAULT_PATTERN_ID
+        pattern = PATTERNS[pattern_id]
             
         # 2. Stats (Handle New vs Old)
         hp = data.get("hp", 10)
@@ -84,22 +327,32 @@ class MonsterLoader:
              texture_path = f"../assets/cards/{data['texture']}"
 
         # 4. Mechanics / Effects
-        effects = data.get("effects", [])
+        # Old format: list of effect IDs. New format: objects with id/trigger/params.
+        raw_effects = data.get("effects", [])
         if "mechanics" in data and "effects" in data["mechanics"]:
-            # New format effects might be objects, not strings.
-            # Monster dataclass expects List[str] currently?
-            # Let's check dataclass... Yes, List[str].
-            # If new format has objects, we need to extract IDs or update Dataclass.
-            # For now, extract "id" if it's a dict.
             raw_effects = data["mechanics"]["effects"]
-            effects = []
-            for eff in raw_effects:
-                if isinstance(eff, dict):
-                    effects.append(eff.get("id", "UNKNOWN"))
-                else:
-                    effects.append(eff)
-
-        return Monster(
+        effect_specs = []
+        for eff in raw_effects:
+            if isinstance(eff, dict):
+                effect_specs.append(EffectSpec(
+                    id=eff.get("id", "UNKNOWN"),
+                    trigger=eff.get("trigger"),
+                    params=eff.get("params", {}),
+                ))
+            else:
+                effect_specs.append(EffectSpec(id=eff))
+        effects = [spec.id for spec in effect_specs]
+
+        # 5. Die faces
+        die_faces = []
+        for face in data.get("die_configuration", {}).get("faces", []):
+            if face.get("symbol") in DieFace.__members__:
+                die_faces.append(DieFaceSpec(symbol=face["symbol"], multiplier=face.get("multiplier", 1)))
+            else:
+                log.warning("Unknown die face '%s' for %s, ignored", face.get('symbol'), data.get('name', 'Unknown'))
+
+        return intern_template(Monster(
+            id=data.get("id"),
             name=data.get("name", "Unknown"),
             level=data.get("level", 1),
             hp=hp,
@@ -110,5 +363,9 @@ class MonsterLoader:
             texture_path=texture_path,
             miniature_path=miniature_path,
             pattern=pattern,
-            effects=effects
-        )
+            pattern_id=pattern_id,
+            effects=effects,
+            effect_specs=effect_specs,
+            attribute=data.get("attribute"),
+            die_faces=die_faces
+        ))
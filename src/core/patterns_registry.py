@@ -1,14 +1,118 @@
+from typing import Dict, NamedTuple, Optional, Tuple
+from src.core.constants import BOARD_WIDTH, BOARD_HEIGHT
 from src.core.dataclasses import Pattern
+from src.core.cube_nets import compile_orientations, load_cube_nets
 
-# Standard DDM Unfold Patterns (6 cells)
-# Coordinates are relative to a center point (usually the monster location)
-
-PATTERNS = {
-    "CROSS": Pattern(shape=[(0,0), (0,1), (0,-1), (1,0), (-1,0), (0,2)]),
-    "T_SHAPE": Pattern(shape=[(0,0), (0,1), (0,-1), (1,0), (-1,0), (0, -2)]),
-    "L_SHAPE": Pattern(shape=[(0,0), (0,1), (0,2), (0,-1), (1,-1), (2,-1)]),
-    "LINE": Pattern(shape=[(0,0), (0,1), (0,2), (0,-1), (0,-2), (0,3)]),
-    "Z_SHAPE": Pattern(shape=[(0,0), (1,0), (1,1), (0,-1), (-1,-1), (-1,-2)]),
-    "H_SHAPE": Pattern(shape=[(0,0), (0,1), (0,-1), (1,1), (1,-1), (-1,0)]),
-    # Add more as needed, these are just examples of 6-connected shapes
+# Standard DDM Unfold Patterns: the 11 nets of a cube (6 cells each).
+# Coordinates are relative to the monster location (0, 0).
+# Generated by src/core/cube_nets.py and loaded from its disk cache.
+
+_LIBRARY = load_cube_nets()
+
+PATTERNS: Dict[str, Pattern] = {
+    net["id"]: Pattern(shape=[tuple(c) for c in net["shape"]]) for net in _LIBRARY["nets"]
+}
+
+# Older pattern names that are real nets, e.g. "CROSS" -> "NET_10"
+PATTERN_ALIASES: Dict[str, str] = dict(_LIBRARY["aliases"])
+
+DEFAULT_PATTERN_ID = PATTERN_ALIASES["CROSS"]
+
+def resolve_pattern_id(name: Optional[str]) -> Optional[str]:
+    """Net ID for a pattern ID or alias, or None if it is not a known net."""
+    if name in PATTERNS:
+        return name
+    return PATTERN_ALIASES.get(name)
+
+def get_pattern(name: Optional[str]) -> Optional[Pattern]:
+    pattern_id = resolve_pattern_id(name)
+    return PATTERNS[pattern_id] if pattern_id else None
+
+def card_pattern_id(card) -> Optional[str]:
+    """Net ID a card unfolds with: its pattern_id, else the net with its shape."""
+    pattern_id = resolve_pattern_id(card.pattern_id)
+    if pattern_id is None:
+        pattern_id = next((pid for pid, pattern in PATTERNS.items() if pattern == card.pattern), None)
+    return pattern_id
+
+# --- Orientation Table ---
+
+class Orientation(NamedTuple):
+    """
+    One fixed placement of a pattern: 'rotation' clockwise quarter turns,
+    applied after mirroring on the y axis when 'flipped'.
+    'mask' is the footprint as a bitboard anchored at (min_dx, min_dy).
+    """
+    rotation: int
+    flipped: bool
+    offsets: Tuple[Tuple[int, int], ...]
+    min_dx: int
+    min_dy: int
+    max_dx: int
+    max_dy: int
+    mask: int
+
+    def mask_at(self, origin_x: int, origin_y: int) -> Optional[int]:
+        """Footprint bitboard at the origin, or None if it leaves the board."""
+        if (origin_x + self.min_dx < 0 or origin_x + self.max_dx >= BOARD_WIDTH
+                or origin_y + self.min_dy < 0 or origin_y + self.max_dy >= BOARD_HEIGHT):
+            return None
+        return self.mask << ((origin_x + self.min_dx) * BOARD_HEIGHT + origin_y + self.min_dy)
+
+
+class PatternOrientations:
+    """
+    The up to 8 orientations of a pattern (4 rotations x mirror),
+    with symmetric duplicates collapsed onto a single Orientation.
+    Built from the output of cube_nets.compile_orientations.
+    """
+    def __init__(self, compiled: dict):
+        self.unique: Tuple[Orientation, ...] = tuple(
+            _build_orientation(entry["rotation"], entry["flipped"], entry["offsets"], entry["mask"])
+            for entry in compiled["unique"]
+        )
+        # Index: rotation + 4 * flipped
+        self._by_code: Tuple[Orientation, ...] = tuple(self.unique[i] for i in compiled["keys"])
+
+    def get(self, rotation: int = 0, flipped: bool = False) -> Orientation:
+        return self._by_code[rotation % 4 + (4 if flipped else 0)]
+
+
+def _build_orientation(rotation: int, flipped: bool, offsets, mask: int) -> Orientation:
+    coords = tuple((dx, dy) for dx, dy in offsets)
+    return Orientation(
+        rotation=rotation,
+        flipped=flipped,
+        offsets=coords,
+        min_dx=min(x for x, _ in coords),
+        min_dy=min(y for _, y in coords),
+        max_dx=max(x for x, _ in coords),
+        max_dy=max(y for _, y in coords),
+        mask=mask,
+    )
+
+
+_ORIENTATION_CACHE: Dict[Tuple[Tuple[int, int], ...], PatternOrientations] = {}
+# id(pattern) -> table for the registry patterns, which live as long as the
+# module: the lookup on the placement hot path builds no key
+_REGISTRY_TABLES: Dict[int, PatternOrientations] = {}
+
+def get_orientations(pattern: Pattern) -> PatternOrientations:
+    """Orientation table of a pattern. Registry patterns come precompiled from the net cache."""
+    table = _REGISTRY_TABLES.get(id(pattern))
+    if table is not None:
+        return table
+    key = tuple(pattern.shape)
+    table = _ORIENTATION_CACHE.get(key)
+    if table is None:
+        table = PatternOrientations(compile_orientations(key))
+        _ORIENTATION_CACHE[key] = table
+    return table
+
+for _net in _LIBRARY["nets"]:
+    _pattern = PATTERNS[_net["id"]]
+    _ORIENTATION_CACHE[tuple(_pattern.shape)] = _REGISTRY_TABLES[id(_pattern)] = PatternOrientations(_net["orientations"])
+
+ORIENTATIONS: Dict[str, PatternOrientations] = {
+    name: get_orientations(pattern) for name, pattern in PATTERNS.items()
 }
@@ -0,0 +1,124 @@
+from typing import Dict, List, Optional, Set, Tuple
+from src.core.bitboard import FULL_MASK, iter_bits, neighbor_mask, shift_mask
+from src.core.constants import BOARD_HEIGHT
+from src.core.dataclasses import Pattern
+from src.core.patterns_registry import PATTERNS, Orientation, get_orientations
+
+# (pattern name, rotation, flipped, (origin_x, origin_y))
+Placement = Tuple[str, int, bool, Tuple[int, int]]
+
+
+class PlacementIndex:
+    """
+    Legal dimension placements per player, kept up to date incrementally.
+
+    For every distinct orientation of each pattern (symmetric duplicates are
+    listed once) the index stores a bitboard of legal origins.
+    The grid reports each cell whose ownership changes via mark_dirty(); on the
+    next query only origins whose footprint covers or touches a dirty cell are
+    re-validated, instead of rescanning the whole board.
+    """
+    def __init__(self, grid, patterns: Optional[Dict[str, Pattern]] = None):
+        self.grid = grid
+        self.patterns = patterns if patterns is not None else PATTERNS
+
+        # (name, rotation, flipped) -> orientation, one entry per distinct footprint
+        self._orientations: Dict[Tuple[str, int, bool], Orientation] = {}
+        for name, pattern in self.patterns.items():
+            for orientation in get_orientations(pattern).unique:
+                self._orientations[(name, orientation.rotation, orientation.flipped)] = orientation
+
+        self._origins: Dict[int, Dict[Tuple[str, int, bool], int]] = {}  # player_id -> key -> origins mask
+        self._dirty = 0
+
+    def copy_for(self, grid) -> "PlacementIndex":
+        """Copy of this index attached to a cloned grid."""
+        other = PlacementIndex.__new__(PlacementIndex)
+        other.grid = grid
+        other.patterns = self.patterns
+        other._orientations = self._orientations
+        other._origins = {player_id: dict(origins) for player_id, origins in self._origins.items()}
+        other._dirty = self._dirty
+        return other
+
+    def reset(self):
+        """Forgets every player's placements; they are rebuilt on the next query."""
+        self._origins = {}
+        self._dirty = 0
+
+    def mark_dirty(self, mask: int):
+        """Called by the grid when the ownership of the cells in 'mask' changes."""
+        self._dirty |= mask
+
+    def origins(self, player_id: int, pattern_name: str, rotation: int = 0, flipped: bool = False) -> int:
+        """Bitboard of legal origins for one pattern orientation."""
+        orientation = get_orientations(self.patterns[pattern_name]).get(rotation, flipped)
+        return self._player_origins(player_id)[(pattern_name, orientation.rotation, orientation.flipped)]
+
+    def legal_placements(self, player_id: int) -> Set[Placement]:
+        """Every legal (pattern name, rotation, flipped, origin) for the player."""
+        placements = set()
+        for (name, rotation, flipped), mask in self._player_origins(player_id).items():
+            for index in iter_bits(mask):
+                placements.add((name, rotation, flipped, divmod(index, BOARD_HEIGHT)))
+        return placements
+
+    def count(self, player_id: int) -> int:
+        return sum(bin(mask).count("1") for mask in self._player_origins(player_id).values())
+
+    def check_consistency(self, player_id: int) -> List[Placement]:
+        """
+        Compares the index with brute-force validate_dimension over the whole board.
+        Returns the placements where they disagree (empty when consistent).
+        """
+        indexed = self.legal_placements(player_id)
+        mismatches = []
+        for name, rotation, flipped in self._orientations:
+            pattern = self.patterns[name]
+            for x in range(self.grid.width):
+                for y in range(self.grid.height):
+                    expected = self.grid.validate_dimension(player_id, pattern, x, y, rotation, flipped)
+                    if expected != ((name, rotation, flipped, (x, y)) in indexed):
+                        mismatches.append((name, rotation, flipped, (x, y)))
+        return mismatches
+
+    def _player_origins(self, player_id: int) -> Dict[Tuple[str, int, bool], int]:
+        if self._dirty:
+            self._refresh()
+        origins = self._origins.get(player_id)
+        if origins is None:
+            grid = self.grid
+            free = FULL_MASK & ~grid.dungeon_mask
+            frontier = neighbor_mask(grid.owner_masks.get(player_id, 0)) & free
+            origins = {
+                key: grid.orientation_origins(orientation, free, frontier)
+                for key, orientation in self._orientations.items()
+            }
+            self._origins[player_id] = origins
+        return origins
+
+    def _refresh(self):
+        # A placement can only change if one of its cells changed (collision)
+        # or one of its cells is next to a changed cell (adjacency).
+        region = self._dirty | neighbor_mask(self._dirty)
+        self._dirty = 0
+
+        for player_id, origins in self._origins.items():
+            for key, orientation in self._orientations.items():
+                candidates = 0
+                for dx, dy in orientation.offsets:
+                    candidates |= shift_mask(region, -dx, -dy)
+
+                mask = origins[key] & ~candidates
+                for index in iter_bits(candidates):
+                    if self._is_legal(player_id, orientation, index):
+                        mask |= 1 << index
+                origins[key] = mask
+
+    def _is_legal(self, player_id: int, orientation: Orientation, origin_index: int) -> bool:
+        grid = self.grid
+        origin_x, origin_y = divmod(origin_index, BOARD_HEIGHT)
+        footprint = orientation.mask_at(origin_x, origin_y)
+        if footprint is None or footprint & grid.dungeon_mask:
+            return False
+        return bool(neighbor_mask(footprint) & grid.owner_masks.get(player_id, 0))
@@ -0,0 +1,278 @@
+"""
+Headless self-play: plays complete GameEngine games without Ursina.
+
+    python -m src.core.simulate --games 1000 --p1 random --p2 greedy
+
+Games are spread over a process pool (one engine per game, nothing shared),
+each seeded from --seed and its game number, so any game can be replayed on
+its own. Prints games/sec, turns/sec and the time spent in each phase.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from src.core.bitboard import iter_bits
+from src.core.constants import BOARD_HEIGHT, Phase
+from src.core.dataclasses import DieFace
+from src.core.commands import Attack, EndTurn, Move, NextPhase, Roll, Summon
+from src.core.engine import GameEngine
+from src.core.log import configure, parse_levels
+from src.core.patterns_registry import resolve_pattern_id
+
+DEFAULT_MAX_TURNS = 100 # Player turns; the engine has no win condition yet
+
+# A policy plays one phase for the current player: policy(engine, phase, rng)
+Policy = Callable[[GameEngine, Phase, random.Random], None]
+
+
+# --- Policies ---
+
+def _own_monsters(engine: GameEngine, player_id: int) -> List[Tuple[int, int]]:
+    return [divmod(index, BOARD_HEIGHT) for index in iter_bits(engine.grid.monster_masks.get(player_id, 0))]
+
+
+def _placements(engine: GameEngine, pattern_id: str) -> List[Tuple[int, bool, int, int]]:
+    """(rotation, flipped, x, y) for every legal placement of the pattern."""
+    player_id = engine.current_player_id
+    index = engine.grid.placement_index
+    placements = []
+    for flipped in (False, True):
+        for rotation in range(4):
+            for bit in iter_bits(index.origins(player_id, pattern_id, rotation, flipped)):
+                placements.append((rotation, flipped) + divmod(bit, BOARD_HEIGHT))
+    return placements
+
+
+def _try_summon(engine: GameEngine, rng: random.Random, choose) -> bool:
+    player = engine.get_current_player()
+    if not player.hand or player.crests.get(DieFace.SUMMON, 0) < 2:
+        return False
+    hand_index = rng.randrange(len(player.hand))
+    pattern_id = resolve_pattern_id(player.hand[hand_index].pattern_id)
+    placements = _placements(engine, pattern_id) if pattern_id else []
+    if not placements:
+        return False
+    rotation, flipped, x, y = choose(placements)
+    return engine.apply(Summon(pattern=pattern_id, x=x, y=y, rotation=rotation, flipped=flipped,
+                               hand_index=hand_index)).ok
+
+
+def _attack_all(engine: GameEngine):
+    """Every monster of the current player attacks an adjacent enemy while crests last."""
+    player_id = engine.current_player_id
+    for x, y in _own_monsters(engine, player_id):
+        for tx, ty in ((x+1, y), (x-1, y), (x, y+1), (x, y-1)):
+            if engine.get_current_player().crests.get(DieFace.ATTACK, 0) < 1:
+                return
+            cell = engine.grid.get_cell(tx, ty)
+            if cell and cell.monster_id and cell.monster_owner_id != player_id:
+                engine.apply(Attack(from_x=x, from_y=y, to_x=tx, to_y=ty))
+                break
+
+
+def pass_policy(engine: GameEngine, phase: Phase, rng: random.Random):
+    """Rolls and ends the turn without playing."""
+
+
+def random_policy(engine: GameEngine, phase: Phase, rng: random.Random):
+    """Uniformly random legal summons and moves; attacks whenever it can."""
+    if phase == Phase.MAIN:
+        _try_summon(engine, rng, rng.choice)
+        player_id = engine.current_player_id
+        for x, y in _own_monsters(engine, player_id):
+            steps = engine.get_current_player().crests.get(DieFace.MOVEMENT, 0)
+            destinations = engine.grid.search_moves(x, y, steps, player_id).destinations
+            if destinations:
+                to_x, to_y = rng.choice(destinations)
+                engine.apply(Move(from_x=x, from_y=y, to_x=to_x, to_y=to_y))
+    elif phase == Phase.ATTACK:
+        _attack_all(engine)
+
+
+def greedy_policy(engine: GameEngine, phase: Phase, rng: random.Random):
+    """Summons and walks as far towards the enemy Dungeon Master as possible."""
+    player_id = engine.current_player_id
+    # Player 1 starts at the bottom (y = 0), player 2 at the top
+    forward = (lambda p: p[-1]) if player_id == 1 else (lambda p: -p[-1])
+    if phase == Phase.MAIN:
+        _try_summon(engine, rng, lambda placements: max(placements, key=forward))
+        for x, y in _own_monsters(engine, player_id):
+            steps = engine.get_current_player().crests.get(DieFace.MOVEMENT, 0)
+            destinations = engine.grid.search_moves(x, y, steps, player_id).destinations
+            if destinations:
+                target = max(destinations, key=forward)
+                if forward(target) > forward((x, y)):
+                    engine.apply(Move(from_x=x, from_y=y, to_x=target[0], to_y=target[1]))
+    elif phase == Phase.ATTACK:
+        _attack_all(engine)
+
+
+POLICIES: Dict[str, Policy] = {
+    "pass": pass_policy,
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+# --- Games ---
+
+class GameResult(NamedTuple):
+    game: int
+    seed: int
+    winner: Optional[int] # None: turn cap reached
+    turns: int            # Player turns played
+    actions: int          # Undoable engine actions taken
+    phase_seconds: Dict[str, float]
+    seconds: float
+    final_hash: int
+
+
+def game_seed(base_seed: int, game: int) -> int:
+    return base_seed * 1_000_003 + game
+
+
+def _winner(engine: GameEngine) -> Optional[int]:
+    for player_id, player in engine.players.items():
+        if player.hp <= 0:
+            return 2 if player_id == 1 else 1
+    return None
+
+
+def play_game(game: int, seed: int, policies: Sequence[str] = ("random", "random"),
+              max_turns: int = DEFAULT_MAX_TURNS) -> GameResult:
+    """
+    Plays one complete game. 'policies' are POLICIES names for players 1 and 2.
+    The engine logs nothing below WARNING unless src.core.log is configured.
+    """
+    players = {1: POLICIES[policies[0]], 2: POLICIES[policies[1]]}
+    rng = random.Random(f"policy-{seed}")
+    phase_seconds = {phase.value: 0.0 for phase in Phase}
+    started = time.perf_counter()
+
+    engine = GameEngine(rng=random.Random(seed))
+    turns = 0
+    winner = None
+    while turns < max_turns and winner is None:
+        policy = players[engine.current_player_id]
+        while True:
+            phase = engine.current_phase
+            phase_start = time.perf_counter()
+            if phase == Phase.ROLL:
+                engine.apply(Roll())
+            policy(engine, phase, rng)
+            engine.apply(EndTurn() if phase == Phase.END else NextPhase())
+            phase_seconds[phase.value] += time.perf_counter() - phase_start
+            winner = _winner(engine)
+            if phase == Phase.END or winner is not None:
+                break
+        turns += 1
+
+    return GameResult(
+        game=game,
+        seed=seed,
+        winner=winner,
+        turns=turns,
+        actions=len(engine.history),
+        phase_seconds=phase_seconds,
+        seconds=time.perf_counter() - started,
+        final_hash=engine.state_hash(),
+    )
+
+
+def _play_task(task) -> GameResult:
+    return play_game(*task)
+
+
+class Summary(NamedTuple):
+    games: int
+    workers: int
+    wall_seconds: float
+    games_per_second: float
+    turns_per_second: float
+    wins: Dict[str, int]
+    phase_seconds: Dict[str, float] # Summed over all games (CPU time in the workers)
+    results: List[GameResult]
+
+
+def simulate(games: int, policies: Sequence[str] = ("random", "random"), seed: int = 0,
+             max_turns: int = DEFAULT_MAX_TURNS, workers: Optional[int] = None) -> Summary:
+    """
+    Plays 'games' games, over a process pool unless workers == 1.
+    Results are returned in game order, whatever order the workers finish in.
+    """
+    for name in policies:
+        if name not in POLICIES:
+            raise ValueError(f"Unknown policy '{name}', expected one of {sorted(POLICIES)}")
+    workers = workers or os.cpu_count() or 1
+    tasks = [(game, game_seed(seed, game), tuple(policies), max_turns) for game in range(games)]
+
+    started = time.perf_counter()
+    if workers == 1:
+        results = [_play_task(task) for task in tasks]
+    else:
+        # Large chunks keep the pool overhead small next to a whole game
+        chunksize = max(1, games // (workers * 4))
+        with Pool(workers) as pool:
+            results = list(pool.imap_unordered(_play_task, tasks, chunksize=chunksize))
+    wall = time.perf_counter() - started
+    results.sort(key=lambda r: r.game)
+
+    wins = {"1": 0, "2": 0, "draw": 0}
+    phase_seconds = {phase.value: 0.0 for phase in Phase}
+    for result in results:
+        wins[str(result.winner) if result.winner else "draw"] += 1
+        for phase, seconds in result.phase_seconds.items():
+            phase_seconds[phase] += seconds
+    turns = sum(r.turns for r in results)
+    return Summary(
+        games=games,
+        workers=workers,
+        wall_seconds=wall,
+        games_per_second=games / wall if wall else 0.0,
+        turns_per_second=turns / wall if wall else 0.0,
+        wins=wins,
+        phase_seconds=phase_seconds,
+        results=results,
+    )
+
+
+def print_summary(summary: Summary):
+    print(f"{summary.games} games on {summary.workers} workers in {summary.wall_seconds:.2f}s")
+    print(f"  {summary.games_per_second:,.1f} games/s   {summary.turns_per_second:,.0f} turns/s")
+    print(f"  wins: P1 {summary.wins['1']}  P2 {summary.wins['2']}  draw {summary.wins['draw']}")
+    total = sum(summary.phase_seconds.values()) or 1.0
+    for phase, seconds in summary.phase_seconds.items():
+        print(f"  {phase:<14} {seconds:8.3f}s  {100 * seconds / total:5.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless self-play simulator")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--p1", default="random", choices=sorted(POLICIES))
+    parser.add_argument("--p2", default="random", choices=sorted(POLICIES))
+    parser.add_argument("--json", help="Also write per-game results to this JSON file")
+    parser.add_argument("--log", help="Log levels, e.g. 'engine=INFO' (default: warnings only)")
+    parser.add_argument("--events", help="Write the game events to this JSON lines file (runs in one process)")
+    args = parser.parse_args(argv)
+
+    workers = args.workers
+    if args.log or args.events:
+        configure(parse_levels(args.log or "engine=INFO"), console=bool(args.log), events_path=args.events,
+                  default_level="WARNING")
+        if args.events:
+            workers = 1 # One writer for the events file
+    summary = simulate(args.games, (args.p1, args.p2), args.seed, args.max_turns, workers)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([r._asdict() for r in summary.results], f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Runtime state of summoned monsters.
+
+A card (Monster, also exported as MonsterTemplate) is immutable and shared
+by every game and every clone. Summoning creates a MonsterInstance holding
+only what changes during play; everything else is read from the template.
+"""
+from typing import Optional
+from src.core.dataclasses import Monster
+
+# Status flags (bit set in MonsterInstance.flags)
+FLAG_NONE = 0
+
+
+class MonsterInstance:
+    """
+    A monster on the board: template reference, current HP, owner, position
+    and status flags. The grid keeps owner and position in sync as the unit
+    moves. Card fields (name, atk, defense, pattern...) read through to the
+    template, so an instance can be used wherever a card is displayed.
+    """
+    __slots__ = ("template", "hp", "owner_id", "x", "y", "flags")
+
+    def __init__(self, template: Monster, owner_id: int, x: int = -1, y: int = -1,
+                 hp: Optional[int] = None, flags: int = FLAG_NONE):
+        self.template = template
+        self.hp = template.hp if hp is None else hp
+        self.owner_id = owner_id
+        self.x = x
+        self.y = y
+        self.flags = flags
+
+    def copy(self) -> "MonsterInstance":
+        return MonsterInstance(self.template, self.owner_id, self.x, self.y, self.hp, self.flags)
+
+    @property
+    def max_hp(self) -> int:
+        return self.template.hp
+
+    def __getattr__(self, name):
+        # Only reached for names that are not slots
+        if name.startswith("__") or name == "template":
+            raise AttributeError(name)
+        return getattr(self.template, name)
+
+    def __eq__(self, other):
+        if not isinstance(other, MonsterInstance):
+            return NotImplemented
+        return (self.template is other.template and self.hp == other.hp and self.owner_id == other.owner_id
+                and self.x == other.x and self.y == other.y and self.flags == other.flags)
+
+    __hash__ = None # Mutable
+
+    def __repr__(self):
+        return f"MonsterInstance({self.template.name!r}, hp={self.hp}/{self.max_hp}, P{self.owner_id} at ({self.x}, {self.y}))"
@@ -0,0 +1,43 @@
+"""
+Zobrist keys for hashing game positions.
+
+Every feature of a position (who owns a cell, which monster stands where,
+crest counts, whose turn and phase it is) has a fixed 64-bit key. The hash of
+a position is the XOR of the keys of its features, so the grid and engine keep
+it current by XOR-ing a feature's old key out and its new key in.
+
+Keys come from blake2b of the feature itself: they are the same in every
+process and every run, without shipping a table of random numbers.
+"""
+import hashlib
+from functools import lru_cache
+from src.core.constants import Phase
+from src.core.dataclasses import DieFace
+
+
+@lru_cache(maxsize=None)
+def zobrist_key(*feature) -> int:
+    digest = hashlib.blake2b(repr(feature).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def owner_key(player_id: int, index: int) -> int:
+    return zobrist_key("owner", player_id, index)
+
+
+def dungeon_master_key(index: int) -> int:
+    return zobrist_key("dm", index)
+
+
+def monster_key(player_id: int, monster_id: str, index: int, hp=None) -> int:
+    # hp is the unit's current HP (None for monsters without runtime state)
+    return zobrist_key("monster", player_id, monster_id, index, hp)
+
+
+def crest_key(player_id: int, face: DieFace, count: int) -> int:
+    # Zero crests hash to nothing, so a fresh player contributes 0
+    return zobrist_key("crest", player_id, face.value, count) if count else 0
+
+
+def turn_key(player_id: int, phase: Phase) -> int:
+    return zobrist_key("turn", player_id, phase.value)
@@ -1,4 +1,7 @@
 from ursina import *
+from src.core.log import get_logger
+
+log = get_logger("ui.action_log")
 
 class ActionLog(Entity):
     def __init__(self):
@@ -41,7 +44,7 @@ class ActionLog(Entity):
         self.log("Action Log Ready")
         
     def log(self, message: str):
-        print(f"DEBUG UI LOG: {message}")
+        log.debug("UI LOG: %s", message)
         self.messages.append(message)
         if len(self.messages) > self.max_messages:
             self.messages.pop(0) # Remove oldest
@@ -1,14 +1,20 @@
 from ursina import *
 from src.core.engine import GameEngine
+from src.core.commands import Attack, Move, Summon
 from src.core.constants import BOARD_WIDTH, BOARD_HEIGHT
-from src.core.dataclasses import Pattern
+from src.core.bitboard import bit_index
+from src.core.patterns_registry import PATTERNS, get_orientations
+from src.core.log import get_logger
+
+log = get_logger("ui.board")
 
 class BoardView(Entity):
-    def __init__(self, engine: GameEngine, action_log, on_summon_success_callback=None):
+    def __init__(self, engine: GameEngine, action_log, on_summon_success_callback=None, on_history_change_callback=None):
         super().__init__()
         self.engine = engine
         self.action_log = action_log
         self.on_summon_success_callback = on_summon_success_callback
+        self.on_history_change_callback = on_history_change_callback # Called after undo/redo
         
         self.cells = {} # (x,y) -> Entity
         self.grid_width = 13
@@ -20,10 +26,13 @@ class BoardView(Entity):
         # Placement State
         self.construction_mode = False
         self.current_pattern = None
+        self.current_pattern_id = None
         self.current_pattern_shape = [] # List of tuples
         self.current_rotation = 0
+        self.current_flipped = False
         self.ghost_entities = []
         self.pending_monster = None # Monster being summoned
+        self.placement_masks = {} # flipped -> legal origins bitboard per rotation, computed once per placement
         
         # Movement State
         self.move_highlights = []
@@ -50,7 +59,7 @@ class BoardView(Entity):
 
     def on_menu_move(self, x, y):
         self.close_context_menu()
-        print(f"Menu: Move Selected for {x}, {y}")
+        log.debug("Menu: Move Selected for %d, %d", x, y)
         
         # Trigger the old 'Select Unit' logic
         self.selected_monster_pos = (x, y)
@@ -60,7 +69,9 @@ class BoardView(Entity):
         from src.core.dataclasses import DieFace
         move_power = current_player.crests.get(DieFace.MOVEMENT, 0)
         
-        self.valid_moves = self.engine.grid.get_valid_moves(x, y, move_power, current_player.player_id)
+        # Keep the search: it also holds the shortest path to each destination
+        self.move_search = self.engine.grid.search_moves(x, y, move_power, current_player.player_id)
+        self.valid_moves = list(self.move_search.destinations)
         self.highlight_valid_moves()
 
     def on_menu_stats(self, monster):
@@ -74,55 +85,70 @@ class BoardView(Entity):
             self.detail_panel_ref = None
 
     def try_place(self, origin_x, origin_y):
-        if self.engine.grid.validate_dimension(
-            self.engine.current_player_id, 
-            self.current_pattern, 
-            origin_x, 
-            origin_y, 
-            self.current_rotation
-        ):
-            # Apply to Core
-            self.engine.grid.apply_dimension(
-                self.engine.current_player_id, 
-                self.current_pattern, 
-                origin_x, 
-                origin_y, 
-                self.current_rotation
-            )
-            
-            # Spawn a placeholder monster for testing immediately after placing!
-            self.engine.summon_monster(
-                self.engine.current_player_id, 
-                self.pending_monster.name if self.pending_monster else "TestMonster", 
-                origin_x, 
-                origin_y,
-                monster_obj=self.pending_monster
-            )
-            
-            # Finish placement
-            self.construction_mode = False
-            self.clear_ghost()
-            self.update_visuals()
-            
-            # Deduct Summon Crests
-            self.engine.deduct_summon_cost(cost=2)
-            if self.crest_counter:
-                self.crest_counter.update_stats()
-            
-            self.action_log.log(f"P{self.engine.current_player_id} Summoned Monster!")
-            print("Placement Successful!")
-            
-            # Trigger Success Callback
-            if self.on_summon_success_callback and self.pending_monster:
-                self.on_summon_success_callback(self.pending_monster)
-            
-            self.pending_monster = None
-        else:
-            self.action_log.log("Invalid Placement!")
-            print("Invalid Placement!")
+        # Validate, pay, unfold and summon as one (undoable) engine action
+        hand_index = None
+        if self.pending_monster is not None:
+            # Also by card ID: a hot reload may have swapped the card object
+            pending = self.pending_monster
+            hand = self.engine.get_current_player().hand
+            hand_index = next((i for i, card in enumerate(hand)
+                               if card is pending or (pending.id is not None and card.id == pending.id)), None)
+            if hand_index is None:
+                self.action_log.log(f"{self.pending_monster.name} is no longer in your hand")
+                log.info("Placement refused: %s is not in the hand", self.pending_monster.name)
+                return
+        success, msg, _ = self.engine.apply(Summon(
+            pattern=self.current_pattern_id,
+            x=origin_x,
+            y=origin_y,
+            rotation=self.current_rotation,
+            flipped=self.current_flipped,
+            hand_index=hand_index
+        ))
+        if not success:
+            self.action_log.log(f"Invalid Placement! ({msg})")
+            log.info("Invalid Placement! (%s)", msg)
+            return
+
+        # Finish placement
+        self.construction_mode = False
+        self.clear_ghost()
+        self.update_visuals()
+        if self.crest_counter:
+            self.crest_counter.update_stats()
+
+        self.action_log.log(f"P{self.engine.current_player_id} {msg}!")
+        log.info("Placement Successful!")
+
+        # Trigger Success Callback
+        if self.on_summon_success_callback and self.pending_monster:
+            self.on_summon_success_callback(self.pending_monster)
+
+        self.pending_monster = None
+
+    def undo(self):
+        record = self.engine.undo()
+        if record:
+            self.action_log.log(f"Undo: {record.label}")
+            self.after_history_change()
+
+    def redo(self):
+        record = self.engine.redo()
+        if record:
+            self.action_log.log(f"Redo: {record.label}")
+            self.after_history_change()
+
+    def after_history_change(self):
+        self.clear_highlights()
+        self.selected_monster_pos = None
+        self.update_visuals()
+        if self.crest_counter:
+            self.crest_counter.update_stats()
+        if self.on_history_change_callback:
+            self.on_history_change_callback()
 
     def on_cell_click(self, x, y):
-        print(f"Clicked cell: {x}, {y}")
+        log.debug("Clicked cell: %d, %d", x, y)
         
         # Close any existing cursors/menus
         self.close_context_menu()
@@ -131,20 +157,19 @@ class BoardView(Entity):
         # Movement / Selection Logic
         cell_data = self.engine.grid.get_cell(x, y)
         current_player = self.engine.get_current_player()
-        print(f"DEBUG: Checking Selection... Cell Owner: {cell_data.monster_owner_id}, Current Player: {current_player.player_id}")
+        log.debug("Checking Selection... Cell Owner: %s, Current Player: %s", cell_data.monster_owner_id, current_player.player_id)
         
         # 1. Select Unit (Own Monster) -> SHOW MENU
         if cell_data and cell_data.monster_id and cell_data.monster_owner_id == current_player.player_id:
-            print(f"Opening Menu for Monster at {x}, {y}")
+            log.debug("Opening Menu for Monster at %d, %d", x, y)
             # Calculate screen position for menu (approximation or use mouse.position)
             # mouse.position is (x, y) in UI space (-0.5 to 0.5 usually)
             self.show_context_menu(cell_data.monster_ref, mouse.position, x, y)
             return
 
         # 2. Action (Move or Attack)
-        print(f"DEBUG: Checking Action. Selected: {getattr(self, 'selected_monster_pos', None)}")
+        log.debug("Checking Action. Selected: %s", getattr(self, 'selected_monster_pos', None))
         if hasattr(self, 'selected_monster_pos') and self.selected_monster_pos:
-            print("DEBUG: Inside Action Block")
             sx, sy = self.selected_monster_pos
             
             # A. Attack?
@@ -152,19 +177,19 @@ class BoardView(Entity):
                 # Check Adjacency
                 dist = abs(sx - x) + abs(sy - y)
                 if dist == 1:
-                    print(f"Attempting to attack {x}, {y}...")
-                    success, msg = self.engine.execute_attack(sx, sy, x, y)
+                    log.debug("Attempting to attack %d, %d...", x, y)
+                    success, msg, _ = self.engine.apply(Attack(from_x=sx, from_y=sy, to_x=x, to_y=y))
                     
                     if msg:
                         self.action_log.log(msg)
                         
                     if success:
-                        print("Attack Successful!")
+                        log.debug("Attack Successful!")
                         self.update_visuals()
                         if hasattr(self, 'crest_counter'):
                             self.crest_counter.update_stats()
                     else:
-                        print("Attack Failed")
+                        log.info("Attack Failed")
                         
                     # Deselect after attack attempt
                     self.selected_monster_pos = None
@@ -173,8 +198,8 @@ class BoardView(Entity):
 
             # B. Move?
             if (x, y) in self.valid_moves:
-                print(f"Moving to {x}, {y}")
-                success = self.engine.execute_move(sx, sy, x, y)
+                log.debug("Moving to %d, %d", x, y)
+                success, _, _ = self.engine.apply(Move(from_x=sx, from_y=sy, to_x=x, to_y=y))
                 if success:
                     self.selected_monster_pos = None
                     self.valid_moves = []
@@ -183,9 +208,9 @@ class BoardView(Entity):
                     if hasattr(self, 'crest_counter'):
                         self.crest_counter.update_stats()
                 else:
-                    print("Move failed (cost issue?)")
+                    log.info("Move failed (cost issue?)")
             else:
-                print("Invalid Move Destination or Action")
+                log.debug("Invalid Move Destination or Action")
                 self.selected_monster_pos = None
                 self.clear_highlights()
 
@@ -231,6 +256,16 @@ class BoardView(Entity):
             self.current_rotation = (self.current_rotation + 1) % 4
             self.refresh_ghost()
 
+        if self.construction_mode and key == 'f':
+            self.current_flipped = not self.current_flipped
+            self.refresh_ghost()
+
+        if not self.construction_mode and key == 'z':
+            self.undo()
+
+        if not self.construction_mode and key == 'y':
+            self.redo()
+
     def update(self):
         if self.construction_mode:
             if mouse.hovered_entity and mouse.hovered_entity in self.cells.values():
@@ -248,12 +283,15 @@ class BoardView(Entity):
     # Let's do `input` and `__init__` first.
 
 
-    def start_placement(self, pattern: Pattern, monster=None):
+    def start_placement(self, pattern_id: str, monster=None):
         self.construction_mode = True
-        self.current_pattern = pattern
+        self.current_pattern_id = pattern_id
+        self.current_pattern = PATTERNS[pattern_id]
         self.current_rotation = 0
+        self.current_flipped = False
         self.pending_monster = monster
-        print(f"Construction Mode ON: {pattern} for {monster}")
+        self.placement_masks = {}
+        log.debug("Construction Mode ON: %s for %s", pattern_id, monster)
 
     def refresh_ghost(self):
         # Triggered on rotation, re-highlight current position if mouse is hovering
@@ -265,17 +303,19 @@ class BoardView(Entity):
     def highlight_ghost(self, origin_x, origin_y):
         self.clear_ghost()
         
-        # Get rotated shape
-        shape = self.engine.grid.rotate_pattern(self.current_pattern, self.current_rotation)
+        # Get oriented shape from the precompiled orientation table
+        shape = get_orientations(self.current_pattern).get(self.current_rotation, self.current_flipped).offsets
         
-        # Validate first to decide color
-        is_valid = self.engine.grid.validate_dimension(
-            self.engine.current_player_id,
-            self.current_pattern,
-            origin_x,
-            origin_y,
-            self.current_rotation
-        )
+        # Look up validity in the placement bitboards (built once per flip side) to decide color
+        is_valid = False
+        if (origin_x, origin_y) in self.cells:
+            masks = self.placement_masks.get(self.current_flipped)
+            if masks is None:
+                masks = self.engine.grid.placement_masks(
+                    self.engine.current_player_id, self.current_pattern, self.current_flipped
+                )
+                self.placement_masks[self.current_flipped] = masks
+            is_valid = bool(masks[self.current_rotation] >> bit_index(origin_x, origin_y) & 1)
         if is_valid:
             ghost_color = color.rgba(color.green.r, color.green.g, color.green.b, 0.3)
         else:
@@ -329,69 +369,81 @@ class BoardView(Entity):
         # Sync visual state with engine state
         for x in range(BOARD_WIDTH):
             for y in range(BOARD_HEIGHT):
-                cell_data = self.engine.grid.get_cell(x, y)
-                visual_cell = self.cells.get((x, y))
+                self.update_cell(x, y)
+
+    def refresh_cells(self, positions):
+        """Rebuilds the pieces on the given cells, e.g. after their card was reloaded."""
+        for x, y in positions:
+            visual_cell = self.cells.get((x, y))
+            if visual_cell is not None and getattr(visual_cell, 'piece', None):
+                destroy(visual_cell.piece)
+                visual_cell.piece = None
+            self.update_cell(x, y)
+
+    def update_cell(self, x, y):
+        cell_data = self.engine.grid.get_cell(x, y)
+        visual_cell = self.cells.get((x, y))
+        
+        if cell_data and visual_cell:
+            # Reset base color
+            base_color = color.gray
+            if cell_data.owner_id == 1:
+                base_color = color.red
+            elif cell_data.owner_id == 2:
+                base_color = color.blue
                 
-                if cell_data and visual_cell:
-                    # Reset base color
-                    base_color = color.gray
-                    if cell_data.owner_id == 1:
-                        base_color = color.red
-                    elif cell_data.owner_id == 2:
-                        base_color = color.blue
-                        
-                    if cell_data.is_dungeon_master:
-                        base_color = color.gold
-                        
-                    visual_cell.color = base_color
-                    
-                    # Monster Visuals (Simple Cube on top)
-                    # For MVP we just tint the cell darker or add a child entity if not exists
-                    # Let's interact with a child entity 'piece'
-                    if not hasattr(visual_cell, 'piece'):
-                        visual_cell.piece = None
-                        
-                    if cell_data.monster_id:
-                        # Determine model/texture
-                        miniature_tex = None
-                        if cell_data.monster_ref and cell_data.monster_ref.miniature_path:
-                             miniature_tex = cell_data.monster_ref.miniature_path
-                             
-                        if not visual_cell.piece:
-                            if miniature_tex:
-                                # Render as Billboard Quad
-                                visual_cell.piece = Entity(
-                                    parent=visual_cell, 
-                                    model='quad', 
-                                    texture=miniature_tex,
-                                    scale=1.3, 
-                                    position=(0, 0, -0.65), # Lift up centered on tile (World Y)
-                                    billboard=True,
-                                    double_sided=True,
-                                    transparent=True # Ensure transparency support
-                                )
-                            else:
-                                # Default Sphere
-                                visual_cell.piece = Entity(
-                                    parent=visual_cell, 
-                                    model='sphere', 
-                                    color=color.white, 
-                                    scale=0.5, 
-                                    position=(0,0,-0.5)
-                                )
-                        
-                        # Color piece by owner IF it's the default sphere
-                        # If it's a miniature, probably keep original colors or tint slightly?
-                        # User wants the miniature "that marches with the card name". 
-                        # Let's assume miniature has its own colors. 
-                        if not miniature_tex:
-                            if cell_data.monster_owner_id == 1:
-                                visual_cell.piece.color = color.pink
-                            else:
-                                visual_cell.piece.color = color.cyan
-                        else:
-                            visual_cell.piece.color = color.white # Reset tint for texture
+            if cell_data.is_dungeon_master:
+                base_color = color.gold
+                
+            visual_cell.color = base_color
+            
+            # Monster Visuals (Simple Cube on top)
+            # For MVP we just tint the cell darker or add a child entity if not exists
+            # Let's interact with a child entity 'piece'
+            if not hasattr(visual_cell, 'piece'):
+                visual_cell.piece = None
+                
+            if cell_data.monster_id:
+                # Determine model/texture
+                miniature_tex = None
+                if cell_data.monster_ref and cell_data.monster_ref.miniature_path:
+                     miniature_tex = cell_data.monster_ref.miniature_path
+                     
+                if not visual_cell.piece:
+                    if miniature_tex:
+                        # Render as Billboard Quad
+                        visual_cell.piece = Entity(
+                            parent=visual_cell, 
+                            model='quad', 
+                            texture=miniature_tex,
+                            scale=1.3, 
+                            position=(0, 0, -0.65), # Lift up centered on tile (World Y)
+                            billboard=True,
+                            double_sided=True,
+                            transparent=True # Ensure transparency support
+                        )
+                    else:
+                        # Default Sphere
+                        visual_cell.piece = Entity(
+                            parent=visual_cell, 
+                            model='sphere', 
+                            color=color.white, 
+                            scale=0.5, 
+                            position=(0,0,-0.5)
+                        )
+                
+                # Color piece by owner IF it's the default sphere
+                # If it's a miniature, probably keep original colors or tint slightly?
+                # User wants the miniature "that marches with the card name". 
+                # Let's assume miniature has its own colors. 
+                if not miniature_tex:
+                    if cell_data.monster_owner_id == 1:
+                        visual_cell.piece.color = color.pink
                     else:
-                        if visual_cell.piece:
-                            destroy(visual_cell.piece)
-                            visual_cell.piece = None
+                        visual_cell.piece.color = color.cyan
+                else:
+                    visual_cell.piece.color = color.white # Reset tint for texture
+            else:
+                if visual_cell.piece:
+                    destroy(visual_cell.piece)
+                    visual_cell.piece = None
@@ -0,0 +1,37 @@
+from ursina import *
+from src.core.monster_loader import MonsterLoader, MONSTER_DIR
+from src.core.log import get_logger
+
+log = get_logger("ui.cards")
+
+class CardReloader(Entity):
+    """
+    Polls the card directory while the game runs and applies edited cards
+    to the engine, the hand and the board without a restart.
+    """
+    def __init__(self, engine, hand_view, board_view, action_log, directory=MONSTER_DIR, interval=1.0):
+        super().__init__()
+        self.engine = engine
+        self.hand_view = hand_view
+        self.board_view = board_view
+        self.action_log = action_log
+        self.interval = interval
+        self.elapsed = 0
+        self.watcher = MonsterLoader.watch(directory)
+        self.watcher.subscribe(self.on_cards_changed)
+
+    def update(self):
+        self.elapsed += time.dt
+        if self.elapsed >= self.interval:
+            self.elapsed = 0
+            self.watcher.poll()
+
+    def on_cards_changed(self, reload):
+        cells = self.engine.replace_templates(reload.replaced)
+        self.hand_view.replace_cards(reload.replaced)
+        self.board_view.refresh_cells(cells)
+        names = ", ".join(new.name for _, new in reload.replaced)
+        if names:
+            self.action_log.log(f"Reloaded: {names}")
+        if reload.added or reload.removed:
+            log.info("Card files: %d added, %d removed (used from the next game)", len(reload.added), len(reload.removed))
@@ -1,7 +1,10 @@
 from ursina import *
 from src.core.dataclasses import DieFace
+from src.core.log import get_logger
 import random
 
+log = get_logger("ui.dice")
+
 class Die(Entity):
     def __init__(self, position, scale=1.0):
         super().__init__(position=position, scale=scale)
@@ -103,7 +106,7 @@ class DiceRoller(Entity):
             faces.extend([face] * count)
         
         # Don't shuffle - show actual results in order
-        print(f"Animating Roll: {faces}")
+        log.debug("Animating Roll: %s", faces)
         
         for i, die in enumerate(self.dice):
             if i < len(faces):
@@ -1,6 +1,9 @@
 from ursina import *
 from src.ui.monster_card import MonsterCard
 from src.core.dataclasses import Monster, Pattern
+from src.core.log import get_logger
+
+log = get_logger("ui.hand")
 
 class HandView(Entity):
     def __init__(self, engine=None, on_summon_click=None):
@@ -36,7 +39,7 @@ class HandView(Entity):
         start_x = -0.35
         spacing = 0.20
         
-        print(f"Refeshing Hand for Player {player_state.player_id}. Count: {len(hand_list)}")
+        log.debug("Refeshing Hand for Player %s. Count: %d", player_state.player_id, len(hand_list))
         
         for i, m in enumerate(hand_list):
             c = MonsterCard(
@@ -49,20 +52,31 @@ class HandView(Entity):
             c.animate_position((start_x + (i * spacing), -0.38), duration=0.5, delay=i*0.1)
             self.cards.append(c)
 
+    def replace_cards(self, replaced):
+        """Swaps the cards whose template was hot-reloaded, leaving the others alone."""
+        new_by_old = {id(old): new for old, new in replaced}
+        for i, card in enumerate(self.cards):
+            new = new_by_old.get(id(card.monster))
+            if new is None:
+                continue
+            c = MonsterCard(
+                monster=new,
+                position=card.position,
+                scale=card.scale,
+                on_click=self.on_card_click,
+                on_summon_request=self.on_summon_click
+            )
+            destroy(card)
+            self.cards[i] = c
+
     def on_card_click(self, monster):
-        print(f"Card Clicked: {monster.name}")
+        log.debug("Card Clicked: %s", monster.name)
         from src.ui.card_detail_modal import CardDetailModal
         CardDetailModal(monster)
 
     def remove_card(self, monster):
-        print(f"Removing card for: {monster.name}")
-        
-        # Also remove from Data Model
-        if self.engine:
-            player = self.engine.get_current_player()
-            if monster in player.hand:
-                player.hand.remove(monster)
-        
+        # Only the widget: the engine already took the card out of the hand (undoably)
+        log.debug("Removing card for: %s", monster.name)
         card_to_remove = None
         for card in self.cards:
             if card.monster == monster:
@@ -1,7 +1,10 @@
 from ursina import *
 from src.core.engine import GameEngine
-from src.core.patterns_registry import PATTERNS
+from src.core.patterns_registry import PATTERNS, card_pattern_id
 from src.core.constants import Phase
+from src.core.log import get_logger
+
+log = get_logger("ui.hud")
 
 class HUD(Entity):
     def __init__(self, engine: GameEngine, on_roll_callback, on_pattern_selected_callback, on_end_turn_callback, on_next_phase_callback):
@@ -86,7 +89,7 @@ class HUD(Entity):
         total_summons = player.crests.get('SUMMON', 0)
         
         if total_summons < 2:
-            print(f"Not enough SUMMON crests: {total_summons} < 2")
+            log.info("Not enough SUMMON crests: %d < 2", total_summons)
             return
         
         self.show_pattern_selection(card_position)
@@ -131,7 +134,9 @@ class HUD(Entity):
             base_y = origin_pos.y + 0.2 # Start 0.3 units above the card center
             
         y_pos = base_y
-        for name in PATTERNS.keys():
+        # A card can only unfold as its own net
+        own = card_pattern_id(self.pending_monster) if self.pending_monster else None
+        for name in ([own] if own else PATTERNS.keys()):
             btn = Button(
                 text=name,
                 scale=(0.2, 0.05),
@@ -169,7 +174,7 @@ class HUD(Entity):
         self.pattern_buttons.clear()
 
     def select_pattern(self, pattern_name):
-        print(f"HUD Selected: {pattern_name} for {self.pending_monster.name if self.pending_monster else 'Unknown'}")
+        log.debug("HUD Selected: %s for %s", pattern_name, self.pending_monster.name if self.pending_monster else 'Unknown')
         
         # Pass both pattern name and the pending monster
         self.on_pattern_selected_callback(pattern_name, self.pending_monster)
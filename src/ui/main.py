@@ -1,5 +1,6 @@
 from ursina import *
 from src.core.engine import GameEngine
+from src.core.commands import EndTurn, NextPhase, Roll
 from src.ui.board_view import BoardView
 from src.ui.hud import HUD
 from src.ui.camera_controls import CameraControls
@@ -9,9 +10,16 @@ from src.ui.dice_roller import DiceRoller
 from src.ui.settings_panel import SettingsPanel
 from src.core.dataclasses import DieFace, Pattern
 from src.core.patterns_registry import PATTERNS
+from src.core.log import configure, get_logger, parse_levels
+import os
 import random
 
+log = get_logger("ui.main")
+
 def main():
+    # Console at INFO unless DDM_LOG says otherwise (e.g. "engine=DEBUG,ui=WARNING");
+    # DDM_LOG_EVENTS=<file> also writes the game events as JSON lines
+    configure(parse_levels(os.environ.get("DDM_LOG", "")), events_path=os.environ.get("DDM_LOG_EVENTS"))
     app = Ursina()
     
     # Initialize Core Engine
@@ -41,18 +49,25 @@ def main():
     
     # Define callback when summon succeeds
     def on_summon_success(monster):
-        print(f"Summon Success: {monster.name if monster else 'Unknown'}")
+        log.info("Summon Success: %s", monster.name if monster else 'Unknown')
         if monster:
             hand_view.remove_card(monster)
 
+    # Undo/redo can change the phase, the player and the hand
+    def on_history_change():
+        hud.update_phase_state(engine.current_phase)
+        update_camera()
+        hand_view.refresh_hand(engine.get_current_player())
+
     # Initialize Board View
-    board = BoardView(engine, action_log, on_summon_success_callback=on_summon_success)
+    board = BoardView(engine, action_log, on_summon_success_callback=on_summon_success,
+                      on_history_change_callback=on_history_change)
     board.crest_counter = crest_counter  # Pass reference for updates
     
     # Define callback for when a pattern is clicked in HUD
     def on_roll():
-        results = engine.roll_dice()
-        print(f"Rolled: {results}")
+        results = engine.apply(Roll()).value
+        log.info("Rolled: %s", results)
         
         # Animate Dice (no pattern selection)
         dice_roller.roll(results, engine=engine)
@@ -66,8 +81,7 @@ def main():
     
     def on_pattern_selected(pattern_name, monster=None):
         if pattern_name in PATTERNS:
-            selected_pattern = PATTERNS[pattern_name]
-            board.start_placement(selected_pattern, monster)
+            board.start_placement(pattern_name, monster)
 
     def update_camera():
         # Board Center is roughly (6, 0, 9)
@@ -86,7 +100,7 @@ def main():
             camera.rotation = (52, 180, 0)
 
     def on_end_turn():
-        engine.end_turn() # Resets to ROLL
+        engine.apply(EndTurn()) # Resets to ROLL
         
         # Reset UI for new turn
         hud.update_phase_state(engine.current_phase)
@@ -98,11 +112,11 @@ def main():
         # Refresh Hand for the new player
         hand_view.refresh_hand(engine.get_current_player())
         
-        print(f"Turn Ended. Now Player {engine.current_player_id}")
+        log.debug("Turn Ended. Now Player %s", engine.current_player_id)
         hud.show_turn_notification(engine.current_player_id)
 
     def on_next_phase():
-        new_phase = engine.next_phase()
+        new_phase = engine.apply(NextPhase()).value
         hud.update_phase_state(new_phase)
         
         # Optional: Disable Roll button if not ROLL phase
@@ -116,6 +130,10 @@ def main():
     from src.ui.hand_view import HandView
     hand_view = HandView(engine=engine, on_summon_click=hud.show_summon_patterns)
     
+    # Apply edited card files while playing
+    from src.ui.card_reloader import CardReloader
+    CardReloader(engine, hand_view, board, action_log)
+    
     # Connect roll button to settings panel for z-index control
     settings_panel.set_roll_button(hud.roll_button)
     
@@ -1,6 +1,9 @@
 from ursina import *
 from src.core.dataclasses import Monster
 from src.core.effects import get_effect
+from src.core.log import get_logger
+
+log = get_logger("ui.card")
 
 class MonsterCard(Entity):
     def __init__(self, monster: Monster, position=(0,0), on_click=None, on_summon_request=None, **kwargs):
@@ -71,7 +74,7 @@ class MonsterCard(Entity):
             Text(parent=self, text=full_desc, position=(0, -0.3), origin=(0, 0), scale=0.8, color=color.light_gray)
 
     def request_summon(self):
-        print(f"Summon Requested for {self.monster.name} at {self.position}")
+        log.debug("Summon Requested for %s at %s", self.monster.name, self.position)
         if self.on_summon_request:
             # Pass monster AND card position (Vec3, but for UI we mostly care about x, y)
             self.on_summon_request(self.monster, self.position)
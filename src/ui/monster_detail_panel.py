@@ -32,7 +32,7 @@ class MonsterDetailPanel(Entity):
         # --- Stats Row ---
         # HP
         self.hp_label = Text(parent=self, text="HP", position=(-0.3, 0.2), scale=2, color=color.azure)
-        self.hp_val = Text(parent=self, text=f"{monster.hp}/{monster.hp}", position=(-0.3, 0.15), scale=3, color=color.white)
+        self.hp_val = Text(parent=self, text=f"{monster.hp}/{getattr(monster, 'max_hp', monster.hp)}", position=(-0.3, 0.15), scale=3, color=color.white)
         
         # ATK
         self.atk_label = Text(parent=self, text="ATK", position=(0, 0.2), scale=2, color=color.red)
@@ -62,3 +62,765 @@ def test_validate_dimension_adjacency(grid):
     # Adjacent to ENEMY (should fail)
     grid.set_owner(8, 8, 2)
     assert grid.validate_dimension(1, pattern, 8, 9) == False
+
+def test_cell_is_read_only_view(grid):
+    grid.set_dungeon_master(6, 0, 1)
+    grid.place_monster(6, 0, 1, "Golem")
+
+    cell = grid.get_cell(6, 0)
+    assert cell.owner_id == 1
+    assert cell.is_dungeon_master
+    assert cell.monster_id == "Golem"
+    assert cell.monster_owner_id == 1
+
+    with pytest.raises(AttributeError):
+        cell.owner_id = 2
+
+def test_set_owner_replaces_previous_owner(grid):
+    grid.set_owner(3, 3, 1)
+    grid.set_owner(3, 3, 2)
+    assert grid.get_cell(3, 3).owner_id == 2
+    assert grid.validate_dimension(1, Pattern(shape=[(0,0)]), 3, 4) == False
+
+    grid.set_owner(3, 3, None)
+    assert grid.get_cell(3, 3).owner_id is None
+
+def test_adjacency_does_not_wrap_columns(grid):
+    # (0, 18) and (1, 0) are neighbours in bit order but not on the board
+    grid.set_owner(0, 18, 1)
+    assert grid.validate_dimension(1, Pattern(shape=[(0,0)]), 1, 0) == False
+    assert grid.validate_dimension(1, Pattern(shape=[(0,0)]), 0, 17) == True
+
+def test_valid_moves_blocked_by_enemy_not_friend(grid):
+    for y in range(5):
+        grid.set_owner(2, y, 1)
+    grid.place_monster(2, 0, 1, "Mover")
+    grid.place_monster(2, 1, 1, "Friend")
+    assert (2, 2) in grid.get_valid_moves(2, 0, 4, 1)
+    assert (2, 1) not in grid.get_valid_moves(2, 0, 4, 1) # Cannot stop on a monster
+
+    grid.place_monster(2, 3, 2, "Enemy")
+    moves = grid.get_valid_moves(2, 0, 4, 1)
+    assert (2, 2) in moves
+    assert (2, 4) not in moves
+
+    grid.move_monster(2, 0, 2, 2)
+    assert grid.get_cell(2, 0).monster_id is None
+    assert grid.get_cell(2, 2).monster_id == "Mover"
+    assert grid.get_cell(2, 2).monster_owner_id == 1
+
+def test_placement_map_matches_validate_dimension(grid):
+    from src.core.patterns_registry import PATTERNS
+    grid.set_dungeon_master(6, 0, 1)
+    grid.set_dungeon_master(6, 18, 2)
+    grid.apply_dimension(1, PATTERNS["NET_10"], 6, 2)
+    grid.apply_dimension(2, PATTERNS["NET_02"], 6, 15, 2, flipped=True)
+
+    for pattern in PATTERNS.values():
+        for flipped in (False, True):
+            placement_map = grid.placement_map(1, pattern, flipped)
+            assert len(placement_map) == 4
+            for rotation in range(4):
+                for x in range(grid.width):
+                    for y in range(grid.height):
+                        expected = grid.validate_dimension(1, pattern, x, y, rotation, flipped)
+                        assert placement_map[rotation][x][y] == expected, (pattern, rotation, x, y)
+
+def test_placement_index_tracks_apply_dimension(grid):
+    from src.core.patterns_registry import PATTERNS
+    grid.set_dungeon_master(6, 0, 1)
+    grid.set_dungeon_master(6, 18, 2)
+    index = grid.placement_index
+
+    before = index.legal_placements(1)
+    assert ("NET_10", 0, False, (6, 2)) in before
+    assert index.check_consistency(1) == []
+
+    grid.apply_dimension(1, PATTERNS["NET_10"], 6, 2)
+    grid.apply_dimension(2, PATTERNS["NET_05"], 6, 15)
+    assert ("NET_10", 0, False, (6, 2)) not in index.legal_placements(1)
+    assert index.check_consistency(1) == []
+    assert index.check_consistency(2) == []
+    assert index.count(1) == len(index.legal_placements(1))
+
+def test_valid_moves_cache_invalidation(grid):
+    for y in range(6):
+        grid.set_owner(2, y, 1)
+    grid.set_owner(10, 10, 1)
+    grid.place_monster(2, 0, 1, "Mover")
+
+    assert grid.get_valid_moves(2, 0, 3, 1) == [(2, 1), (2, 2), (2, 3)]
+    assert (2, 0, 1, 3) in grid._move_cache
+
+    # Changes far from the explored region keep the entry
+    grid.set_owner(10, 11, 1)
+    assert (2, 0, 1, 3) in grid._move_cache
+
+    # An enemy stepping into the region invalidates it
+    grid.place_monster(2, 2, 2, "Enemy")
+    assert (2, 0, 1, 3) not in grid._move_cache
+    assert grid.get_valid_moves(2, 0, 3, 1) == [(2, 1)]
+
+def test_move_search_paths_follow_the_dungeon(grid):
+    # U-shaped corridor: (0,0) -> (0,2) -> (2,2) -> (2,0)
+    for x, y in [(0,0), (0,1), (0,2), (1,2), (2,2), (2,1), (2,0)]:
+        grid.set_owner(x, y, 1)
+
+    search = grid.search_moves(0, 0, 6, 1)
+    assert search.distance(2, 0) == 6
+    assert search.path_to(2, 0) == [(0,0), (0,1), (0,2), (1,2), (2,2), (2,1), (2,0)]
+    assert search.cost_to(1, 2) == 3
+    assert search.distances()[(0, 0)] == 0
+    assert search.path_to(1, 0) is None
+
+def test_execute_move_charges_path_cost():
+    from src.core.engine import GameEngine
+    from src.core.dataclasses import DieFace
+    engine = GameEngine()
+    for x, y in [(0,0), (0,1), (0,2), (1,2), (2,2), (2,1), (2,0)]:
+        engine.grid.set_owner(x, y, 1)
+    engine.summon_monster(1, "Walker", 0, 0)
+    engine.add_crests(1, {DieFace.MOVEMENT: 7})
+
+    assert engine.execute_move(0, 0, 2, 0)
+    assert engine.players[1].crests[DieFace.MOVEMENT] == 1 # 6 steps, not Manhattan 2
+    assert engine.grid.get_cell(2, 0).monster_id == "Walker"
+
+def test_orientation_table_dedupes_symmetry():
+    from src.core.patterns_registry import ORIENTATIONS, get_orientations
+    # The cross is mirror-symmetric: 4 distinct footprints
+    assert len(ORIENTATIONS["NET_10"].unique) == 4
+    # The staircase net is chiral: mirrored placements are new footprints
+    assert len(ORIENTATIONS["NET_07"].unique) == 8
+    # A single cell is the same in every orientation
+    single = get_orientations(Pattern(shape=[(0,0)]))
+    assert len(single.unique) == 1
+    assert single.get(3, True) is single.get(0, False)
+    # Registry patterns and equal copies of them share the precompiled table
+    from src.core.patterns_registry import PATTERNS
+    assert get_orientations(PATTERNS["NET_10"]) is get_orientations(Pattern(shape=PATTERNS["NET_10"].shape)) is ORIENTATIONS["NET_10"]
+
+def test_flipped_placement(grid):
+    pattern = Pattern(shape=[(0,0), (1,0), (1,1)])
+    assert grid.rotate_pattern(pattern, 0, flipped=True) == [(0,0), (-1,0), (-1,1)]
+
+    grid.set_owner(4, 5, 1)
+    # Only the mirrored footprint covers (4, 6), next to own territory
+    assert grid.validate_dimension(1, pattern, 5, 6, 0, flipped=False) == False
+    assert grid.validate_dimension(1, pattern, 5, 6, 0, flipped=True) == True
+
+    grid.apply_dimension(1, pattern, 5, 6, 0, flipped=True)
+    assert grid.get_cell(4, 7).owner_id == 1
+    assert grid.get_cell(6, 6).owner_id is None
+
+def test_pattern_library_is_the_eleven_cube_nets():
+    from src.core.cube_nets import canonical_form, folds_into_cube, generate_cube_nets, load_cube_nets
+    from src.core.patterns_registry import PATTERNS, resolve_pattern_id
+
+    assert len(PATTERNS) == 11
+    assert len({canonical_form(p.shape) for p in PATTERNS.values()}) == 11
+    for pattern in PATTERNS.values():
+        assert len(pattern.shape) == 6
+        assert (0, 0) in pattern.shape
+        assert folds_into_cube(pattern.shape)
+
+    # A straight line of six and a 2x3 block are not cube nets
+    assert not folds_into_cube([(0, y) for y in range(6)])
+    assert not folds_into_cube([(x, y) for x in range(2) for y in range(3)])
+    assert resolve_pattern_id("CROSS") == "NET_10"
+    assert resolve_pattern_id("RECT_2X3") is None
+
+    # The committed cache matches what the generator produces
+    assert load_cube_nets() == generate_cube_nets()
+
+def test_monster_data_uses_real_nets():
+    from src.core.monster_loader import MonsterLoader
+    from src.core.patterns_registry import PATTERNS
+    assert MonsterLoader.validate_patterns("data/monsters") == {}
+    for monster in MonsterLoader.load_monsters("data/monsters"):
+        assert monster.pattern_id in PATTERNS
+
+def test_grid_clone_is_independent(grid):
+    grid.set_dungeon_master(6, 0, 1)
+    grid.set_owner(6, 1, 1)
+    grid.place_monster(6, 1, 1, "Golem")
+
+    copy = grid.clone()
+    copy.move_monster(6, 1, 6, 0)
+    copy.set_owner(6, 2, 2)
+
+    assert grid.get_cell(6, 1).monster_id == "Golem"
+    assert grid.get_cell(6, 2).owner_id is None
+    assert copy.get_cell(6, 0).monster_id == "Golem"
+    assert copy.get_cell(6, 1).monster_id is None
+    assert copy.get_cell(6, 2).owner_id == 2
+    assert copy.placement_index.check_consistency(1) == []
+    assert not hasattr(grid.get_cell(0, 0), "__dict__")
+
+def test_monster_slots_are_reused():
+    from src.core.engine import GameEngine
+    from src.core.dataclasses import Monster
+    from src.core.patterns_registry import PATTERNS
+    engine = GameEngine(card_pool=[])
+    card = Monster(name="Imp", level=1, atk=10, hp=10, pattern=PATTERNS["NET_10"], **{"def": 0})
+    engine.grid.set_owner(6, 1, 1)
+    engine.grid.set_owner(6, 2, 1)
+    engine.summon_monster(1, "Imp", 6, 2, card)
+    empty = engine.snapshot()
+    for _ in range(200):
+        engine.summon_monster(1, "Imp", 6, 1, card)
+        engine.damage_unit(6, 1, 10)
+    assert len(engine.grid.monster_table) <= 2
+    assert len(engine.grid.clone().monster_table) <= 2
+    assert engine.snapshot() == empty # Same position, same snapshot
+
+    # Undo brings back destroyed units even when their slot was reused
+    engine.summon_monster(1, "Imp", 6, 1, card)
+    first = engine.grid.get_cell(6, 1).monster_ref
+    engine.damage_unit(6, 1, 10)
+    engine.summon_monster(1, "Imp", 6, 1, card)
+    engine.undo()
+    engine.undo()
+    assert engine.grid.get_cell(6, 1).monster_ref is first
+    assert engine.grid.get_cell(6, 2).monster_ref is not first
+    engine.redo()
+    engine.redo()
+    assert engine.grid.get_cell(6, 1).monster_ref is not first
+    assert engine.grid.compute_zobrist() == engine.grid.zobrist
+
+def test_engine_snapshot_restore_and_clone():
+    from src.core.engine import GameEngine
+    from src.core.dataclasses import DieFace
+    from src.core.constants import Phase
+    engine = GameEngine()
+    engine.grid.set_owner(6, 1, 1)
+    engine.summon_monster(1, "Golem", 6, 1)
+    engine.add_crests(1, {DieFace.MOVEMENT: 2})
+    snap = engine.snapshot()
+
+    branch = engine.clone()
+    branch.add_crests(1, {DieFace.ATTACK: 5})
+    branch.grid.move_monster(6, 1, 6, 0)
+    branch.players[1].hand.clear()
+    branch.next_phase()
+    assert engine.players[1].crests[DieFace.ATTACK] == 0
+    assert engine.grid.get_cell(6, 1).monster_id == "Golem"
+    assert engine.players[1].hand
+    assert engine.current_phase == Phase.ROLL
+
+    engine.execute_move(6, 1, 6, 0)
+    engine.end_turn()
+    engine.restore(snap)
+    assert engine.snapshot() == snap
+    assert engine.grid.get_cell(6, 1).monster_id == "Golem"
+    assert engine.players[1].crests[DieFace.MOVEMENT] == 2
+    assert engine.current_player_id == 1
+
+def test_undo_redo_restores_exact_positions():
+    from src.core.engine import GameEngine
+    from src.core.dataclasses import DieFace
+    from src.core.patterns_registry import PATTERNS
+    engine = GameEngine()
+    engine.add_crests(1, {DieFace.SUMMON: 2, DieFace.MOVEMENT: 3})
+    card = engine.players[1].hand[0]
+
+    position = engine.snapshot
+    positions = [position()]
+
+    ok, _ = engine.execute_dimension(PATTERNS["NET_10"], 6, 2, monster=card)
+    assert ok
+    positions.append(position())
+    assert card not in engine.players[1].hand
+    assert engine.execute_move(6, 2, 6, 3)
+    positions.append(position())
+    engine.next_phase()
+    positions.append(position())
+    assert [r.label for r in engine.history] == ["dimension", "move", "next_phase"]
+
+    for expected in reversed(positions[:-1]):
+        engine.undo()
+        assert position() == expected
+    assert engine.players[1].hand[0] is card
+    assert engine.undo() is None
+
+    for expected in positions[1:]:
+        engine.redo()
+        assert position() == expected
+    assert engine.grid.get_cell(6, 3).monster_ref.template is card
+
+def test_undo_attack_and_failed_actions():
+    from src.core.engine import GameEngine
+    from src.core.dataclasses import DieFace, Monster
+    from src.core.patterns_registry import PATTERNS
+    engine = GameEngine()
+    engine.grid.set_owner(6, 1, 1)
+    engine.grid.set_owner(6, 2, 2)
+    engine.summon_monster(1, "A", 6, 1, Monster(name="A", level=1, atk=30, **{"def": 10}, hp=20, pattern=PATTERNS["NET_10"]))
+    engine.summon_monster(2, "B", 6, 2, Monster(name="B", level=1, atk=10, **{"def": 10}, hp=20, pattern=PATTERNS["NET_10"]))
+    engine.history.clear()
+    assert engine.execute_move(6, 1, 5, 1) is False # No movement crests: nothing recorded
+    assert not engine.history
+
+    engine.add_crests(1, {DieFace.ATTACK: 1})
+    engine.add_crests(2, {DieFace.DEFENSE: 1})
+    before = engine.snapshot()
+    ok, _ = engine.execute_attack(6, 1, 6, 2)
+    assert ok and engine.grid.get_cell(6, 2).monster_id is None
+    engine.undo()
+    assert engine.snapshot() == before
+    assert engine.grid.get_cell(6, 2).monster_id == "B"
+
+    # Undoing a roll rewinds the dice: no free re-rolls
+    rolls = [engine.roll_dice()]
+    for _ in range(3):
+        engine.undo()
+        rolls.append(engine.roll_dice())
+    assert all(r == rolls[0] for r in rolls)
+    after = engine.rng.getstate()
+    engine.undo()
+    engine.redo()
+    assert engine.rng.getstate() == after
+
+def test_state_hash_is_incremental_and_transposition_safe():
+    from src.core.engine import GameEngine
+    from src.core.dataclasses import DieFace
+    from src.core.patterns_registry import PATTERNS
+    engine = GameEngine()
+    start = engine.state_hash()
+    assert start == engine.compute_state_hash()
+
+    engine.add_crests(1, {DieFace.SUMMON: 2, DieFace.MOVEMENT: 4})
+    engine.execute_dimension(PATTERNS["NET_10"], 6, 2, monster=engine.players[1].hand[0])
+    engine.next_phase()
+    assert engine.state_hash() == engine.compute_state_hash()
+
+    # Same position reached by two different routes
+    a, b = engine.clone(), engine.clone()
+    a.execute_move(6, 2, 5, 2)
+    a.execute_move(5, 2, 6, 2)
+    a.execute_move(6, 2, 6, 3)
+    b.execute_move(6, 2, 6, 3)
+    b.remove_crests(1, {DieFace.MOVEMENT: 2})
+    assert a.state_hash() == b.state_hash() == a.compute_state_hash()
+    assert a.state_hash() != engine.state_hash()
+
+    while engine.undo():
+        pass
+    assert engine.state_hash() == engine.compute_state_hash()
+    engine.remove_crests(1, {DieFace.SUMMON: 2, DieFace.MOVEMENT: 4})
+    assert engine.state_hash() == start
+
+def test_simulated_games_are_reproducible():
+    from src.core.simulate import play_game, simulate
+    first = play_game(0, seed=42, policies=("random", "greedy"), max_turns=30)
+    again = play_game(0, seed=42, policies=("random", "greedy"), max_turns=30)
+    assert first.turns == 30 and first.actions > 0
+    assert first.final_hash == again.final_hash
+
+    summary = simulate(3, ("greedy", "random"), seed=1, max_turns=10, workers=1)
+    assert [r.game for r in summary.results] == [0, 1, 2]
+    assert summary.wins["draw"] == 3
+    with pytest.raises(ValueError):
+        simulate(1, ("nobody", "random"), workers=1)
+
+def test_engine_uses_injected_or_shared_card_pool(tmp_path, monkeypatch):
+    from src.core.engine import GameEngine, mirror_hands
+    from src.core.monster_loader import MonsterLoader
+    pool = MonsterLoader.load_card_pool()
+    assert [m.id for m in pool] == sorted(m.id for m in pool)
+    with pytest.raises(Exception):
+        pool[0].hp = 1 # Cards are shared, so they are frozen
+
+    monkeypatch.chdir(tmp_path) # No longer depends on the working directory
+    engine = GameEngine()
+    assert engine.players[1].hand[0] is pool[0]
+    assert engine.players[2].hand[0] is pool[1]
+
+    mirrored = GameEngine(card_pool=pool[:2], deal=mirror_hands)
+    assert mirrored.players[1].hand == mirrored.players[2].hand == list(pool[:2])
+
+def test_card_cache_reparses_only_changed_files(tmp_path, monkeypatch):
+    import json, os, shutil
+    from src.core.monster_loader import MonsterLoader, MONSTER_DIR, card_cache_path
+    monkeypatch.setenv("DDM_CACHE_DIR", str(tmp_path / "cache"))
+    cards = tmp_path / "cards"
+    cards.mkdir()
+    for name in ("card_01_crystal_golem.json", "card_02_ember_whelp.json"):
+        shutil.copy(os.path.join(MONSTER_DIR, name), cards / name)
+    (cards / "card_99_broken.json").write_text("{not json")
+    first = MonsterLoader.load_monsters(str(cards))
+    assert len(first) == 2 and os.path.exists(card_cache_path(str(cards)))
+    assert len(os.listdir(cards)) == 3 # Nothing written next to the cards
+
+    parsed = []
+    original = MonsterLoader.parse_monster
+    monkeypatch.setattr(MonsterLoader, "parse_monster",
+                        staticmethod(lambda data, base="": parsed.append(data["id"]) or original(data, base)))
+    loads = []
+    load_file = MonsterLoader._load_file
+    monkeypatch.setattr(MonsterLoader, "_load_file",
+                        staticmethod(lambda path, *args: loads.append(path) or load_file(path, *args)))
+    assert MonsterLoader.load_monsters(str(cards)) == first
+    assert parsed == [] and loads == [] # The broken file is not read again either
+
+    card = json.loads((cards / "card_02_ember_whelp.json").read_text())
+    card["name"] = "Renamed Whelp"
+    (cards / "card_02_ember_whelp.json").write_text(json.dumps(card))
+    (cards / "card_01_crystal_golem.json").unlink()
+    monsters = MonsterLoader.load_monsters(str(cards))
+    assert parsed == ["card_02_ember_whelp"]
+    assert [m.name for m in monsters] == ["Renamed Whelp"]
+
+def test_lazy_card_pool_matches_eager_load():
+    from src.core.monster_loader import MonsterLoader, MONSTER_DIR
+    eager = MonsterLoader.load_monsters(MONSTER_DIR, use_cache=False)
+    lazy = MonsterLoader.load_lazy(MONSTER_DIR, workers=2)
+    assert list(lazy) == [m.id for m in eager]
+    assert lazy.headers["card_02_ember_whelp"].name == "Ember Whelp"
+    assert lazy.loaded_count() == 0
+
+    whelp = lazy["card_02_ember_whelp"]
+    assert lazy["card_02_ember_whelp"] is whelp
+    assert lazy.loaded_count() == 1
+    assert list(lazy.values()) == eager
+    with pytest.raises(KeyError):
+        lazy["missing"]
+
+def test_card_pack_streams_and_indexes_cards(tmp_path):
+    from src.core.card_pack import CardPack, CardPackError, main
+    from src.core.monster_loader import MonsterLoader, MONSTER_DIR
+    pack_path = str(tmp_path / "cards.ddmpack")
+    main(["pack", MONSTER_DIR, pack_path])
+    cards = MonsterLoader.load_monsters(MONSTER_DIR, use_cache=False)
+
+    assert list(MonsterLoader.stream_pack(pack_path)) == cards
+    for use_mmap in (False, True):
+        with MonsterLoader.open_pack(pack_path, use_mmap) as pack:
+            assert len(pack) == len(cards)
+            assert pack.get("card_04_crystal_guardian") == cards[4]
+            assert [m.id for m in pack.iter_cards()] == [m.id for m in cards]
+            with pytest.raises(KeyError):
+                pack.get("missing")
+
+    with open(pack_path, "rb+") as f: # Cut off the trailer
+        f.truncate(f.seek(0, 2) - 5)
+    with pytest.raises(CardPackError):
+        CardPack(pack_path)
+
+def test_summoned_units_keep_their_own_hp():
+    import sys
+    from src.core.engine import GameEngine
+    from src.core.dataclasses import DieFace, Monster
+    from src.core.monster_loader import MonsterLoader, MONSTER_DIR
+    from src.core.patterns_registry import PATTERNS
+    from src.core.units import MonsterInstance
+    card = MonsterLoader.load_card_pool()[0]
+    assert MonsterLoader.load_lazy(MONSTER_DIR)[card.id] is card # Interned templates
+
+    imp = Monster(name="Imp", level=1, atk=15, hp=40, pattern=PATTERNS["NET_10"], **{"def": 5})
+    engine = GameEngine()
+    engine.grid.set_owner(6, 1, 1)
+    engine.grid.set_owner(6, 2, 2)
+    engine.summon_monster(1, "Imp", 6, 1, imp)
+    engine.summon_monster(2, "Imp", 6, 2, imp)
+    unit = engine.grid.get_cell(6, 2).monster_ref
+    assert isinstance(unit, MonsterInstance) and unit.template is imp
+    assert (unit.owner_id, unit.x, unit.y, unit.name) == (2, 6, 2, "Imp")
+    assert sys.getsizeof(unit) < 100
+
+    engine.add_crests(1, {DieFace.ATTACK: 2})
+    before = engine.state_hash()
+    branch = engine.clone()
+    engine.execute_attack(6, 1, 6, 2)
+    assert unit.hp == 25 and imp.hp == unit.max_hp == 40
+    assert engine.state_hash() == engine.compute_state_hash() != before
+    assert branch.grid.get_cell(6, 2).monster_ref.hp == 40
+
+    engine.undo()
+    assert unit.hp == 40 and engine.state_hash() == before
+    engine.redo()
+    engine.execute_attack(6, 1, 6, 2)
+    engine.execute_attack(6, 1, 6, 2) # Out of crests: no third hit
+    assert unit.hp == 10 and engine.grid.get_cell(6, 2).monster_ref is unit
+
+def test_card_index_queries():
+    from src.core.card_index import CardIndex, Q, parse_terms
+    from src.core.monster_loader import MonsterLoader
+    pool = MonsterLoader.load_card_pool()
+    index = CardIndex(pool)
+
+    def brute(pred):
+        return [m for m in pool if pred(m)]
+
+    sentinels = index.search(Q(level=3, attribute="earth", type="Warrior") & Q(trigger="ON_DEFENSE_SUCCESS"))
+    assert [m.id for m in sentinels] == ["card_015_iron_sentinel"]
+    assert index.search(Q(pattern="CROSS")) == brute(lambda m: m.pattern_id == "NET_10")
+    assert index.search(Q(type=["Dragon", "Rock"]) | Q(face="DEFENSE")) == \
+        brute(lambda m: m.type in ("Dragon", "Rock") or any(f.symbol.value == "DEFENSE" for f in m.die_faces))
+    assert index.search(parse_terms(["!level=2"])) == brute(lambda m: m.level != 2)
+    assert index.count(Q(effect="E002_HEAL_SELF")) == 2
+    # Effects given by bare ID are indexed under their registry trigger
+    assert index.search(Q(trigger="ON_TURN_START")) == brute(lambda m: "E002_HEAL_SELF" in m.effects)
+    with pytest.raises(ValueError):
+        Q(colour="red")
+
+def test_card_validator_reports_bad_cards(tmp_path):
+    import json
+    from src.core.card_validator import main, validate
+    cards = {
+        "good.json": {"id": "good", "name": "Good", "level": 2, "stats": {"hp": 10, "atk": 10, "def": 5},
+                      "metadata": {"pattern": "CROSS"}, "mechanics": {"effects": ["E002_HEAL_SELF"]}},
+        "bad.json": {"id": "bad", "name": "Bad", "level": "3", "stats": {"atk": 10, "def": -1},
+                     "pattern": "RECT_2X3", "effects": ["E999_NOPE"], "assets": {"token_sprite": "../secret.png"},
+                     "die_configuration": {"faces": [{"symbol": "BANANA"}]}},
+        "copy.json": {"id": "good", "name": "Good", "level": 2, "hp": 10, "atk": 10, "defense": 5, "pattern": "NET_01"},
+    }
+    for filename, data in cards.items():
+        (tmp_path / filename).write_text(json.dumps(data))
+    (tmp_path / "broken.json").write_text("{not json")
+
+    report = validate(str(tmp_path), workers=1)
+    codes = {(i["card"], i["code"], i["field"]) for i in report["issues"]}
+    assert report["cards"] == 3
+    assert not [c for c in codes if c[0] == "good" and c[1] != "duplicate_id"]
+    assert {("bad", "bad_type", "level"), ("bad", "missing_field", "hp"), ("bad", "out_of_range", "def"),
+            ("bad", "unknown_pattern", "pattern"), ("bad", "unknown_effect", "effects"),
+            ("bad", "bad_asset", "assets.token_sprite"), ("bad", "unknown_die_face", "die_configuration"),
+            ("good", "duplicate_id", "id"), (None, "invalid_json", "")} <= codes
+
+    assert main([str(tmp_path), "--report", str(tmp_path / "report.out"), "--workers", "1"]) == 1
+    assert json.loads((tmp_path / "report.out").read_text())["counts"]["duplicate_id"] == 1
+
+def test_hot_reload_swaps_changed_templates(tmp_path, monkeypatch):
+    import json, os, shutil
+    from src.core.engine import GameEngine
+    from src.core.monster_loader import MonsterLoader, MONSTER_DIR
+    monkeypatch.setenv("DDM_CACHE_DIR", str(tmp_path / "cache"))
+    cards = tmp_path / "cards"
+    cards.mkdir()
+    for name in ("card_01_crystal_golem.json", "card_02_ember_whelp.json"):
+        shutil.copy(os.path.join(MONSTER_DIR, name), cards / name)
+    pool = MonsterLoader.load_card_pool(str(cards))
+    golem, whelp = pool
+    loads = []
+    load_file = MonsterLoader._load_file
+    monkeypatch.setattr(MonsterLoader, "_load_file",
+                        staticmethod(lambda path, *args: loads.append(path) or load_file(path, *args)))
+    watcher = MonsterLoader.watch(str(cards))
+    assert loads == [] # Seeded from the card cache
+    assert watcher.cards == pool and watcher.poll() is None
+    seen = []
+    watcher.subscribe(seen.append)
+
+    engine = GameEngine(card_pool=pool)
+    engine.grid.set_owner(3, 3, 1)
+    engine.summon_monster(1, golem.name, 3, 3, golem)
+    unit = engine.grid.get_cell(3, 3).monster_ref
+    engine.damage_unit(3, 3, 2)
+
+    card = json.loads((cards / "card_01_crystal_golem.json").read_text())
+    card["stats"]["hp"] = 20
+    (cards / "card_01_crystal_golem.json").write_text(json.dumps(card))
+    (cards / "card_03.json").write_text(json.dumps(dict(card, id="card_03", name="Third")))
+    reload = watcher.poll()
+    assert seen == [reload]
+    assert sorted(os.path.basename(path) for path in loads) == ["card_01_crystal_golem.json", "card_03.json"]
+    (old, new), = reload.replaced
+    assert old is golem and new.hp == 20 and [m.name for m in reload.added] == ["Third"]
+    assert MonsterLoader.load_card_pool(str(cards)) == (new, whelp, reload.added[0])
+
+    assert engine.replace_templates(reload.replaced) == [(3, 3)]
+    assert engine.players[1].hand[0] is new and engine.players[2].hand[0] is whelp
+    assert unit.template is new and unit.hp == 18 # Damage is kept
+    assert engine.state_hash() == engine.compute_state_hash()
+
+    # The undo history follows the new card too: HP never goes above the new max
+    assert engine.undo().label == "damage" and unit.hp == 20
+    engine.undo()
+    assert engine.grid.get_cell(3, 3).monster_id is None
+    engine.redo()
+    assert engine.grid.get_cell(3, 3).monster_ref.hp == 20
+    engine.redo()
+    assert engine.grid.get_cell(3, 3).monster_ref.hp == 18 and unit.template is new
+    assert engine.state_hash() == engine.compute_state_hash()
+    MonsterLoader.clear_card_pools()
+
+def test_effects_fire_from_the_trigger_table():
+    from src.core.engine import GameEngine
+    from src.core.dataclasses import DieFace, EffectSpec, Monster
+    from src.core.effects import ON_ATTACK, ON_DEFENSE_SUCCESS, ON_TURN_START
+    from src.core.patterns_registry import PATTERNS
+    sentinel = Monster(name="Sentinel", level=2, atk=10, hp=40, pattern=PATTERNS["NET_10"], **{"def": 10},
+                       effects=["E045_COUNTER_STANCE"], effect_specs=[EffectSpec(
+                           id="E045_COUNTER_STANCE", trigger=ON_DEFENSE_SUCCESS,
+                           params={"damage_reflect": 10, "condition": "ATTACKER_IS_ADJACENT"})])
+    brute = Monster(name="Brute", level=2, atk=15, hp=30, pattern=PATTERNS["NET_10"], **{"def": 0},
+                    effects=["E001_DOUBLE_ATK", "E002_HEAL_SELF"],
+                    effect_specs=[EffectSpec(id="E001_DOUBLE_ATK"), EffectSpec(id="E002_HEAL_SELF")])
+    engine = GameEngine()
+    engine.grid.set_owner(6, 1, 1)
+    engine.grid.set_owner(6, 2, 2)
+    engine.summon_monster(1, "Brute", 6, 1, brute)
+    engine.summon_monster(2, "Sentinel", 6, 2, sentinel)
+    grid = engine.grid
+    assert [(x, y) for x, y, _ in grid.listeners(ON_DEFENSE_SUCCESS)] == [(6, 2)]
+    assert [(x, y) for x, y, _ in grid.listeners(ON_ATTACK)] == [(6, 1)]
+    assert [(x, y) for x, y, _ in grid.listeners(ON_TURN_START)] == [(6, 1)]
+
+    engine.add_crests(1, {DieFace.ATTACK: 3})
+    engine.add_crests(2, {DieFace.DEFENSE: 1})
+    before = engine.state_hash()
+    engine.execute_attack(6, 1, 6, 2) # 15 ATK doubled to 30, minus 10 DEF; 10 reflected
+    assert grid.get_cell(6, 2).monster_ref.hp == 20
+    assert grid.get_cell(6, 1).monster_ref.hp == 20
+    engine.execute_attack(6, 1, 6, 2) # No defense left: destroyed, nothing reflected
+    assert grid.get_cell(6, 2).monster_ref is None and not grid.trigger_masks[ON_DEFENSE_SUCCESS]
+    assert engine.state_hash() == engine.compute_state_hash()
+
+    engine.undo()
+    engine.undo()
+    assert engine.state_hash() == before
+    assert [(x, y) for x, y, _ in grid.listeners(ON_DEFENSE_SUCCESS)] == [(6, 2)]
+    assert engine.clone().grid.trigger_masks == grid.trigger_masks
+
+    engine.redo()
+    engine.end_turn() # Player 2: only their units heal
+    assert grid.get_cell(6, 1).monster_ref.hp == 20
+    engine.end_turn()
+    assert grid.get_cell(6, 1).monster_ref.hp == 30
+
+def test_effects_compile_from_card_data():
+    import pickle
+    import pydantic
+    from src.core.card_validator import validate_card
+    from src.core.dataclasses import DieFace, EffectSpec, Monster
+    from src.core.effects import ON_ATTACK, TriggerEvent
+    from src.core.engine import GameEngine
+    from src.core.patterns_registry import PATTERNS
+    # A designer-made effect: no registry entry, no Python
+    rage = {"id": "E100_RAGE", "trigger": ON_ATTACK,
+            "params": {"atk_bonus": 5, "atk_multiplier": 2, "damage": 3, "target": "SELF", "condition": ["IS_DAMAGED"]}}
+    spec = EffectSpec(**rage)
+    assert spec.program is EffectSpec(**rage).program # Compiled once per definition
+    assert EffectSpec(id="E002_HEAL_SELF").program is EffectSpec(id="E002_HEAL_SELF", params={"heal": 10}).program
+    assert pickle.loads(pickle.dumps(spec)).program is spec.program
+    with pytest.raises(pydantic.ValidationError):
+        EffectSpec(id="E101", trigger=ON_ATTACK, params={"atk_bonsu": 5})
+    assert [i[1] for i in validate_card({"effects": [dict(rage, params={"heal": "lots"})]}) if i[2] == "effects"] == ["bad_effect"]
+
+    ogre = Monster(name="Ogre", level=2, atk=10, hp=30, pattern=PATTERNS["NET_10"], **{"def": 0},
+                   effects=["E100_RAGE"], effect_specs=[spec])
+    wall = Monster(name="Wall", level=1, atk=0, hp=90, pattern=PATTERNS["NET_10"], **{"def": 0})
+    engine = GameEngine()
+    engine.grid.set_owner(6, 1, 1)
+    engine.grid.set_owner(6, 2, 2)
+    engine.summon_monster(1, "Ogre", 6, 1, ogre)
+    engine.summon_monster(2, "Wall", 6, 2, wall)
+    engine.add_crests(1, {DieFace.ATTACK: 2})
+    engine.execute_attack(6, 1, 6, 2) # Undamaged: plain 10 ATK
+    assert engine.grid.get_cell(6, 2).monster_ref.hp == 80
+    engine.grid.set_monster_hp(6, 1, 20)
+    engine.execute_attack(6, 1, 6, 2) # 10 * 2 + 5 (OPS order), and the Ogre takes 3
+    assert engine.grid.get_cell(6, 2).monster_ref.hp == 55
+    assert engine.grid.get_cell(6, 1).monster_ref.hp == 17
+    assert isinstance(engine.fire(ON_ATTACK, atk=1), TriggerEvent)
+
+def test_trigger_chains_resolve_in_order_with_a_depth_cap():
+    from src.core.engine import GameEngine
+    from src.core.dataclasses import EffectSpec, Monster
+    from src.core.effects import ON_DESTROYED
+    from src.core.patterns_registry import PATTERNS
+    # Every ally's destruction costs each of them 1 HP, so each death causes the next one
+    grief = EffectSpec(id="E200_GRIEF", trigger=ON_DESTROYED,
+                       params={"damage": 1, "target": "SELF", "condition": "UNIT_IS_ALLY"})
+    def mourner(hp):
+        return Monster(name=f"Mourner {hp}", level=1, atk=0, hp=hp, pattern=PATTERNS["NET_10"], **{"def": 0},
+                       effects=[grief.id], effect_specs=[grief])
+
+    engine = GameEngine()
+    for x, hp in enumerate([1, 1, 2, 3, 4], start=1):
+        engine.grid.set_owner(x, 5, 1)
+        engine.summon_monster(1, f"M{x}", x, 5, mourner(hp))
+    start = engine.state_hash()
+    assert engine.damage_unit(1, 5, 1)
+    assert not engine.grid.monsters_mask() & engine.grid.monster_masks[1]
+    record = engine.history[-1]
+    assert [(r.depth, r.x) for r in record.resolutions] == [
+        (0, 2), (0, 3), (0, 4), (0, 5), (1, 3), (1, 4), (1, 5), (2, 4), (2, 5), (3, 5)]
+    assert engine.state_hash() == engine.compute_state_hash()
+
+    engine.undo() # The whole cascade is one action
+    assert engine.state_hash() == start
+    engine.max_trigger_depth = 1
+    engine.damage_unit(1, 5, 1)
+    assert [u.hp for _, _, u in engine.grid.units()] == [1, 2]
+    assert len(engine.history[-1].resolutions) == 7 and not engine._triggers
+
+def test_log_levels_and_event_file(tmp_path):
+    import json
+    from src.core import log
+    from src.core.dataclasses import DieFace
+    from src.core.engine import GameEngine
+    engine_log = log.get_logger("engine")
+    assert not engine_log.isEnabledFor(log.EVENT) # Off until configured
+
+    path = tmp_path / "events.jsonl"
+    log.configure(log.parse_levels("WARNING,engine=INFO"), console=False, events_path=str(path))
+    try:
+        assert engine_log.isEnabledFor(log.EVENT) and not engine_log.isEnabledFor(log.logging.DEBUG)
+        assert not log.get_logger("ui.board").isEnabledFor(log.logging.INFO)
+        engine = GameEngine()
+        engine.next_phase()
+        engine.add_crests(1, {DieFace.SUMMON: 1})
+        engine.deduct_summon_cost()
+    finally:
+        log.shutdown()
+        log.configure(console=False, default_level="WARNING")
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records[0] == dict(records[0], subsystem="engine", event="phase", phase="Main Phase", player=1)
+    assert records[-1]["message"] == "Not enough SUMMON crests." and "event" not in records[-1]
+
+def test_commands_validate_serialize_and_batch():
+    import json
+    import random
+    from src.core.commands import Attack, EndTurn, Move, NextPhase, Roll, Summon, parse_command, parse_commands
+    from src.core.dataclasses import DieFace
+    from src.core.engine import GameEngine
+    engine = GameEngine(rng=random.Random(5))
+    engine.add_crests(1, {DieFace.SUMMON: 2, DieFace.MOVEMENT: 2})
+    card = engine.players[1].hand[0]
+    script = [Roll(), NextPhase(), Summon(pattern="CROSS", x=6, y=2, hand_index=0),
+              Move(from_x=6, from_y=2, to_x=6, to_y=3), NextPhase()]
+    start = engine.state_hash()
+    results = engine.apply_many(script)
+    assert [r.ok for r in results] == [True] * 5 and results[2].value is card
+    assert len(engine.history) == 1 # One undoable action
+    cell = engine.grid.get_cell(6, 3)
+    assert cell.monster_ref.template is card and card not in engine.players[1].hand
+    end = engine.state_hash()
+
+    assert not engine.apply(Move(from_x=6, from_y=18, to_x=6, to_y=17)).ok # Not a monster of player 1
+    assert "No enemy" in engine.apply(Attack(from_x=6, from_y=3, to_x=6, to_y=4)).message
+    assert not engine.apply(Summon(pattern="NOPE", x=0, y=0)).ok
+    with pytest.raises(ValueError): # The cost is the engine's, not the client's
+        parse_command({"kind": "summon", "pattern": "NET_10", "x": 6, "y": 4, "hand_index": 0, "cost": 0})
+    wrong_net = engine.apply(Summon(pattern="NET_01", x=6, y=4, hand_index=0))
+    assert not wrong_net.ok and "unfolds as" in wrong_net.message
+    # A command that can never be valid rejects the whole batch up front
+    hashed = engine.state_hash()
+    malformed = engine.apply_many([EndTurn(), Summon(pattern="NOPE", x=6, y=16), Roll()])
+    assert [r.ok for r in malformed] == [False] and "Command 1" in malformed[0].message
+    assert engine.state_hash() == hashed and len(engine.history) == 1
+    stopped = engine.apply_many([EndTurn(), Summon(pattern="CROSS", x=6, y=16, hand_index=99), Roll()])
+    assert [r.ok for r in stopped] == [True, False]
+    engine.undo()
+    engine.undo()
+    assert engine.state_hash() == start
+
+    # Replay from the serialized commands
+    saved = json.dumps([c.model_dump() for c in script])
+    assert parse_command(script[2].model_dump_json()) == script[2]
+    replay = GameEngine(rng=random.Random(5))
+    replay.add_crests(1, {DieFace.SUMMON: 2, DieFace.MOVEMENT: 2})
+    assert all(replay.apply(c).ok for c in parse_commands(json.loads(saved)))
+    assert replay.state_hash() == end